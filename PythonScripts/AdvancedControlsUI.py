@@ -1,7 +1,182 @@
 #Maya python script for advanced control curve creation and editing
 
 import maya.cmds as cmds
+import maya.api.OpenMaya as om
 import math
+import re
+from collections import deque
+from functools import lru_cache
+
+try:
+    import numpy as np
+except ImportError:
+    np = None
+
+import sys
+path = "D:/GitHubStuff/University/MayaScripts/PythonScripts"
+
+if path not in sys.path:
+    sys.path.append(path)
+
+import RenameEngine as rne
+import ModifierUndo as mu
+import ControlColor as cc
+#import importlib
+#importlib.reload(rne)
+#importlib.reload(mu)
+#importlib.reload(cc)
+
+# ---------------------------------------
+# Point Library
+# ---------------------------------------
+# Point sets are computed once per (kind, params) and shared by every control
+# built from them, so a batch of 300 gears does the trig once. With NumPy each
+# set is one vectorised evaluation; without it the same formulas run per sample.
+# Formulas take the sample index i (int or float array) and the math module to
+# use (math or numpy) and return (x, z).
+
+def _sample(formula, count, *params):
+    if np is not None:
+        x, z = formula(np.arange(count, dtype=float), np, *params)
+        x = np.broadcast_to(x, (count,)).tolist()
+        z = np.broadcast_to(z, (count,)).tolist()
+        return tuple((x[i], 0.0, z[i]) for i in range(count))
+    return tuple((x, 0.0, z) for x, z in (formula(i, math, *params) for i in range(count)))
+
+def _ring(i, m, n, r_a, r_b, width):
+    # alternating radius every `width` samples (gear teeth, starburst spikes)
+    t = (math.pi * 2) * (i / float(n))
+    r = r_b + (r_a - r_b) * (1 - (i // width) % 2)
+    return r * m.cos(t), r * m.sin(t)
+
+def _astroid(i, m, n, a):
+    t = (math.pi * 2) * (i / float(n))
+    return a * m.cos(t)**3, a * m.sin(t)**3
+
+def _heart(i, m, n, a):
+    t = math.pi * 2 * (i / float(n))
+    return (a * 16 * m.sin(t)**3,
+            a * (13*m.cos(t) - 5*m.cos(2*t) - 2*m.cos(3*t) - m.cos(4*t)))
+
+def _teardrop(i, m, n, a):
+    t = math.pi * 2 * (i / float(n))
+    r = a * (1 - m.sin(t))
+    return r * m.cos(t), r * m.sin(t)
+
+def _leaf_half(i, m, n, a):
+    t = math.pi * (i / float(n))
+    return a * m.sin(t), a * m.sin(t) * m.cos(t)
+
+def _figure_eight(i, m, n, a):
+    t = math.pi * 2 * (i / float(n))
+    return a * m.cos(t), a * m.sin(t) * m.cos(t)
+
+def _gear_points(teeth, r_outer, r_inner):
+    # paired teeth: two points per outer/inner alternation
+    total = teeth * 2
+    return _sample(_ring, total + 1, total, r_outer, r_inner, 2)
+
+def _starburst_points(spikes, r_spike, r_base):
+    return _sample(_ring, spikes * 2 + 1, spikes * 2, r_spike, r_base, 1)
+
+def _astroid_points(a, samples):
+    pts = _sample(_astroid, samples, samples, a)
+    # to close smoothly with degree=3, repeat first 3 pts
+    return pts + pts[:3]
+
+def _hexagon_points(r):
+    pts = _sample(_ring, 6, 6, r, r, 1)
+    return pts + pts[:1]
+
+def _leaf_points(a, samples):
+    # second half is the first one mirrored in x and walked back
+    half = _sample(_leaf_half, samples + 1, samples, a)
+    return half + tuple((-x, y, z) for x, y, z in reversed(half))
+
+def edge_walk(edges):
+    """
+    Vertex order that draws every edge of a connected wireframe in one stroke
+    (an Eulerian path). Odd-degree vertices are paired up by retracing the
+    shortest path between them, so the stroke doubles back as little as possible.
+    """
+    neighbours = {}
+    for a, b in edges:
+        neighbours.setdefault(a, []).append(b)
+        neighbours.setdefault(b, []).append(a)
+    links = list(edges)
+    odd = [v for v in neighbours if len(neighbours[v]) % 2]
+    while len(odd) > 2:
+        start = odd.pop(0)
+        prev = {start: None}
+        queue = deque([start])
+        while queue:
+            v = queue.popleft()
+            if v in odd:
+                break
+            for w in neighbours[v]:
+                if w not in prev:
+                    prev[w] = v
+                    queue.append(w)
+        odd.remove(v)
+        while prev[v] is not None:
+            links.append((prev[v], v))
+            v = prev[v]
+
+    # Hierholzer over the (now at most two odd vertices) multigraph
+    adjacent = dict((v, []) for v in neighbours)
+    for e, (a, b) in enumerate(links):
+        adjacent[a].append((b, e))
+        adjacent[b].append((a, e))
+    used = [False] * len(links)
+    cursor = dict((v, 0) for v in adjacent)
+    stack = [odd[0] if odd else links[0][0]]
+    walk = []
+    while stack:
+        v = stack[-1]
+        edges_v = adjacent[v]
+        while cursor[v] < len(edges_v) and used[edges_v[cursor[v]][1]]:
+            cursor[v] += 1
+        if cursor[v] == len(edges_v):
+            walk.append(stack.pop())
+        else:
+            w, e = edges_v[cursor[v]]
+            used[e] = True
+            stack.append(w)
+    return walk[::-1]
+
+CUBE_CORNERS = {
+    'FBL': (-1, -1,  1), 'FBR': ( 1, -1,  1),
+    'FTR': ( 1,  1,  1), 'FTL': (-1,  1,  1),
+    'BBL': (-1, -1, -1), 'BBR': ( 1, -1, -1),
+    'BTR': ( 1,  1, -1), 'BTL': (-1,  1, -1),
+}
+CUBE_EDGES = (
+    ('FBL','FBR'),('FBR','FTR'),('FTR','FTL'),('FTL','FBL'),
+    ('BBL','BBR'),('BBR','BTR'),('BTR','BTL'),('BTL','BBL'),
+    ('FBL','BBL'),('FBR','BBR'),('FTR','BTR'),('FTL','BTL'),
+)
+
+def _cube_points(s):
+    # 12 edges, 8 odd corners -> 3 retraced edges, 16 points in a single span chain
+    return tuple(tuple(float(c * s) for c in CUBE_CORNERS[k]) for k in edge_walk(CUBE_EDGES))
+
+POINT_BUILDERS = {
+    "gear": _gear_points,
+    "starburst": _starburst_points,
+    "astroid": _astroid_points,
+    "hexagon": _hexagon_points,
+    "cube": _cube_points,
+    "heart": lambda a, samples: _sample(_heart, samples + 1, samples, a),
+    "teardrop": lambda a, samples: _sample(_teardrop, samples + 1, samples, a),
+    "leaf": _leaf_points,
+    "figure_eight": lambda a, samples: _sample(_figure_eight, samples + 1, samples, a),
+}
+
+@lru_cache(maxsize=None)
+def shape_points(kind, params):
+    """Cached ((x, y, z), ...) for a library shape; params is the builder's argument tuple."""
+    return POINT_BUILDERS[kind](*params)
+
 
 # ---------------------------------------
 # Common Curve Shapes and Creation Methods
@@ -43,32 +218,32 @@ class PlusShape(BaseShape):
         return cmds.curve(name=name, p=pts, degree=1)
 
 class GearShape(BaseShape):
+    """
+    A simple cog with paired teeth (two points per outer/inner alternation).
+    """
+    def __init__(self, teeth=16, r_outer=1.0, r_inner=0.7):
+        self.teeth = teeth
+        self.r_outer = r_outer
+        self.r_inner = r_inner
+
+    def points(self):
+        return shape_points("gear", (self.teeth, self.r_outer, self.r_inner))
+
     def create(self, name):
-        # A simple cog with paired teeth (two points per outer/inner alternation)
-        teeth = 16
-        r_outer = 1.0
-        r_inner = 0.7
-        pts = []
-        total = teeth * 2
-        for i in range(total + 1):
-            angle = (math.pi * 2) * (i / float(total))
-            group = i // 2
-            r = r_outer if (group % 2 == 0) else r_inner
-            x = r * math.cos(angle)
-            z = r * math.sin(angle)
-            pts.append((x, 0, z))
-        return cmds.curve(name=name, p=pts, degree=1)
+        return cmds.curve(name=name, p=list(self.points()), degree=1)
 
 class StarburstShape(BaseShape):
+    def __init__(self, spikes=8, r_spike=1.0, r_base=0.6):
+        self.spikes = spikes
+        self.r_spike = r_spike
+        self.r_base = r_base
+
+    def points(self):
+        return shape_points("starburst", (self.spikes, self.r_spike, self.r_base))
+
     def create(self, name):
-        spikes = 8; r_spike = 1.0; r_base = 0.6
-        pts = []
-        for i in range(spikes*2+1):
-            angle = (math.pi*2)*(i/float(spikes*2))
-            r = r_spike if i%2==0 else r_base
-            pts.append((r*math.cos(angle),0,r*math.sin(angle)))
-        return cmds.curve(name=name, p=pts, degree=1)
-        
+        return cmds.curve(name=name, p=list(self.points()), degree=1)
+
 class AstroidShape(BaseShape):
     """
     Closed, smooth astroid/tetracuspid curve:
@@ -80,62 +255,25 @@ class AstroidShape(BaseShape):
         self.a = scale
         self.samples = samples
 
+    def points(self):
+        return shape_points("astroid", (self.a, self.samples))
+
     def create(self, name):
-        # generate one full loop of astroid
-        pts = []
-        for i in range(self.samples):
-            t = (math.pi * 2) * (i / float(self.samples))
-            x = self.a * math.cos(t)**3
-            z = self.a * math.sin(t)**3
-            pts.append((x, 0, z))
-        # to close smoothly with degree=3, repeat first 3 pts
-        pts.extend(pts[:3])
-        return cmds.curve(name=name, p=pts, degree=3)
+        return cmds.curve(name=name, p=list(self.points()), degree=3)
 
 class CubeShape(BaseShape):
     """
-    Wireframe cube: creates 12 separate edge curves, then re-parents
-    all their shape nodes onto the first curve transform using
-    cmds.parent(..., r=True, s=True), and deletes the empty transforms.
+    Wireframe cube as one degree-1 curve: a single stroke along the cube's
+    edges (see edge_walk), so each cube is one transform and one shape.
     """
     def __init__(self, size=1.0):
         self.s = size
 
-    def create(self, name):
-        s = self.s
-        # corner positions
-        C = {
-            'FBL': (-s, -s,  s), 'FBR': ( s, -s,  s),
-            'FTR': ( s,  s,  s), 'FTL': (-s,  s,  s),
-            'BBL': (-s, -s, -s), 'BBR': ( s, -s, -s),
-            'BTR': ( s,  s, -s), 'BTL': (-s,  s, -s),
-        }
-        edges = [
-            ('FBL','FBR'),('FBR','FTR'),('FTR','FTL'),('FTL','FBL'),
-            ('BBL','BBR'),('BBR','BTR'),('BTR','BTL'),('BTL','BBL'),
-            ('FBL','BBL'),('FBR','BBR'),('FTR','BTR'),('FTL','BTL'),
-        ]
-
-        # Create all edge curves
-        curves = []
-        for i, (a, b) in enumerate(edges):
-            pts = [C[a], C[b]]
-            crv = cmds.curve(name=f"{name}_edge{i}", p=pts, degree=1)
-            curves.append(crv)
-
-        # Use the first curve as the master transform
-        master = curves[0]
-
-        # For each subsequent curve, move its shape(s) under master, then delete it
-        for crv in curves[1:]:
-            shapes = cmds.listRelatives(crv, shapes=True, fullPath=True) or []
-            for shp in shapes:
-                cmds.parent(shp, master, r=True, s=True)
-            cmds.delete(crv)
+    def points(self):
+        return shape_points("cube", (self.s,))
 
-        # Rename the master to the requested name (if needed)
-        master = cmds.rename(master, name)
-        return master
+    def create(self, name):
+        return cmds.curve(name=name, p=list(self.points()), degree=1)
 
 class TriangleShape(BaseShape):
     """
@@ -162,15 +300,11 @@ class HexagonShape(BaseShape):
     def __init__(self, radius=1.0):
         self.r = radius
 
+    def points(self):
+        return shape_points("hexagon", (self.r,))
+
     def create(self, name):
-        pts = []
-        for i in range(6):
-            angle = 2*math.pi * (i/6.0)
-            x = self.r * math.cos(angle)
-            z = self.r * math.sin(angle)
-            pts.append((x, 0, z))
-        pts.append(pts[0])
-        return cmds.curve(name=name, p=pts, degree=1)
+        return cmds.curve(name=name, p=list(self.points()), degree=1)
 
 
 class HeartShape(BaseShape):
@@ -181,15 +315,11 @@ class HeartShape(BaseShape):
         self.a = scale
         self.samples = samples
 
+    def points(self):
+        return shape_points("heart", (self.a, self.samples))
+
     def create(self, name):
-        pts = []
-        for i in range(self.samples+1):
-            t = math.pi * 2 * (i/float(self.samples))
-            x = self.a * 16 * math.sin(t)**3
-            z = self.a * (13*math.cos(t) - 5*math.cos(2*t)
-                          - 2*math.cos(3*t) - math.cos(4*t))
-            pts.append((x, 0, z))
-        return cmds.curve(name=name, p=pts, degree=3)
+        return cmds.curve(name=name, p=list(self.points()), degree=3)
 
 
 class TeardropShape(BaseShape):
@@ -200,15 +330,11 @@ class TeardropShape(BaseShape):
         self.a = scale
         self.samples = samples
 
+    def points(self):
+        return shape_points("teardrop", (self.a, self.samples))
+
     def create(self, name):
-        pts = []
-        for i in range(self.samples+1):
-            t = math.pi * 2 * (i/float(self.samples))
-            r = self.a * (1 - math.sin(t))
-            x = r * math.cos(t)
-            z = r * math.sin(t)
-            pts.append((x, 0, z))
-        return cmds.curve(name=name, p=pts, degree=3)
+        return cmds.curve(name=name, p=list(self.points()), degree=3)
 
 
 class LeafShape(BaseShape):
@@ -219,21 +345,11 @@ class LeafShape(BaseShape):
         self.a = scale
         self.samples = samples
 
+    def points(self):
+        return shape_points("leaf", (self.a, self.samples))
+
     def create(self, name):
-        pts = []
-        # first half
-        for i in range(self.samples+1):
-            t = math.pi * (i/float(self.samples))
-            x = self.a * math.sin(t)
-            z = self.a * math.sin(t) * math.cos(t)
-            pts.append(( x, 0,  z))
-        # second half (mirror back)
-        for i in range(self.samples+1):
-            t = math.pi * (1 - (i/float(self.samples)))
-            x = -self.a * math.sin(t)
-            z = self.a * math.sin(t) * math.cos(t)
-            pts.append(( x, 0,  z))
-        return cmds.curve(name=name, p=pts, degree=3, periodic=True)
+        return cmds.curve(name=name, p=list(self.points()), degree=3, periodic=True)
 
 
 class FigureEightShape(BaseShape):
@@ -244,14 +360,104 @@ class FigureEightShape(BaseShape):
         self.a = scale
         self.samples = samples
 
+    def points(self):
+        return shape_points("figure_eight", (self.a, self.samples))
+
     def create(self, name):
-        pts = []
-        for i in range(self.samples+1):
-            t = math.pi * 2 * (i/float(self.samples))
-            x = self.a * math.cos(t)
-            z = self.a * math.sin(t) * math.cos(t)
-            pts.append((x, 0, z))
-        return cmds.curve(name=name, p=pts, degree=3, periodic=True)
+        return cmds.curve(name=name, p=list(self.points()), degree=3, periodic=True)
+
+
+# -------------------------------------------------
+# Batch Control Factory (OpenMaya)
+# -------------------------------------------------
+class ControlFactory(object):
+    """
+    Builds many group/control pairs at once. Each shape's curve (CVs, knots,
+    degree, form) is read from one cmds-built prototype and cached; target world
+    matrices are read in one pass; every group, control, curve shape, transform
+    and color is queued into a single MDagModifier and run as one undoable
+    command (ModifierUndo.run_modifier). Controls end up like the cmds path:
+    group at the target (position + rotation), control with identity transform
+    and the curve in the group's space.
+    """
+    def __init__(self, shapes):
+        self.shapes = shapes
+        self._curves = {}
+
+    def curve_data(self, shape_name):
+        if shape_name not in self._curves:
+            proto = self.shapes[shape_name].create("ctrlFactoryProto")
+            curves = []
+            for shp in cmds.listRelatives(proto, shapes=True, fullPath=True) or []:
+                sl = om.MSelectionList()
+                sl.add(shp)
+                fn = om.MFnNurbsCurve(sl.getDagPath(0))
+                curves.append((fn.cvPositions(), fn.knots(), fn.degree, fn.form))
+            cmds.delete(proto)
+            self._curves[shape_name] = curves
+        return self._curves[shape_name]
+
+    def world_matrices(self, targets):
+        # one list per target: a shared MSelectionList merges duplicates and would shift the pairing
+        matrices = []
+        for target in targets:
+            sl = om.MSelectionList()
+            sl.add(target)
+            matrices.append(sl.getDagPath(0).inclusiveMatrix())
+        return matrices
+
+    def _queue_transform(self, modifier, node, matrix):
+        # position + rotation only (matchTransform scl=False)
+        xform = om.MTransformationMatrix(matrix)
+        t = xform.translation(om.MSpace.kWorld)
+        r = xform.rotation()
+        fn = om.MFnDependencyNode(node)
+        for attr, value in (("translateX", t.x), ("translateY", t.y), ("translateZ", t.z)):
+            modifier.newPlugValueDouble(fn.findPlug(attr, False), value)
+        for attr, value in (("rotateX", r.x), ("rotateY", r.y), ("rotateZ", r.z)):
+            modifier.newPlugValueMAngle(fn.findPlug(attr, False), om.MAngle(value))
+
+    def build(self, shape_name, names, targets=None, color=None):
+        """
+        One control per name (matched to targets[i] when given). Names clashing
+        with existing DAG nodes get Maya-style number bumps. Returns
+        [(group path, control path), ...] in the order of names.
+        """
+        curves = self.curve_data(shape_name)
+        if color is not None:
+            color = cc.check_color(color)
+        if targets and len(targets) != len(names):
+            raise ValueError("Got %d names for %d targets." % (len(names), len(targets)))
+        matrices = self.world_matrices(targets) if targets else [None] * len(names)
+        # every new group, control and shape gets a short name no DAG node uses yet
+        taken = set(rne.leaf(n) for n in cmds.ls(dag=True, long=True) or [])
+        def claim(wanted):
+            name = rne.unique_name(wanted, taken)
+            taken.add(name)
+            return name
+        modifier = om.MDagModifier()
+        created = []
+        for name, matrix in zip(names, matrices):
+            name = re.sub(r"[^\w:]", "_", name)
+            grp = modifier.createNode("transform")
+            modifier.renameNode(grp, claim(name + "_Grp"))
+            ctrl_name = claim(name)
+            ctrl = modifier.createNode("transform", grp)
+            modifier.renameNode(ctrl, ctrl_name)
+            if matrix is not None:
+                self._queue_transform(modifier, grp, matrix)
+            for i, (cvs, knots, degree, form) in enumerate(curves):
+                shape = modifier.createNode("nurbsCurve", ctrl)
+                modifier.renameNode(shape, claim(ctrl_name + "Shape" + (str(i) if i else "")))
+                data = om.MFnNurbsCurveData().create()
+                om.MFnNurbsCurve().create(cvs, knots, degree, form, False, False, data)
+                modifier.newPlugValue(om.MFnDependencyNode(shape).findPlug("cached", False), data)
+                if color is not None:
+                    cc.queue_color(modifier, shape, color)
+            created.append((grp, ctrl))
+        mu.run_modifier(modifier)
+        return [(om.MDagPath.getAPathTo(grp).fullPathName(), om.MDagPath.getAPathTo(ctrl).fullPathName())
+                for grp, ctrl in created]
 
 
 # -------------------------------------------------
@@ -276,6 +482,9 @@ class ControlManager(object):
             'Leaf': LeafShape(),
             'Figure Eight': FigureEightShape()
         }
+        self.factory = ControlFactory(self.shapes)
+        # batch builds go through the OpenMaya factory; False keeps the per-control cmds path
+        self.use_api = True
 
     def create_control(self, shape_name, ctrl_name, target=None, color=None):
         shape = self.shapes.get(shape_name)
@@ -290,36 +499,49 @@ class ControlManager(object):
         return ctrl
 
     def _apply_color(self, ctrl, color):
-        shapes = cmds.listRelatives(ctrl, shapes=True, fullPath=True) or []
-        for shp in shapes:
-            cmds.setAttr(f"{shp}.overrideEnabled", 1)
-            cmds.setAttr(f"{shp}.overrideColor", color)
+        cc.set_color([ctrl], color)
+
+    def create_controls(self, shape_name, names, targets=None, color=None):
+        """One grouped control per name, matched to targets[i] when given; one undo step."""
+        if shape_name not in self.shapes:
+            cmds.error("Shape '%s' not found." % shape_name)
+        if self.use_api and mu.load_undo_command():
+            cmds.undoInfo(openChunk=True, chunkName="createControls")
+            try:
+                created = self.factory.build(shape_name, names, targets, color)
+            finally:
+                cmds.undoInfo(closeChunk=True)
+            cmds.select(clear=True)
+            return [ctrl for grp, ctrl in created]
+        ctrls = []
+        for i, name in enumerate(names):
+            target = targets[i] if targets else None
+            grp = cmds.group(empty=True, name=name+'_Grp')
+            if target:
+                cmds.matchTransform(grp, target, pos=True, rot=True, scl=False)
+            ctrl = self.create_control(shape_name, name, target=target, color=color)
+            ctrl = cmds.parent(ctrl, grp)[0]
+            cmds.makeIdentity(ctrl, apply=True, t=1, r=1, s=1)
+            ctrls.append(cmds.ls(ctrl, long=True)[0])
+            cmds.select(clear=True)
+        return ctrls
 
     def create_controls_for_selection(self, shape_name, prefix, suffix, replace_str, with_str, color=None):
         sel = cmds.ls(selection=True, type='transform', long=True)
         if not sel:
             cmds.warning("No objects selected.")
             return
+        names = []
         for obj in sel:
             base = obj.split('|')[-1]
             if replace_str:
                 base = base.replace(replace_str, with_str)
-            name = prefix + base + suffix
-            grp = cmds.group(empty=True, name=name+'_Grp')
-            cmds.matchTransform(grp, obj, pos=True, rot=True, scl=False)
-            ctrl = self.create_control(shape_name, name, target=obj, color=color)
-            cmds.parent(ctrl, grp)
-            cmds.makeIdentity(ctrl, apply=True, t=1, r=1, s=1)
-            cmds.select(clear=True)
+            names.append(prefix + base + suffix)
+        return self.create_controls(shape_name, names, targets=sel, color=color)
 
     def create_controls_by_number(self, shape_name, number, color=None):
-        for i in range(1, number+1):
-            name = f"{shape_name}{i}"
-            grp = cmds.group(empty=True, name=name+'_Grp')
-            ctrl = self.create_control(shape_name, name, color=color)
-            cmds.parent(ctrl, grp)
-            cmds.makeIdentity(ctrl, apply=True, t=1, r=1, s=1)
-            cmds.select(clear=True)
+        names = [f"{shape_name}{i}" for i in range(1, number+1)]
+        return self.create_controls(shape_name, names, color=color)
 
     def replace_controls(self, shape_name, prefix, suffix, replace_str, with_str, color=None):
         sel = cmds.ls(selection=True, type='transform', long=True)
@@ -375,7 +597,10 @@ class ControlUI(object):
         cmds.separator(height=10)
         cmds.text(label="Color Index (0-31):")
         self.color_slider = cmds.colorIndexSliderGrp(label='Pick Color:', min=0, max=31, value=17)
+        cmds.rowLayout(numberOfColumns=2, columnWidth2=(170,170))
         cmds.button(label="Change Color", command=self.on_change_color)
+        cmds.button(label="Color by Side (L_/R_/C_)", command=self.on_color_by_side)
+        cmds.setParent('..')
 
         # Create/Replace buttons
         cmds.separator(height=10)
@@ -397,11 +622,14 @@ class ControlUI(object):
         if not sel:
             cmds.warning("No objects selected to change color.")
             return
-        for obj in sel:
-            shapes = cmds.listRelatives(obj, shapes=True, fullPath=True) or []
-            for shp in shapes:
-                cmds.setAttr(f"{shp}.overrideEnabled", 1)
-                cmds.setAttr(f"{shp}.overrideColor", color)
+        cc.set_color(sel, color)
+
+    def on_color_by_side(self, *args):
+        sel = cmds.ls(selection=True, type='transform', long=True)
+        if not sel:
+            cmds.warning("No objects selected to change color.")
+            return
+        cc.color_by_side(sel, "left_right_center")
 
     def on_create(self, *args):
         shape       = cmds.optionMenu(self.shape_menu, query=True, value=True)
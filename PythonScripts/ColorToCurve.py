@@ -1,5 +1,13 @@
+import sys
+path = "D:/GitHubStuff/University/MayaScripts/PythonScripts"
+
+if path not in sys.path:
+    sys.path.append(path)
+
 import maya.cmds as cmds
-import random
+import ControlColor as cc
+#import importlib
+#importlib.reload(cc)
 
 
 def SetColor(colorNum, makeRandom = False):
@@ -14,15 +22,8 @@ def SetColor(colorNum, makeRandom = False):
     selectedObjects = cmds.ls(selection = True)
     if len(selectedObjects) < 1:
         cmds.error("No objects selected")
-    selectedShapes = []
-    selectedShapes = cmds.listRelatives(selectedObjects, shapes = True)
+    # shapes are resolved and colored in one batch (one undo step)
+    stats = cc.set_color(selectedObjects, colorNum, random_colors = makeRandom)
 
-    if len(selectedObjects) < 1:
+    if stats["shapes"] < 1:
         cmds.error("No shapes in selection")
-
-
-    for shape in selectedShapes:
-        if makeRandom == True:
-            colorNum = random.randint(0, 31)
-        cmds.setAttr((shape + ".overrideEnabled"), 1)
-        cmds.setAttr((shape + ".overrideColor"), colorNum)
\ No newline at end of file
@@ -0,0 +1,53 @@
+# Benchmark: per-control cmds path vs. OpenMaya batch factory of AdvancedControlsUI.ControlManager
+# Run inside Maya (script editor or mayapy). Builds throwaway target transforms under a temp
+# group, creates a control per target with both paths and deletes everything afterwards.
+
+import sys
+path = "D:/GitHubStuff/University/MayaScripts/PythonScripts"
+
+if path not in sys.path:
+    sys.path.append(path)
+
+import time
+import random
+import maya.cmds as cmds
+import AdvancedControlsUI as acu
+#import importlib
+#importlib.reload(acu)
+
+COUNTS = (10, 100, 1000)
+SHAPES = ("Circle", "Cube", "Gear")
+
+
+def build_targets(count):
+    root = cmds.createNode("transform", name="controlBench_grp")
+    rng = random.Random(count)
+    targets = []
+    for i in range(count):
+        node = cmds.createNode("transform", name="bench_%d_Jnt" % i, parent=root)
+        cmds.setAttr(node + ".translate", rng.uniform(-50, 50), rng.uniform(0, 50), rng.uniform(-50, 50))
+        cmds.setAttr(node + ".rotate", rng.uniform(-180, 180), rng.uniform(-180, 180), rng.uniform(-180, 180))
+        targets.append(node)
+    return root, cmds.ls(targets, long=True)
+
+def time_path(mgr, shape_name, count, api):
+    root, targets = build_targets(count)
+    names = ["bench_%d_Ctrl" % i for i in range(count)]
+    mgr.use_api = api
+    start = time.perf_counter()
+    ctrls = mgr.create_controls(shape_name, names, targets=targets, color=17)
+    seconds = time.perf_counter() - start
+    cmds.delete([root] + [c.split("|")[1] for c in ctrls])
+    return seconds, len(ctrls)
+
+def run():
+    mgr = acu.ControlManager()
+    for shape_name in SHAPES:
+        mgr.factory.curve_data(shape_name)   # prototype read is once per session; keep it out of the timings
+        for count in COUNTS:
+            for api in (False, True):
+                seconds, made = time_path(mgr, shape_name, count, api)
+                print("[ControlBenchmark] %-7s %5d targets  %-4s  %.3fs  (%d controls)" %
+                      (shape_name, count, "api" if api else "cmds", seconds, made))
+
+run()
@@ -0,0 +1,146 @@
+# Shared override-color writer for control curves (ColorToCurve, AdvancedControlsUI, CreateControlsForJoints)
+#
+#   import ControlColor as cc
+#   cc.set_color(cmds.ls(sl=True, long=True), 17)                 # color index 0-31
+#   cc.set_color(ctrls, (1.0, 0.5, 0.0))                          # RGB 0-1
+#   cc.set_color(ctrls, random_colors=True)                       # random index per shape
+#   cc.color_by_side(ctrls, "left_right_center")                  # L_ blue, R_ red, C_ yellow
+#
+# Shapes are resolved with one listRelatives call and every plug write goes into
+# one MDGModifier run through ModifierUndo's undoable command, so recoloring a
+# whole rig is one command and one undo step. Without the command it falls back
+# to setAttr inside an undo chunk.
+
+import sys
+import time
+import random
+import fnmatch
+
+try:
+    import maya.cmds as cmds
+    import maya.api.OpenMaya as om
+except ImportError:
+    cmds = None
+    om = None
+
+path = "D:/GitHubStuff/University/MayaScripts/PythonScripts"
+
+if path not in sys.path:
+    sys.path.append(path)
+
+import ModifierUndo as mu
+#import importlib
+#importlib.reload(mu)
+
+# (glob on the control's short name, color) in priority order; colors are indices or RGB tuples
+SIDE_PRESETS = {
+    "left_right": (("L_*", 6), ("R_*", 13)),
+    "left_right_center": (("L_*", 6), ("R_*", 13), ("C_*", 17)),
+    "left_right_center_rgb": (("L_*", (0.0, 0.3, 1.0)), ("R_*", (1.0, 0.1, 0.1)), ("C_*", (1.0, 0.85, 0.0))),
+}
+
+
+def is_rgb(color):
+    return isinstance(color, (tuple, list))
+
+def check_color(color):
+    """Index 0-31 or (r, g, b) with components 0-1; raises ValueError otherwise."""
+    if is_rgb(color):
+        if len(color) != 3 or any(not 0.0 <= float(c) <= 1.0 for c in color):
+            raise ValueError("RGB color must be three values between 0 and 1: %r" % (color,))
+        return tuple(float(c) for c in color)
+    if not 0 <= int(color) <= 31:
+        raise ValueError("Color index must be between 0-31: %r" % (color,))
+    return int(color)
+
+def shapes_of(nodes):
+    """Long names of the shapes under nodes, in one listRelatives call."""
+    if not nodes:
+        return []
+    return cmds.listRelatives(nodes, shapes=True, fullPath=True) or []
+
+def side_color(name, rules):
+    """Color of the first rule whose glob matches the short name, or None."""
+    for pattern, color in rules:
+        if fnmatch.fnmatchcase(name, pattern):
+            return color
+    return None
+
+
+# -----------------------
+# Writers
+# -----------------------
+def queue_color(modifier, node, color):
+    """Queue the override plugs of one node (MObject) into an MDGModifier/MDagModifier."""
+    fn = om.MFnDependencyNode(node)
+    modifier.newPlugValueBool(fn.findPlug("overrideEnabled", False), True)
+    modifier.newPlugValueBool(fn.findPlug("overrideRGBColors", False), is_rgb(color))
+    if is_rgb(color):
+        rgb = fn.findPlug("overrideColorRGB", False)
+        for i, value in enumerate(color):
+            modifier.newPlugValueFloat(rgb.child(i), value)
+    else:
+        modifier.newPlugValueInt(fn.findPlug("overrideColor", False), color)
+
+def _write_api(colors):
+    modifier = om.MDGModifier()
+    for shape, color in colors.items():
+        sl = om.MSelectionList()
+        sl.add(shape)
+        queue_color(modifier, sl.getDependNode(0), color)
+    mu.run_modifier(modifier)
+
+def _write_cmds(colors):
+    cmds.undoInfo(openChunk=True, chunkName="setOverrideColor")
+    try:
+        for shape, color in colors.items():
+            cmds.setAttr(shape + ".overrideEnabled", 1)
+            cmds.setAttr(shape + ".overrideRGBColors", is_rgb(color))
+            if is_rgb(color):
+                cmds.setAttr(shape + ".overrideColorRGB", *color)
+            else:
+                cmds.setAttr(shape + ".overrideColor", color)
+    finally:
+        cmds.undoInfo(closeChunk=True)
+
+def apply_colors(colors, api=True):
+    """
+    Write {shape: color} in one batch. Returns stats (shapes, seconds).
+    """
+    start = time.perf_counter()
+    colors = dict((shape, check_color(color)) for shape, color in colors.items())
+    if colors:
+        if api and mu.load_undo_command():
+            _write_api(colors)
+        else:
+            _write_cmds(colors)
+    return dict(shapes=len(colors), seconds=time.perf_counter() - start)
+
+
+# -----------------------
+# Entry points
+# -----------------------
+def set_color(nodes, color=None, random_colors=False, api=True):
+    """Color every shape under nodes with one color, or a random index per shape."""
+    shapes = shapes_of(nodes)
+    if random_colors:
+        colors = dict((shape, random.randint(0, 31)) for shape in shapes)
+    else:
+        colors = dict.fromkeys(shapes, check_color(color))
+    return apply_colors(colors, api)
+
+def color_by_side(nodes, preset="left_right_center", rules=None, default=None, api=True):
+    """
+    Color shapes by their control's name (SIDE_PRESETS or explicit rules);
+    unmatched controls get default, or are left alone when default is None.
+    """
+    rules = rules if rules is not None else SIDE_PRESETS[preset]
+    colors = {}
+    for shape in shapes_of(nodes):
+        control = shape.rsplit("|", 2)[-2]
+        color = side_color(control, rules)
+        if color is None:
+            color = default
+        if color is not None:
+            colors[shape] = color
+    return apply_colors(colors, api)
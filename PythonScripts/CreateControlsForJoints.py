@@ -1,7 +1,15 @@
 #Used the help of Chat in making parts of this script
 
+import sys
+path = "D:/GitHubStuff/University/MayaScripts/PythonScripts"
+
+if path not in sys.path:
+    sys.path.append(path)
 
 import maya.cmds as cmds
+import ControlColor as cc
+#import importlib
+#importlib.reload(cc)
 
 def create_control_and_group(joint, colorRL = True, constraints = True):
     # Get joint position
@@ -37,12 +45,8 @@ def create_control_and_group(joint, colorRL = True, constraints = True):
     cmds.rename(parent_group, parent_group_name)
 
     # Changing colors for left and right side controls
-    if control_name[:2] == "R_" and colorRL == True:
-        cmds.setAttr((control_name + ".overrideEnabled"), 1)
-        cmds.setAttr((control_name + ".overrideColor"), 13)
-    elif control_name[:2] == "L_" and colorRL == True:
-        cmds.setAttr((control_name + ".overrideEnabled"), 1)
-        cmds.setAttr((control_name + ".overrideColor"), 6)
+    if colorRL == True:
+        cc.color_by_side([control_name], "left_right")
 
     if constraints == True:
         cmds.parentConstraint(control_name, joint)
@@ -58,9 +62,14 @@ def main():
         cmds.warning("No joints selected. Please select one or more joints.")
         return
     
+    controls = []
     for joint in selected_joints:
-        control_name, parent_group_name = create_control_and_group(joint)
+        control_name, parent_group_name = create_control_and_group(joint, colorRL = False)
+        controls.append(control_name)
         print(f"Created control: {control_name}, parent group: {parent_group_name}")
 
+    # Color all left/right controls in one batch
+    cc.color_by_side(controls, "left_right")
+
 if __name__ == "__main__":
     main()
\ No newline at end of file
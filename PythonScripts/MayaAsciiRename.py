@@ -0,0 +1,307 @@
+# Offline rename over Maya ASCII (.ma) files: applies RenameEngine rule pipelines without opening Maya
+# Runs from any Python 3 (no maya modules needed) or mayapy; files are processed in parallel
+# (serially when called from inside the Maya GUI, which can't start worker processes).
+#
+#   python MayaAsciiRename.py --preset cleanup.json --types joint,transform --out D:/renamed  a.ma b.ma
+#
+#   import MayaAsciiRename as mar
+#   pipe = rne.RenamePipeline().remove_numbers().add_suffix("_Jnt")
+#   mar.rename_ma_files(paths, pipe.to_json(), types=["joint"], out_dir="D:/renamed", workers=8)
+#
+# Each file is streamed line by line and written in the same pass: createNode statements
+# get their new name (unique among siblings), and every later reference (createNode -p,
+# connectAttr, disconnectAttr, parent, select, relationship) is rewritten through the same
+# map. `rename "old" "new"` statements on nodes of this file are handled like createNode -n:
+# the rules run on the new name and later references follow it. Memory holds the name map
+# only, never the file. Nodes from references, shared default nodes (createNode -s) and
+# rename statements with flags (rename -uid) or a single argument are left alone.
+
+import os
+import re
+import sys
+import time
+import fnmatch
+import argparse
+from concurrent.futures import ProcessPoolExecutor
+
+path = "D:/GitHubStuff/University/MayaScripts/PythonScripts"
+
+if path not in sys.path:
+    sys.path.append(path)
+
+import RenameEngine as rne
+
+# statements whose node references are rewritten; everything else is copied verbatim
+REF_COMMANDS = ("connectAttr", "disconnectAttr", "parent", "select", "relationship")
+NAME_COMMANDS = ("createNode", "rename")
+_QUOTED = re.compile(r'"((?:[^"\\]|\\.)*)"')
+_FLAG_VALUE = re.compile(r'(-(?:n|name|p|parent))\s+"((?:[^"\\]|\\.)*)"')
+_BARE_NAME = re.compile(r'(?<=\s)([A-Za-z_:|][\w:|]*)(?=\s*;|\s)')
+
+
+class MaNameMap(object):
+    """
+    Old -> new names for the nodes created so far in one file. Paths are tracked
+    per node so references written as short names, partial paths or full paths
+    all resolve, and references are written back in the shortest form that is
+    still unambiguous.
+    """
+    def __init__(self):
+        self.by_old_path = {}
+        self.by_old_short = {}
+        self.new_short_count = {}
+        self.types = {}
+        self.taken = {}
+
+    def add(self, old_path, new_path, node_type=""):
+        self.by_old_path[old_path] = new_path
+        self.by_old_short.setdefault(rne.leaf(old_path), []).append(old_path)
+        self.types[old_path] = node_type
+        short = rne.leaf(new_path)
+        self.new_short_count[short] = self.new_short_count.get(short, 0) + 1
+
+    def remove(self, old_path):
+        new_path = self.by_old_path.pop(old_path)
+        self.by_old_short[rne.leaf(old_path)].remove(old_path)
+        self.new_short_count[rne.leaf(new_path)] -= 1
+        return new_path, self.types.pop(old_path)
+
+    def move(self, old_path, renamed_path, new_path):
+        """
+        A rename statement: old_path is now called renamed_path in the file and
+        new_path in the output. Descendants and their sibling sets move along.
+        """
+        prev_new = self.by_old_path[old_path]
+        moved = [p for p in self.by_old_path if p == old_path or p.startswith(old_path + "|")]
+        entries = [(p,) + self.remove(p) for p in moved]
+        for p, value, node_type in entries:
+            self.add(renamed_path + p[len(old_path):], new_path + value[len(prev_new):], node_type)
+        for key in [k for k in self.taken if k == prev_new or k.startswith(prev_new + "|")]:
+            self.taken[new_path + key[len(prev_new):]] = self.taken.pop(key)
+
+    def resolve(self, ref):
+        """Old full path for a node reference as written in the file, or None."""
+        if ref.startswith("|"):
+            return ref if ref in self.by_old_path else None
+        candidates = self.by_old_short.get(rne.leaf(ref), ())
+        if "|" in ref:
+            candidates = [c for c in candidates if c.endswith("|" + ref)]
+        return candidates[-1] if candidates else None
+
+    def rewrite(self, ref):
+        old_path = self.resolve(ref)
+        if old_path is None:
+            return ref
+        new_path = self.by_old_path[old_path]
+        short = rne.leaf(new_path)
+        if "|" in ref or self.new_short_count.get(short, 0) > 1:
+            return new_path
+        return short
+
+    def rewrite_plug(self, text):
+        # "node.attr" / "|a|b.attr[0]" -> rewrite the node part only
+        node, dot, attr = text.partition(".")
+        return self.rewrite(node) + dot + attr if node else text
+
+
+class MaRenamer(object):
+    """Streams one .ma file through a RenamePipeline."""
+    def __init__(self, pipeline, types=None, match=None):
+        self.pipeline = pipeline
+        self.types = set(types) if types else None
+        self.match = match
+        self.names = MaNameMap()
+        self.index = 0
+        self.stats = dict(nodes=0, renamed=0, adjusted=0, invalid=0)
+
+    def wants(self, node_type, short):
+        if self.types is not None and node_type not in self.types:
+            return False
+        return not self.match or fnmatch.fnmatchcase(short, self.match)
+
+    def create_node(self, statement):
+        parts = statement.split(None, 2)
+        node_type = parts[1].rstrip(";") if len(parts) > 1 else ""
+        flags = dict(_FLAG_VALUE.findall(statement))
+        old_short = flags.get("-n") or flags.get("-name")
+        if not old_short:
+            return statement
+        parent_ref = flags.get("-p") or flags.get("-parent")
+        parent_old = self.names.resolve(parent_ref) if parent_ref else None
+        parent_new = self.names.by_old_path[parent_old] if parent_old else (parent_ref or "")
+        old_path = (parent_old or parent_ref or "") + "|" + old_short
+        self.stats["nodes"] += 1
+
+        shared = re.search(r"\s-s(s)?\b|\s-shared\b", statement) is not None
+        final = self.final_name(node_type, old_short, parent_new, not shared)
+        self.names.add(old_path, parent_new + "|" + final, node_type)
+
+        def flag(m):
+            if m.group(1) in ("-n", "-name"):
+                return '%s "%s"' % (m.group(1), final)
+            return '%s "%s"' % (m.group(1), parent_new if parent_old else m.group(2))
+        return _FLAG_VALUE.sub(flag, statement)
+
+    def final_name(self, node_type, old_short, parent_new, renamable=True):
+        """Rules applied to one node name, made unique among its new siblings."""
+        new_short = old_short
+        if renamable and self.wants(node_type, old_short):
+            wanted = rne.maya_name(self.pipeline.apply_one(old_short, self.index))
+            self.index += 1
+            if wanted != old_short:
+                if wanted and rne.VALID_NAME.match(wanted):
+                    new_short = wanted
+                else:
+                    self.stats["invalid"] += 1
+        # siblings must stay unique; unmatched nodes are bumped too if a new name took theirs
+        siblings = self.names.taken.setdefault(parent_new, set())
+        final = rne.unique_name(new_short, siblings)
+        siblings.add(final)
+        if final != old_short:
+            self.stats["renamed"] += 1
+            if final != new_short:
+                self.stats["adjusted"] += 1
+        return final
+
+    def rename_node(self, statement):
+        # rename "old" "new"; flagged forms (rename -uid "...") name nothing we track
+        if "-" in statement.split('"', 1)[0]:
+            return statement
+        args = _QUOTED.findall(statement)
+        if len(args) != 2 or "|" in args[1]:
+            return statement
+        old_ref, new_short = args
+        old_path = self.names.resolve(old_ref)
+        if old_path is None:
+            return statement
+        current = self.names.rewrite(old_ref)
+        prev_new = self.names.by_old_path[old_path]
+        parent_new, prev_final = prev_new.rsplit("|", 1)
+        self.names.taken.get(parent_new, set()).discard(prev_final)
+        final = self.final_name(self.names.types.get(old_path, ""), new_short, parent_new)
+        self.names.move(old_path, old_path.rsplit("|", 1)[0] + "|" + new_short, parent_new + "|" + final)
+        values = iter((current, final))
+        return _QUOTED.sub(lambda m: '"%s"' % next(values), statement, count=2)
+
+    def references(self, command, statement):
+        names = self.names
+        skip_first = command == "relationship"   # relationship "link" ... : first arg is not a node
+        seen = [0]
+        def quoted(m):
+            seen[0] += 1
+            if skip_first and seen[0] == 1:
+                return m.group(0)
+            return '"%s"' % names.rewrite_plug(m.group(1))
+        out = _QUOTED.sub(quoted, statement)
+        if command == "select":
+            # select -ne name; writes bare names
+            out = _BARE_NAME.sub(lambda m: names.rewrite(m.group(1)), out)
+        return out
+
+    def statement(self, text):
+        stripped = text.lstrip()
+        command = stripped.split(None, 1)[0] if stripped else ""
+        if command == "createNode":
+            return self.create_node(text)
+        if command == "rename":
+            return self.rename_node(text)
+        if command in REF_COMMANDS:
+            return self.references(command, text)
+        return text
+
+    def run(self, src, dst):
+        """Copy src to dst, rewriting names; statements are buffered only while they span lines."""
+        pending = []
+        for line in src:
+            if pending:
+                pending.append(line)
+                if line.rstrip().endswith(";"):
+                    dst.write(self.statement("".join(pending)))
+                    pending = []
+                continue
+            # top-level statements start at column 0; indented lines belong to the previous one
+            if line[:1].isalpha():
+                head = line.split(None, 1)[0]
+                if head in NAME_COMMANDS or head in REF_COMMANDS:
+                    if line.rstrip().endswith(";"):
+                        dst.write(self.statement(line))
+                    else:
+                        pending.append(line)
+                    continue
+            dst.write(line)
+        if pending:
+            dst.write("".join(pending))
+        return self.stats
+
+
+def rename_ma_file(src_path, pipeline_json, types=None, match=None, out_dir=None, suffix="_renamed"):
+    """
+    Rename one .ma file. The result goes to out_dir (same file name) or next to the
+    source with suffix; suffix="" and no out_dir rewrites the file in place via a
+    temp file. Returns the stats dict (file, output, nodes, renamed, adjusted, invalid, seconds).
+    """
+    start = time.perf_counter()
+    pipeline = rne.RenamePipeline.from_json(pipeline_json)
+    base = os.path.basename(src_path)
+    if out_dir:
+        out_path = os.path.join(out_dir, base)
+    else:
+        stem, ext = os.path.splitext(src_path)
+        out_path = stem + suffix + ext
+    in_place = os.path.abspath(out_path) == os.path.abspath(src_path)
+    write_path = out_path + ".tmp" if in_place else out_path
+    renamer = MaRenamer(pipeline, types, match)
+    # .ma files are 8-bit text; surrogateescape round-trips any byte untouched
+    with open(src_path, "r", encoding="utf-8", errors="surrogateescape", newline="") as src:
+        with open(write_path, "w", encoding="utf-8", errors="surrogateescape", newline="") as dst:
+            stats = renamer.run(src, dst)
+    if in_place:
+        os.replace(write_path, out_path)
+    stats.update(file=src_path, output=out_path, seconds=time.perf_counter() - start)
+    return stats
+
+def _rename_job(args):
+    return rename_ma_file(*args)
+
+def _can_spawn_workers():
+    # inside the Maya GUI sys.executable is maya.exe, so pool workers would start Maya, not Python
+    if "maya.cmds" not in sys.modules:
+        return True
+    exe = os.path.splitext(os.path.basename(sys.executable))[0].lower()
+    return exe.startswith("mayapy") or exe.startswith("python")
+
+def rename_ma_files(paths, pipeline_json, types=None, match=None, out_dir=None, suffix="_renamed", workers=None):
+    """
+    Rename many .ma files in parallel (one process per file at a time), or one after
+    another inside the Maya GUI. Returns a stats dict per file.
+    """
+    rne.RenamePipeline.from_json(pipeline_json)   # fail on a bad preset before spawning workers
+    if out_dir and not os.path.isdir(out_dir):
+        os.makedirs(out_dir)
+    jobs = [(p, pipeline_json, types, match, out_dir, suffix) for p in paths]
+    if workers == 1 or len(jobs) < 2 or not _can_spawn_workers():
+        return [_rename_job(job) for job in jobs]
+    with ProcessPoolExecutor(max_workers=workers) as pool:
+        return list(pool.map(_rename_job, jobs))
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Apply a RenameEngine rule preset to Maya ASCII files.")
+    parser.add_argument("files", nargs="+", help=".ma files to rename")
+    parser.add_argument("--preset", required=True, help="JSON file with a RenamePipeline (RenamePipeline.to_json())")
+    parser.add_argument("--types", default="", help="comma-separated node types to rename (default: all)")
+    parser.add_argument("--match", default=None, help="only rename nodes whose name matches this glob")
+    parser.add_argument("--out", default=None, help="output folder (default: next to each file)")
+    parser.add_argument("--suffix", default="_renamed", help="output file suffix when --out is not given; '' = in place")
+    parser.add_argument("--workers", type=int, default=None, help="worker processes (default: CPU count)")
+    args = parser.parse_args(argv)
+    with open(args.preset, "r") as f:
+        pipeline_json = f.read()
+    types = [t.strip() for t in args.types.split(",") if t.strip()] or None
+    for stats in rename_ma_files(args.files, pipeline_json, types, args.match, args.out, args.suffix, args.workers):
+        print("[MayaAsciiRename] %s -> %s: %d nodes, %d renamed, %d adjusted, %d invalid (%.2fs)" %
+              (stats["file"], stats["output"], stats["nodes"], stats["renamed"], stats["adjusted"],
+               stats["invalid"], stats["seconds"]))
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,82 @@
+# Undoable execution of OpenMaya modifiers for the PythonScripts tools
+# The module doubles as a tiny Maya plugin (loaded on demand) that registers one command.
+#
+#   import ModifierUndo as mu
+#   if mu.load_undo_command():
+#       modifier = om.MDagModifier()
+#       ...                                  # queue renames, nodes, plug values
+#       mu.run_modifier(modifier)            # one command, one undo step
+#
+# Used by RenameEngine (API rename backend), AdvancedControlsUI (batch control
+# factory) and ControlColor (override colors).
+
+import os
+
+try:
+    import maya.cmds as cmds
+    import maya.api.OpenMaya as om
+except ImportError:
+    cmds = None
+    om = None
+
+UNDO_COMMAND = "modifierUndoApply"
+
+maya_useNewAPI = True
+_PENDING_MODIFIERS = []
+
+
+def load_undo_command():
+    """Load this file as a plugin so UNDO_COMMAND exists; False if that fails."""
+    if cmds is None:
+        return False
+    if hasattr(cmds, UNDO_COMMAND):
+        return True
+    try:
+        cmds.loadPlugin(os.path.splitext(os.path.abspath(__file__))[0] + ".py", quiet=True)
+    except RuntimeError:
+        return False
+    return hasattr(cmds, UNDO_COMMAND)
+
+def run_modifier(modifier):
+    """
+    Execute an MDGModifier/MDagModifier through UNDO_COMMAND: one command, one
+    undo record. Callers check load_undo_command() first.
+    """
+    _PENDING_MODIFIERS.append(modifier)
+    getattr(cmds, UNDO_COMMAND)()
+
+
+if om is not None:
+    class ApplyModifierCommand(om.MPxCommand):
+        """Runs the modifier queued by run_modifier and keeps it for undo/redo."""
+        def __init__(self):
+            om.MPxCommand.__init__(self)
+            self.modifier = None
+
+        @staticmethod
+        def creator():
+            return ApplyModifierCommand()
+
+        def doIt(self, args):
+            # the plugin copy of this module may differ from the one the tools imported
+            import ModifierUndo
+            pending = ModifierUndo._PENDING_MODIFIERS
+            self.modifier = pending.pop() if pending else None
+            self.redoIt()
+
+        def redoIt(self):
+            if self.modifier is not None:
+                self.modifier.doIt()
+
+        def undoIt(self):
+            if self.modifier is not None:
+                self.modifier.undoIt()
+
+        def isUndoable(self):
+            return self.modifier is not None
+
+def initializePlugin(plugin):
+    om.MFnPlugin(plugin).registerCommand(UNDO_COMMAND, ApplyModifierCommand.creator)
+
+def uninitializePlugin(plugin):
+    om.MFnPlugin(plugin).deregisterCommand(UNDO_COMMAND)
@@ -0,0 +1,82 @@
+# Local render queue for prepared pass scenes (see WorkDaySpecialPassesSetup batch mode)
+# Runs from any Python 3 (no maya modules needed) or mayapy; renders run as separate Render processes.
+#
+#   python PassRenderQueue.py --workers 3 --render "C:/Program Files/Autodesk/Maya2024/bin/Render.exe" a.mb b.mb
+#
+#   import PassRenderQueue as prq
+#   results = prq.render_scenes(scenes, workers=3)
+#
+# Each scene is one `Render -r <renderer> <scene>` process; at most `workers` run at
+# once. Output of each render goes to <scene>.render.log next to the scene.
+
+import os
+import sys
+import time
+import argparse
+import subprocess
+from concurrent.futures import ThreadPoolExecutor
+
+DEFAULT_RENDERER = "arnold"
+
+
+def default_render_exe():
+    """Maya's batch Render executable from MAYA_LOCATION, or "Render" on the PATH."""
+    exe = "Render.exe" if sys.platform.startswith("win") else "Render"
+    location = os.environ.get("MAYA_LOCATION")
+    if location and os.path.isfile(os.path.join(location, "bin", exe)):
+        return os.path.join(location, "bin", exe)
+    return exe
+
+def render_command(scene, render_exe=None, renderer=DEFAULT_RENDERER, image_dir=None, extra_args=()):
+    cmd = [render_exe or default_render_exe(), "-r", renderer]
+    if image_dir:
+        cmd += ["-rd", image_dir]
+    cmd += list(extra_args)
+    cmd.append(scene)
+    return cmd
+
+def render_scene(scene, render_exe=None, renderer=DEFAULT_RENDERER, image_dir=None, extra_args=()):
+    """
+    Render one scene and wait for it. Returns a stats dict (scene, log, returncode, seconds).
+    """
+    start = time.perf_counter()
+    log_path = os.path.splitext(scene)[0] + ".render.log"
+    cmd = render_command(scene, render_exe, renderer, image_dir, extra_args)
+    with open(log_path, "w") as log:
+        try:
+            returncode = subprocess.call(cmd, stdout=log, stderr=subprocess.STDOUT)
+        except OSError as e:
+            log.write("Could not start %s: %s\n" % (cmd[0], e))
+            returncode = -1
+    return dict(scene=scene, log=log_path, returncode=returncode, seconds=time.perf_counter() - start)
+
+def render_scenes(scenes, workers=2, render_exe=None, renderer=DEFAULT_RENDERER, image_dir=None, extra_args=()):
+    """
+    Render many scenes, at most `workers` Render processes at a time. Threads only
+    wait on the child processes, the renders themselves run in parallel.
+    Returns a stats dict per scene, in input order.
+    """
+    jobs = [(scene, render_exe, renderer, image_dir, tuple(extra_args)) for scene in scenes]
+    if workers == 1 or len(jobs) < 2:
+        return [render_scene(*job) for job in jobs]
+    with ThreadPoolExecutor(max_workers=workers) as pool:
+        return list(pool.map(lambda job: render_scene(*job), jobs))
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Render prepared pass scenes with a local process pool.")
+    parser.add_argument("scenes", nargs="+", help="scene files to render")
+    parser.add_argument("--workers", type=int, default=2, help="concurrent Render processes (default: 2)")
+    parser.add_argument("--render", default=None, help="Render executable (default: from MAYA_LOCATION)")
+    parser.add_argument("--renderer", default=DEFAULT_RENDERER, help="renderer passed to -r (default: arnold)")
+    parser.add_argument("--images", default=None, help="image output folder passed to -rd")
+    args, extra = parser.parse_known_args(argv)
+    failed = 0
+    for stats in render_scenes(args.scenes, args.workers, args.render, args.renderer, args.images, extra):
+        failed += stats["returncode"] != 0
+        print("[PassRenderQueue] %s: exit %d (%.1fs), log %s" %
+              (stats["scene"], stats["returncode"], stats["seconds"], stats["log"]))
+    return 1 if failed else 0
+
+if __name__ == "__main__":
+    sys.exit(main())
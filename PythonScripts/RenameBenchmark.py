@@ -0,0 +1,45 @@
+# Benchmark: cmds.rename backend vs. OpenMaya MDagModifier backend of RenameEngine
+# Run inside Maya (script editor or mayapy). Builds throwaway nodes under a temp group,
+# renames them with both backends and deletes everything afterwards.
+
+import sys
+path = "D:/GitHubStuff/University/MayaScripts/PythonScripts"
+
+if path not in sys.path:
+    sys.path.append(path)
+
+import time
+import maya.cmds as cmds
+import RenameEngine as rne
+#import importlib
+#importlib.reload(rne)
+
+COUNTS = (1000, 10000)
+
+
+def build_nodes(count):
+    root = cmds.createNode("transform", name="renameBench_grp")
+    nodes = [cmds.createNode("transform", name="bench_%d" % i, parent=root) for i in range(count)]
+    return cmds.ls(nodes, long=True)
+
+def time_backend(count, api):
+    nodes = build_nodes(count)
+    root = rne.scope_of(nodes[0])
+    backend = rne.default_backend(api=api)
+    start = time.perf_counter()
+    plan = rne.plan_renames(nodes, ["bench_%d_Jnt" % i for i in range(count)], backend=backend)
+    planned = time.perf_counter()
+    stats, errors = rne.execute_plan(plan, backend, undo_name="renameBenchmark")
+    end = time.perf_counter()
+    cmds.delete(root)
+    label = "api" if isinstance(backend, rne.MayaApiRenameBackend) else "cmds"
+    return label, planned - start, end - planned, stats, errors
+
+def run():
+    for count in COUNTS:
+        for api in (False, True):
+            label, plan_s, exec_s, stats, errors = time_backend(count, api)
+            print("[RenameBenchmark] %6d nodes  %-4s  plan %.3fs  rename %.3fs  (%d renamed, %d failed)" %
+                  (count, label, plan_s, exec_s, stats["renamed"], len(errors)))
+
+run()
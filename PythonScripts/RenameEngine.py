@@ -0,0 +1,670 @@
+# Headless engine for the Renaming Tool: conflict-free batch rename planner and executor
+# Works inside Maya (MayaRenameBackend / MayaApiRenameBackend) or without Maya (DictRenameBackend)
+#
+#   import RenameEngine as rne
+#   nodes = cmds.ls(sl=True, long=True)
+#   plan = rne.plan_renames(nodes, [rne.leaf(n) + "_Jnt" for n in nodes])
+#   stats, errors = rne.execute_plan(plan)                                  # cmds.rename per node
+#   stats, errors = rne.execute_plan(plan, rne.default_backend(api=True))   # one MDagModifier
+#   rne.RenamePipeline().remove_numbers().search_replace("L_", "Left_").add_suffix("_Jnt").run(nodes)
+#
+# The API backend's modifier runs through ModifierUndo's undoable command.
+
+import re
+import sys
+import json
+import time
+from collections import namedtuple
+from contextlib import contextmanager
+from functools import lru_cache
+
+try:
+    import maya.cmds as cmds
+    import maya.api.OpenMaya as om
+except ImportError:
+    cmds = None
+    om = None
+
+path = "D:/GitHubStuff/University/MayaScripts/PythonScripts"
+
+if path not in sys.path:
+    sys.path.append(path)
+
+import ModifierUndo as mu
+#import importlib
+#importlib.reload(mu)
+
+# Maya node names: letters, digits, underscores, namespace colons; no leading digit
+VALID_NAME = re.compile(r"^[A-Za-z_:][A-Za-z0-9_:]*$")
+_NAME_ILLEGAL = re.compile(r"[^A-Za-z0-9_:]")
+TEMP_PREFIX = "__rnTmp"
+_TRAILING_DIGITS = re.compile(r"(\d+)$")
+
+
+# -----------------------
+# Name helpers
+# -----------------------
+def leaf(node):
+    """Short (leaf) name of a node: "|rig|spine_01" -> "spine_01"."""
+    return node.split("|")[-1] if node else node
+
+def maya_name(name):
+    """What cmds.rename makes of a name: illegal characters ("-", " ", ...) become "_"."""
+    return _NAME_ILLEGAL.sub("_", name) if name else name
+
+def scope_of(node):
+    """
+    Namespace a node's name has to be unique in: its parent path for DAG nodes
+    ("" for world children), None for DG nodes, which share one global scope.
+    """
+    if not node.startswith("|"):
+        return None
+    return node.rsplit("|", 1)[0]
+
+def join(scope, name):
+    return name if scope is None else scope + "|" + name
+
+def depth(node):
+    """Hierarchy depth of a long DAG name; DG nodes count as 0."""
+    return node.count("|")
+
+def unique_name(wanted, taken):
+    """Maya-style uniquifier: bump (or append) the trailing number until the name is free."""
+    if wanted not in taken:
+        return wanted
+    m = _TRAILING_DIGITS.search(wanted)
+    base = wanted[:m.start()] if m else wanted
+    num = int(m.group(1)) + 1 if m else 1
+    while base + str(num) in taken:
+        num += 1
+    return base + str(num)
+
+
+# -----------------------
+# Scene backends
+# -----------------------
+def rename_sequential(rename, steps):
+    """
+    Shared rename_steps for backends that rename one node per call. steps is
+    [(path, name)] in order; a path listed twice is the same node renamed again
+    (temporary names), so it is tracked under its original path.
+    Returns ({path: final leaf}, [(path, name, message)]).
+    """
+    current = {}
+    results = {}
+    failures = []
+    failed = set()
+    for path, name in steps:
+        if path in failed:
+            continue
+        live = current.get(path, path)
+        try:
+            result = rename(live, name)
+        except RuntimeError as e:
+            failures.append((path, name, str(e)))
+            failed.add(path)
+            continue
+        current[path] = join(scope_of(live), result)
+        results[path] = result
+    return results, failures
+
+
+class MayaRenameBackend(object):
+    """Rename backend for the open scene; the name index comes from a single ls call."""
+    def name_index(self):
+        """{scope: set(leaf names)} for every node in the scene."""
+        index = {}
+        for node in cmds.ls(long=True) or []:
+            index.setdefault(scope_of(node), set()).add(leaf(node))
+        return index
+
+    def uuids(self, nodes):
+        """{long_name: uuid}. Both listings get the same arguments, so they pair up in order."""
+        if not nodes:
+            return {}
+        paths = cmds.ls(nodes, long=True) or []
+        ids = cmds.ls(nodes, uuid=True) or []
+        if len(paths) != len(ids):
+            return dict((p, (cmds.ls(p, uuid=True) or [None])[0]) for p in paths)
+        return dict(zip(paths, ids))
+
+    def paths(self, uuids):
+        """{uuid: current long name} for every uuid that still exists."""
+        if not uuids:
+            return {}
+        ids = cmds.ls(uuids, uuid=True) or []
+        paths = cmds.ls(uuids, long=True) or []
+        if len(paths) != len(ids):
+            return dict((u, (cmds.ls(u, long=True) or [None])[0]) for u in uuids)
+        return dict(zip(ids, paths))
+
+    def rename(self, node, new_name):
+        """Rename one node; returns the name Maya actually gave it."""
+        return cmds.rename(node, new_name)
+
+    def rename_steps(self, steps):
+        return rename_sequential(self.rename, steps)
+
+    @contextmanager
+    def undo_chunk(self, name):
+        cmds.undoInfo(openChunk=True, chunkName=name)
+        try:
+            yield
+        finally:
+            cmds.undoInfo(closeChunk=True)
+
+
+class MayaApiRenameBackend(MayaRenameBackend):
+    """
+    Queues every rename into one om.MDagModifier and executes it at once through
+    ModifierUndo's undoable command, so a batch is a single command and a single undo
+    record instead of one cmds.rename (and undo entry) per node.
+    """
+    def rename_steps(self, steps):
+        objects = {}
+        failures = []
+        for path, name in steps:
+            if path in objects:
+                continue
+            try:
+                sl = om.MSelectionList()
+                sl.add(path)
+                obj = sl.getDependNode(0)
+            except RuntimeError:
+                failures.append((path, name, "No object matches name: %s" % path))
+                objects[path] = None
+                continue
+            fn = om.MFnDependencyNode(obj)
+            if fn.isLocked or fn.isFromReferencedFile:
+                failures.append((path, name, "Node is locked or referenced."))
+                objects[path] = None
+                continue
+            objects[path] = obj
+        modifier = om.MDagModifier()
+        for path, name in steps:
+            if objects[path] is not None:
+                modifier.renameNode(objects[path], name)
+        mu.run_modifier(modifier)
+        results = dict((path, om.MFnDependencyNode(obj).name())
+                       for path, obj in objects.items() if obj is not None)
+        return results, failures
+
+
+class DictRenameBackend(object):
+    """
+    Fake scene from a list of long names (DAG) and plain names (DG), so plans can
+    be checked and profiled without Maya. Renames follow Maya's sibling rules.
+    """
+    def __init__(self, nodes):
+        self.nodes = dict((node, "FAKE-%08d" % i) for i, node in enumerate(nodes))
+
+    def uuids(self, nodes):
+        return dict((n, self.nodes[n]) for n in nodes if n in self.nodes)
+
+    def paths(self, uuids):
+        wanted = set(uuids)
+        return dict((u, n) for n, u in self.nodes.items() if u in wanted)
+
+    def name_index(self):
+        index = {}
+        for node in self.nodes:
+            index.setdefault(scope_of(node), set()).add(leaf(node))
+        return index
+
+    def rename_steps(self, steps):
+        return rename_sequential(self.rename, steps)
+
+    def rename(self, node, new_name):
+        if node not in self.nodes:
+            raise RuntimeError("No object matches name: %s" % node)
+        scope = scope_of(node)
+        siblings = set(leaf(n) for n in self.nodes if scope_of(n) == scope and n != node)
+        new_name = unique_name(new_name, siblings)
+        new_path = join(scope, new_name)
+        prefix = node + "|"
+        moved = [(n, self.nodes.pop(n)) for n in list(self.nodes) if n == node or n.startswith(prefix)]
+        for n, uuid in moved:
+            self.nodes[new_path + n[len(node):]] = uuid
+        return new_name
+
+    @contextmanager
+    def undo_chunk(self, name):
+        yield
+
+
+def default_backend(api=False):
+    """
+    Backend for the open scene. api=True picks the MDagModifier backend; it falls
+    back to cmds.rename when the undo command can't be registered.
+    """
+    if cmds is None:
+        raise RuntimeError("maya.cmds is not available; pass a backend explicitly.")
+    if api and mu.load_undo_command():
+        return MayaApiRenameBackend()
+    return MayaRenameBackend()
+
+
+# -----------------------
+# Planner
+# -----------------------
+class RenamePlan(object):
+    """
+    Result of plan_renames.
+      targets:   {node: final leaf name} for every node that changes
+      steps:     [(node, leaf name)] in execution order (deepest first), including temporary names
+      uuids:     {node: uuid} captured at planning time; the executor resolves paths from these
+      adjusted:  {node: (wanted, final)} where the wanted name was taken
+      invalid:   {node: wanted} names Maya would reject; those nodes are left alone
+      unchanged: nodes whose wanted name is their current name
+    """
+    def __init__(self):
+        self.targets = {}
+        self.steps = []
+        self.uuids = {}
+        self.adjusted = {}
+        self.invalid = {}
+        self.unchanged = []
+
+    def __len__(self):
+        return len(self.targets)
+
+    def preview(self):
+        """[(node, old leaf, new leaf)] in input order."""
+        return [(node, leaf(node), name) for node, name in self.targets.items()]
+
+
+def resolve_targets(nodes, new_names, index):
+    """
+    Final name for every node with collisions resolved in memory; no steps and
+    no scene calls, so it is cheap enough to rerun on every keystroke.
+    Returns (plan, taken) where taken is {scope: names in use after the batch}.
+    """
+    plan = RenamePlan()
+    wanted = {}
+    for node, name in zip(nodes, new_names):
+        if node in wanted or node in plan.invalid:
+            continue
+        name = maya_name(name)
+        if name == leaf(node):
+            plan.unchanged.append(node)
+        elif not name or not VALID_NAME.match(name):
+            plan.invalid[node] = name
+        else:
+            wanted[node] = name
+
+    # names that stay put: everything indexed, minus what the moving nodes vacate
+    moving_by_scope = {}
+    for node in wanted:
+        moving_by_scope.setdefault(scope_of(node), set()).add(leaf(node))
+    taken = {}
+    for node, name in wanted.items():
+        scope = scope_of(node)
+        if scope not in taken:
+            taken[scope] = set(index.get(scope, ())) - moving_by_scope.get(scope, set())
+        final = unique_name(name, taken[scope])
+        taken[scope].add(final)
+        plan.targets[node] = final
+        if final != name:
+            plan.adjusted[node] = (name, final)
+    return plan, taken
+
+
+def plan_renames(nodes, new_names, index=None, backend=None):
+    """
+    Plan renaming each long name in nodes to the matching leaf name in new_names.
+    Illegal characters are replaced with "_" first, as cmds.rename does.
+
+    The scene's names are indexed once; collisions are resolved in memory (names
+    held by untouched nodes or claimed twice get a Maya-style number), and steps
+    are ordered so every node moves only after the current holder of its target
+    has moved away. Swaps and longer cycles (A->B, B->A) go through one
+    temporary name each. Steps run deepest-first, so renaming a parent never
+    invalidates a path that is still queued. Nothing is renamed here.
+    """
+    backend = backend or default_backend()
+    if index is None:
+        index = backend.name_index()
+    plan, taken = resolve_targets(nodes, new_names, index)
+
+    # (scope, name) -> moving node that currently holds it
+    holder = dict(((scope_of(n), leaf(n)), n) for n in plan.targets)
+    # (scope, name) -> moving node waiting for that name to be vacated
+    waiting = {}
+    ready = []
+    for node, final in plan.targets.items():
+        key = (scope_of(node), final)
+        if key in holder:
+            waiting[key] = node
+        else:
+            ready.append(node)
+
+    done = set()
+    def vacate(node):
+        waiter = waiting.pop((scope_of(node), leaf(node)), None)
+        if waiter is not None:
+            ready.append(waiter)
+
+    def drain():
+        while ready:
+            node = ready.pop()
+            if node in done:
+                continue
+            done.add(node)
+            plan.steps.append((node, plan.targets[node]))
+            vacate(node)
+
+    drain()
+    # whatever is left sits on a cycle: park one member on a temp name to break it
+    temp_count = 0
+    for node in plan.targets:
+        if node in done:
+            continue
+        names = taken[scope_of(node)]
+        temp = unique_name("%s%d" % (TEMP_PREFIX, temp_count), names)
+        temp_count += 1
+        names.add(temp)
+        plan.steps.append((node, temp))
+        vacate(node)
+        drain()
+    # name dependencies never cross scopes, so a stable depth sort keeps their order
+    plan.steps.sort(key=lambda step: -depth(step[0]))
+    plan.uuids = backend.uuids(list(plan.targets))
+    return plan
+
+
+# (old, new) per input node; status is one of PREVIEW_STATUSES
+PreviewRow = namedtuple("PreviewRow", "node old new status")
+PREVIEW_STATUSES = ("rename", "unchanged", "taken", "invalid")
+
+# one entry of a dry run: conflict is True when the wanted name is taken or invalid
+RenameDiff = namedtuple("RenameDiff", "node old new conflict")
+
+def dry_run(nodes, new_names, index=None, backend=None):
+    """
+    What a rename would do, without touching the scene: a RenameDiff for every
+    node whose name changes. For conflicts, new is the name the node would
+    actually get (taken) or the rejected name (invalid).
+    """
+    if index is None:
+        index = (backend or default_backend()).name_index()
+    return [RenameDiff(row.node, row.old, row.new, row.status in ("taken", "invalid"))
+            for row in preview_rows(nodes, new_names, index) if row.status != "unchanged"]
+
+def preview_rows(nodes, new_names, index):
+    """Row per input node for previews: the name apply would give it and why."""
+    plan = resolve_targets(nodes, new_names, index)[0]
+    rows = []
+    for node, wanted in zip(nodes, new_names):
+        old = leaf(node)
+        if node in plan.invalid:
+            rows.append(PreviewRow(node, old, wanted, "invalid"))
+        elif node in plan.adjusted:
+            rows.append(PreviewRow(node, old, plan.targets[node], "taken"))
+        elif node in plan.targets:
+            rows.append(PreviewRow(node, old, plan.targets[node], "rename"))
+        else:
+            rows.append(PreviewRow(node, old, old, "unchanged"))
+    return rows
+
+
+# -----------------------
+# Executor
+# -----------------------
+def execute_plan(plan, backend=None, undo_name="renameBatch"):
+    """
+    Run a RenamePlan inside one named undo chunk. Returns (stats, errors) where
+    stats has renamed/failed/adjusted/seconds and errors lists (node, name, message).
+
+    Current paths come from one bulk lookup of the plan's UUIDs, so a plan stays
+    valid if nodes were renamed or moved since planning. Because steps are
+    deepest-first, those paths hold for the whole pass. The backend runs all
+    steps in one call (per-node cmds.rename, or a single modifier).
+    A node Maya still renames differently is reported in stats["adjusted"]
+    rather than retried.
+    """
+    backend = backend or default_backend()
+    by_uuid = backend.paths(list(plan.uuids.values()))
+    current = {}
+    errors = []
+    failed = set()
+    for node, final in plan.targets.items():
+        uuid = plan.uuids.get(node)
+        path = by_uuid.get(uuid) if uuid else node
+        if path is None:
+            errors.append((node, final, "Node no longer exists."))
+            failed.add(node)
+        else:
+            current[node] = path
+    steps = [(current[node], name) for node, name in plan.steps if node in current]
+    start = time.perf_counter()
+    with backend.undo_chunk(undo_name):
+        results, failures = backend.rename_steps(steps)
+    elapsed = time.perf_counter() - start
+    node_of = dict((path, node) for node, path in current.items())
+    for path, name, message in failures:
+        errors.append((node_of[path], name, message))
+        failed.add(node_of[path])
+    adjusted = len(plan.adjusted)
+    for node, path in current.items():
+        if node not in failed and results.get(path, plan.targets[node]) != plan.targets[node]:
+            adjusted += 1
+    stats = dict(renamed=len(plan.targets) - len(failed), failed=len(failed),
+                 adjusted=adjusted, seconds=elapsed)
+    return stats, errors
+
+
+def rename_nodes(nodes, new_names, backend=None, undo_name="renameBatch", api=False):
+    """Plan and execute in one go; api=True uses the MDagModifier backend. Returns (plan, stats, errors)."""
+    backend = backend or default_backend(api)
+    plan = plan_renames(nodes, new_names, backend=backend)
+    stats, errors = execute_plan(plan, backend, undo_name)
+    return plan, stats, errors
+
+
+# -----------------------
+# Rename rules: pure string transforms, compiled once per pipeline
+# -----------------------
+RULE_KINDS = ("prefix_suffix", "number", "remove_substring", "remove_chars", "remove_numbers", "search_replace")
+
+def build_number_string(num, padding):
+    if padding and padding > 0:
+        return str(num).zfill(padding)
+    return str(num)
+
+def compile_rule(kind, params):
+    """
+    (kind, params) -> fn(name, index) -> new name. Regexes are compiled and case
+    options resolved here, once, so applying a rule is plain string work.
+    index is the node's position in the batch (used by "number").
+    Bad regex patterns raise re.error.
+    """
+    p = params
+    if kind == "prefix_suffix":
+        prefix, suffix = p.get("prefix", ""), p.get("suffix", "")
+        return lambda name, i: prefix + name + suffix
+    if kind == "number":
+        base, prefix, suffix = p.get("base", ""), p.get("prefix", ""), p.get("suffix", "")
+        sep, start, padding = p.get("separator", ""), p.get("start", 1), p.get("padding", 0)
+        use_number, before_suffix = p.get("use_number", True), p.get("before_suffix", False)
+        def number(name, i):
+            core = base or name
+            if not use_number:
+                return prefix + core + suffix
+            numstr = sep + build_number_string(start + i, padding)
+            if before_suffix:
+                return prefix + core + numstr + suffix
+            return prefix + core + suffix + numstr
+        return number
+    if kind == "remove_substring":
+        text = p.get("text", "")
+        return lambda name, i: name.replace(text, "") if text else name
+    if kind == "remove_chars":
+        start, end = max(0, p.get("start", 0)), max(0, p.get("end", 0))
+        def remove_chars(name, i):
+            name = name[start:]
+            return name[:max(0, len(name) - end)] if end else name
+        return remove_chars
+    if kind == "remove_numbers":
+        parts = []
+        if p.get("leading", True):
+            parts.append(r"^\d+")
+        if p.get("trailing", True):
+            parts.append(r"\d+$")
+        if not parts:
+            return lambda name, i: name
+        digits = re.compile("|".join(parts))
+        return lambda name, i: digits.sub("", name)
+    if kind == "search_replace":
+        replace = compile_search_replace(p.get("search", ""), p.get("replace", ""), p.get("regex", False),
+                                         p.get("case_sensitive", True), p.get("whole_name", False))
+        return lambda name, i: replace(name)
+    raise ValueError("Unknown rename rule: %s" % kind)
+
+@lru_cache(maxsize=64)
+def compile_search_replace(search, replace, regex=False, case_sensitive=True, whole_name=False):
+    """
+    Cached fn(name) -> new name for one search/replace setting. The pattern and
+    the replacement template are validated once up front (re.error), so a bad
+    group reference fails before any rename instead of on the first match.
+    """
+    if not search:
+        return lambda name: name
+    flags = 0 if case_sensitive else re.IGNORECASE
+    if regex:
+        if whole_name:
+            if not search.startswith("^"):
+                search = "^" + search
+            if not search.endswith("$"):
+                search = search + "$"
+        compiled = re.compile(search, flags)
+        try:
+            compiled.sub(replace, "")
+        except IndexError as e:
+            # re reports an unknown \g<name> as IndexError
+            raise re.error(str(e))
+        return lambda name: compiled.sub(replace, name)
+    if whole_name:
+        if case_sensitive:
+            return lambda name: replace if name == search else name
+        folded = search.lower()
+        return lambda name: replace if name.lower() == folded else name
+    if case_sensitive:
+        return lambda name: name.replace(search, replace)
+    # literal replacement text: no backslash/group expansion in plain mode
+    compiled = re.compile(re.escape(search), re.IGNORECASE)
+    return lambda name: compiled.sub(lambda m: replace, name)
+
+def describe_rule(kind, params):
+    """One-line summary of a rule for lists and logs."""
+    p = params
+    if kind == "prefix_suffix":
+        return "Add prefix/suffix: '%s' + name + '%s'" % (p.get("prefix", ""), p.get("suffix", ""))
+    if kind == "number":
+        numbering = "number from %s, padding %s" % (p.get("start", 1), p.get("padding", 0)) if p.get("use_number", True) else "no number"
+        return "Rename: %s%s%s (%s)" % (p.get("prefix", ""), p.get("base", "") or "<name>", p.get("suffix", ""), numbering)
+    if kind == "remove_substring":
+        return "Remove substring: '%s'" % p.get("text", "")
+    if kind == "remove_chars":
+        return "Remove chars: %s from start, %s from end" % (p.get("start", 0), p.get("end", 0))
+    if kind == "remove_numbers":
+        ends = [e for e, on in (("leading", p.get("leading", True)), ("trailing", p.get("trailing", True))) if on]
+        return "Remove numbers: %s" % (" + ".join(ends) or "none")
+    mode = "regex" if p.get("regex") else "text"
+    return "Search & replace (%s): '%s' -> '%s'" % (mode, p.get("search", ""), p.get("replace", ""))
+
+def rules_to_json(specs):
+    return json.dumps([[kind, params] for kind, params in specs])
+
+def rules_from_json(text):
+    """[(kind, params), ...] from a saved preset; unknown rule kinds raise ValueError."""
+    specs = [(kind, dict(params)) for kind, params in json.loads(text)]
+    for kind, _ in specs:
+        if kind not in RULE_KINDS:
+            raise ValueError("Unknown rename rule: %s" % kind)
+    return specs
+
+
+class RenamePipeline(object):
+    """
+    Ordered rename rules composed into a single transform: every rule runs in
+    memory on the leaf names and each node is renamed once at the end, however
+    many rules are stacked.
+
+        pipe = RenamePipeline().remove_numbers().search_replace("L_", "Left_").add_suffix("_Jnt")
+        pipe.apply(["L_arm01"])      # ["Left_arm_Jnt"]
+        plan, stats, errors = pipe.run(cmds.ls(sl=True, long=True))
+
+    Rules are plain (kind, params) specs, so a pipeline round-trips through
+    to_json()/from_json() for presets and batch runs over many assets.
+    """
+    def __init__(self, specs=None):
+        self.specs = []
+        self._compiled = []
+        for kind, params in specs or ():
+            self.add(kind, **params)
+
+    def add(self, kind, **params):
+        if kind not in RULE_KINDS:
+            raise ValueError("Unknown rename rule: %s" % kind)
+        # compiling here also rejects bad patterns before anything is renamed
+        self._compiled.append(compile_rule(kind, params))
+        self.specs.append((kind, params))
+        return self
+
+    def add_prefix(self, prefix):
+        return self.add("prefix_suffix", prefix=prefix, suffix="")
+
+    def add_suffix(self, suffix):
+        return self.add("prefix_suffix", prefix="", suffix=suffix)
+
+    def number(self, base="", start=1, padding=0, separator="", prefix="", suffix="",
+               use_number=True, before_suffix=False):
+        return self.add("number", base=base, start=start, padding=padding, separator=separator,
+                        prefix=prefix, suffix=suffix, use_number=use_number, before_suffix=before_suffix)
+
+    def remove_substring(self, text):
+        return self.add("remove_substring", text=text)
+
+    def remove_chars(self, start=0, end=0):
+        return self.add("remove_chars", start=start, end=end)
+
+    def remove_numbers(self, leading=True, trailing=True):
+        return self.add("remove_numbers", leading=leading, trailing=trailing)
+
+    def search_replace(self, search, replace="", regex=False, case_sensitive=True, whole_name=False):
+        return self.add("search_replace", search=search, replace=replace, regex=regex,
+                        case_sensitive=case_sensitive, whole_name=whole_name)
+
+    def describe(self):
+        return [describe_rule(kind, params) for kind, params in self.specs]
+
+    def to_json(self):
+        return rules_to_json(self.specs)
+
+    @classmethod
+    def from_json(cls, text):
+        return cls(rules_from_json(text))
+
+    def apply(self, names):
+        """New leaf names for a list of leaf names, in order."""
+        out = []
+        rules = self._compiled
+        for i, name in enumerate(names):
+            for rule in rules:
+                name = rule(name, i)
+            out.append(name)
+        return out
+
+    def apply_one(self, name, index=0):
+        """New leaf name for a single name at position index (for streaming callers)."""
+        for rule in self._compiled:
+            name = rule(name, index)
+        return name
+
+    def dry_run(self, nodes, index=None, backend=None):
+        """Structured diff (see dry_run) of running this pipeline on long names."""
+        return dry_run(nodes, self.apply([leaf(n) for n in nodes]), index, backend)
+
+    def run(self, nodes, backend=None, undo_name="renamePipeline", api=False):
+        """Apply to long names and commit with one planned rename per node. Returns (plan, stats, errors)."""
+        return rename_nodes(nodes, self.apply([leaf(n) for n in nodes]), backend, undo_name, api)
@@ -0,0 +1,216 @@
+# Live rename preview panel for the Renaming Tool (Qt model/view)
+#
+# The table is fed by RenameEngine.preview_rows, i.e. the same compiled rules and
+# collision resolution that apply uses, so preview and rename can't disagree.
+# Typing in the tool only restarts a short timer; when it fires the rules are
+# re-applied in memory, collisions are re-resolved only in the parent scopes where a
+# wanted name changed, and only the rows whose result changed are repainted.
+
+from PySide2 import QtWidgets, QtCore, QtGui
+from shiboken2 import wrapInstance
+import maya.OpenMayaUI as omui
+import maya.cmds as cmds
+
+import re
+import sys
+path = "D:/GitHubStuff/University/MayaScripts/PythonScripts"
+
+if path not in sys.path:
+    sys.path.append(path)
+
+import RenameEngine as rne
+#import importlib
+#importlib.reload(rne)
+
+DEBOUNCE_MS = 150
+ROW_HEIGHT = 18
+STATUS_COLORS = {
+    "rename": None,
+    "unchanged": QtGui.QColor(130, 130, 130),
+    "taken": QtGui.QColor(230, 170, 60),
+    "invalid": QtGui.QColor(230, 80, 80),
+}
+
+
+def get_maya_main_window():
+    ptr = omui.MQtUtil.mainWindow()
+    return wrapInstance(int(ptr), QtWidgets.QWidget)
+
+
+class RenamePreviewModel(QtCore.QAbstractTableModel):
+    """Rows of RenameEngine.PreviewRow; updates signal only the rows that changed."""
+    HEADERS = ("Current name", "New name", "Status")
+
+    def __init__(self, parent=None):
+        super(RenamePreviewModel, self).__init__(parent)
+        self.rows = []
+
+    def rowCount(self, parent=QtCore.QModelIndex()):
+        return 0 if parent.isValid() else len(self.rows)
+
+    def columnCount(self, parent=QtCore.QModelIndex()):
+        return 0 if parent.isValid() else len(self.HEADERS)
+
+    def headerData(self, section, orientation, role=QtCore.Qt.DisplayRole):
+        if role == QtCore.Qt.DisplayRole and orientation == QtCore.Qt.Horizontal:
+            return self.HEADERS[section]
+        return None
+
+    def data(self, index, role=QtCore.Qt.DisplayRole):
+        if not index.isValid():
+            return None
+        row = self.rows[index.row()]
+        if role == QtCore.Qt.DisplayRole:
+            return (row.old, row.new, row.status)[index.column()]
+        if role == QtCore.Qt.ToolTipRole:
+            return row.node
+        if role == QtCore.Qt.ForegroundRole and index.column() > 0:
+            return STATUS_COLORS.get(row.status)
+        return None
+
+    def set_rows(self, rows):
+        if len(rows) != len(self.rows):
+            self.beginResetModel()
+            self.rows = rows
+            self.endResetModel()
+            return
+        old, self.rows = self.rows, rows
+        # one dataChanged per run of changed rows; untouched rows are never repainted
+        last = self.columnCount() - 1
+        start = None
+        for i in range(len(rows) + 1):
+            changed = i < len(rows) and rows[i] != old[i]
+            if changed and start is None:
+                start = i
+            elif not changed and start is not None:
+                self.dataChanged.emit(self.index(start, 0), self.index(i - 1, last))
+                start = None
+
+
+class RenamePreviewPanel(QtWidgets.QDialog):
+    """
+    Preview table for one set of rename rules. rules_source() returns the
+    current (kind, params) specs (read from the tool's widgets); on_apply(nodes,
+    new_names, index) renames the previewed nodes to the names shown.
+    """
+    def __init__(self, parent=get_maya_main_window()):
+        super(RenamePreviewPanel, self).__init__(parent)
+        self.setWindowTitle("Rename Preview")
+        self.setMinimumSize(520, 420)
+        self.rules_source = None
+        self.on_apply = None
+        self.nodes = []
+        self.names = []
+        self.scopes = []
+        self.index = {}
+        # rule output and rows of the last refresh, so the next one can skip untouched scopes
+        self.wanted = None
+        self.rows = []
+        self.timer = QtCore.QTimer(self)
+        self.timer.setSingleShot(True)
+        self.timer.setInterval(DEBOUNCE_MS)
+        self.timer.timeout.connect(self.refresh)
+        self.build_ui()
+
+    def build_ui(self):
+        layout = QtWidgets.QVBoxLayout(self)
+        self.summary = QtWidgets.QLabel()
+        layout.addWidget(self.summary)
+        self.model = RenamePreviewModel(self)
+        self.view = QtWidgets.QTableView()
+        self.view.setModel(self.model)
+        # fixed row heights keep scrolling O(visible rows) even for 20k+ nodes
+        self.view.verticalHeader().setSectionResizeMode(QtWidgets.QHeaderView.Fixed)
+        self.view.verticalHeader().setDefaultSectionSize(ROW_HEIGHT)
+        self.view.horizontalHeader().setSectionResizeMode(QtWidgets.QHeaderView.Interactive)
+        self.view.horizontalHeader().setStretchLastSection(True)
+        self.view.setColumnWidth(0, 200)
+        self.view.setColumnWidth(1, 200)
+        self.view.setWordWrap(False)
+        self.view.setSelectionBehavior(QtWidgets.QAbstractItemView.SelectRows)
+        layout.addWidget(self.view)
+        buttons = QtWidgets.QHBoxLayout()
+        grab_btn = QtWidgets.QPushButton("Use Current Selection")
+        grab_btn.clicked.connect(self.grab_selection)
+        buttons.addWidget(grab_btn)
+        apply_btn = QtWidgets.QPushButton("Apply")
+        apply_btn.clicked.connect(self.apply)
+        buttons.addWidget(apply_btn)
+        layout.addLayout(buttons)
+
+    def grab_selection(self):
+        self.nodes = cmds.ls(sl=True, long=True) or []
+        self.names = [rne.leaf(n) for n in self.nodes]
+        self.scopes = [rne.scope_of(n) for n in self.nodes]
+        self.wanted = None
+        # the scene's name index only changes when the selection is re-read
+        self.index = rne.default_backend().name_index() if self.nodes else {}
+        self.refresh()
+
+    def schedule(self):
+        self.timer.start()
+
+    def new_names(self):
+        """Names the current rules give the previewed nodes, or None if a rule is invalid."""
+        specs = self.rules_source() if self.rules_source else []
+        try:
+            pipe = rne.RenamePipeline(specs)
+        except (re.error, ValueError) as e:
+            self.summary.setText("Invalid rule: %s" % e)
+            return None
+        return pipe.apply(self.names)
+
+    def refresh(self):
+        new_names = self.new_names()
+        if new_names is None:
+            return
+        if self.wanted is None:
+            picked = range(len(self.nodes))
+            rows = [None] * len(self.nodes)
+        else:
+            # names are unique per scope, so a changed name can only move rows of its own scope
+            changed = set(self.scopes[i] for i, (old, new) in enumerate(zip(self.wanted, new_names)) if old != new)
+            picked = [i for i, scope in enumerate(self.scopes) if scope in changed]
+            rows = list(self.rows)
+        if picked:
+            fresh = rne.preview_rows([self.nodes[i] for i in picked], [new_names[i] for i in picked], self.index)
+            for i, row in zip(picked, fresh):
+                rows[i] = row
+        self.wanted, self.rows = new_names, rows
+        self.model.set_rows(rows)
+        counts = dict((status, 0) for status in rne.PREVIEW_STATUSES)
+        for row in rows:
+            counts[row.status] += 1
+        self.summary.setText("%d nodes: %d renamed, %d unchanged, %d name taken, %d invalid" %
+                             (len(rows), counts["rename"], counts["unchanged"], counts["taken"], counts["invalid"]))
+
+    def apply(self):
+        # rename the previewed nodes, not whatever is selected now
+        if not self.on_apply or not self.nodes:
+            return
+        new_names = self.new_names()
+        if new_names is None:
+            return
+        self.on_apply(self.nodes, new_names, self.index)
+        self.grab_selection()
+
+
+_PANEL = None
+
+def show_preview(rules_source, title, on_apply=None):
+    """Open (or retarget) the shared preview panel for a rules source."""
+    global _PANEL
+    if _PANEL is None:
+        _PANEL = RenamePreviewPanel()
+    _PANEL.setWindowTitle("Rename Preview - %s" % title)
+    _PANEL.rules_source = rules_source
+    _PANEL.on_apply = on_apply
+    _PANEL.grab_selection()
+    _PANEL.show()
+    _PANEL.raise_()
+    return _PANEL
+
+def schedule_refresh():
+    """Debounced refresh, for widget change callbacks; a no-op while the panel is closed."""
+    if _PANEL is not None and _PANEL.isVisible():
+        _PANEL.schedule()
@@ -1,9 +1,24 @@
 # Maya Python Renaming Tool - Updated
 
+import sys
+path = "D:/GitHubStuff/University/MayaScripts/PythonScripts"
+
+if path not in sys.path:
+    sys.path.append(path)
+
 import re
+import json
 import maya.cmds as cmds
+import maya.api.OpenMaya as om
+import RenameEngine as rne
+import RenamePreview as rp
+#import importlib
+#importlib.reload(rne)
+#importlib.reload(rp)
 
 WINDOW_NAME = "simpleRenamerWindow_v2"
+OPT_USE_API = "rn_use_api_backend"
+OPT_PRESETS = "rn_rule_presets"
 
 def safe_int(field, default=0):
     try:
@@ -12,270 +27,181 @@ def safe_int(field, default=0):
         return default
 
 def get_selection():
-    return cmds.ls(sl=True, long=False) or []
-
-# ------------------ Core operations ------------------
-
-def add_prefix_suffix(prefix_field, suffix_field):
+    # long names: renames are planned per parent scope and resolved through UUIDs
+    return cmds.ls(sl=True, long=True) or []
+
+def get_selection_names():
+    return [rne.leaf(node) for node in get_selection()]
+
+def use_api_backend():
+    return cmds.optionVar(exists=OPT_USE_API) and bool(cmds.optionVar(q=OPT_USE_API))
+
+def apply_renames(nodes, new_names, label, index=None):
+    # plan every target name against one scene name index, then rename each node once
+    backend = rne.default_backend(api=use_api_backend())
+    plan = rne.plan_renames(nodes, new_names, index=index, backend=backend)
+    for node, name in plan.invalid.items():
+        cmds.warning("Can't rename '%s' to '%s': not a valid Maya name; skipped." % (rne.leaf(node), name))
+    for node, (wanted, final) in plan.adjusted.items():
+        cmds.warning("Couldn't rename '%s' to '%s' exactly; name taken, using '%s'." % (rne.leaf(node), wanted, final))
+    if not plan.targets:
+        return
+    stats, errors = rne.execute_plan(plan, backend, undo_name=label)
+    for node, name, message in errors:
+        cmds.warning("Couldn't rename '%s' to '%s': %s" % (rne.leaf(node), name, message))
+    om.MGlobal.displayInfo("Rename %s: %d renamed, %d adjusted, %d failed (%.3fs)" %
+                           (label, stats["renamed"], stats["adjusted"], stats["failed"], stats["seconds"]))
+
+# ------------------ Rules (read from the UI) ------------------
+# Each section of the UI is one RenameEngine rule; the section buttons run a
+# one-rule pipeline, "Preview" shows the same rule live in the preview panel and
+# "+ Pipeline" queues it for a combined run.
+
+def prefix_suffix_rule(prefix_field, suffix_field):
+    return ("prefix_suffix", dict(prefix=cmds.textField(prefix_field, q=True, text=True) or "",
+                                  suffix=cmds.textField(suffix_field, q=True, text=True) or ""))
+
+def numbering_rule(base_field, use_number_checkbox, start_field, padding_field, placement_radio, prefix_field, suffix_field, separator_field):
+    return ("number", dict(base=cmds.textField(base_field, q=True, text=True) or "",
+                           use_number=bool(cmds.checkBox(use_number_checkbox, q=True, value=True)),
+                           start=safe_int(start_field, 1),
+                           padding=safe_int(padding_field, 0),
+                           # 1 = number before suffix, 2 = number after suffix
+                           before_suffix=cmds.radioButtonGrp(placement_radio, q=True, select=True) == 1,
+                           prefix=cmds.textField(prefix_field, q=True, text=True) or "",
+                           suffix=cmds.textField(suffix_field, q=True, text=True) or "",
+                           separator=cmds.textField(separator_field, q=True, text=True) or ""))
+
+def remove_substring_rule(remove_field):
+    return ("remove_substring", dict(text=cmds.textField(remove_field, q=True, text=True) or ""))
+
+def remove_chars_rule(num_start_field, num_end_field):
+    return ("remove_chars", dict(start=safe_int(num_start_field, 0), end=safe_int(num_end_field, 0)))
+
+def remove_numbers_rule(remove_start_checkbox, remove_end_checkbox):
+    return ("remove_numbers", dict(leading=bool(cmds.checkBox(remove_start_checkbox, q=True, value=True)),
+                                   trailing=bool(cmds.checkBox(remove_end_checkbox, q=True, value=True))))
+
+def search_replace_rule(search_field, replace_field, regex_checkbox, case_checkbox, whole_name_checkbox):
+    return ("search_replace", dict(search=cmds.textField(search_field, q=True, text=True) or "",
+                                   replace=cmds.textField(replace_field, q=True, text=True) or "",
+                                   regex=bool(cmds.checkBox(regex_checkbox, q=True, value=True)),
+                                   case_sensitive=bool(cmds.checkBox(case_checkbox, q=True, value=True)),
+                                   whole_name=bool(cmds.checkBox(whole_name_checkbox, q=True, value=True))))
+
+def rule_problem(spec):
+    """Why a rule would do nothing, or None; checked before apply and before queueing."""
+    kind, p = spec
+    if kind == "prefix_suffix" and not p["prefix"] and not p["suffix"]:
+        return "No prefix or suffix entered."
+    if kind == "remove_substring" and not p["text"]:
+        return "No substring entered to remove."
+    if kind == "remove_chars" and p["start"] <= 0 and p["end"] <= 0:
+        return "Numbers to remove are both zero; nothing to remove."
+    if kind == "remove_numbers" and not p["leading"] and not p["trailing"]:
+        return "Pick at least one: remove leading or trailing numbers."
+    if kind == "search_replace" and not p["search"]:
+        return "Enter a search pattern."
+    return None
+
+def compile_pipeline(specs):
+    try:
+        return rne.RenamePipeline(specs)
+    except (re.error, ValueError) as e:
+        cmds.warning("Invalid rename rule: %s" % e)
+        return None
+
+def confirm_diff(diff, title):
+    """False if nothing would change or the user cancels a rename with conflicts."""
+    if not diff:
+        cmds.warning("%s: no names would change." % title)
+        return False
+    conflicts = [d for d in diff if d.conflict]
+    if not conflicts:
+        return True
+    lines = ["%s -> %s" % (d.old, d.new) for d in conflicts[:10]]
+    if len(conflicts) > 10:
+        lines.append("... and %d more" % (len(conflicts) - 10))
+    answer = cmds.confirmDialog(title=title,
+                                message="%d of %d renames conflict (name taken or invalid):\n\n%s\n\nApply anyway?" %
+                                        (len(conflicts), len(diff), "\n".join(lines)),
+                                button=["Apply", "Cancel"], defaultButton="Cancel", cancelButton="Cancel",
+                                dismissString="Cancel")
+    return answer == "Apply"
+
+def run_rules(specs, label):
+    # all rules run in memory first, so a bad pattern aborts before anything is renamed
     sel = get_selection()
     if not sel:
         cmds.warning("No selection.")
         return
-    prefix = cmds.textField(prefix_field, q=True, text=True) or ""
-    suffix = cmds.textField(suffix_field, q=True, text=True) or ""
-    if prefix == "" and suffix == "":
-        cmds.warning("No prefix or suffix entered.")
+    pipe = compile_pipeline(specs)
+    if pipe is None:
         return
-    try:
-        cmds.undoInfo(openChunk=True)
-        for obj in sel:
-            newname = prefix + obj + suffix
-            try:
-                cmds.rename(obj, newname)
-            except Exception:
-                cmds.warning("Couldn't rename '%s' to '%s' exactly; Maya adjusted name." % (obj, newname))
-    finally:
-        cmds.undoInfo(closeChunk=True)
-
-def build_number_string(num, padding):
-    if padding and padding > 0:
-        return str(num).zfill(padding)
-    return str(num)
+    apply_renames(sel, pipe.apply([rne.leaf(obj) for obj in sel]), label)
 
-def rename_with_numbering(base_field, use_number_checkbox, start_field, padding_field, placement_radio, prefix_field, suffix_field, separator_field):
-    sel = get_selection()
-    if not sel:
-        cmds.warning("No selection.")
+def run_rule(reader, label, *widgets):
+    spec = reader(*widgets)
+    problem = rule_problem(spec)
+    if problem:
+        cmds.warning(problem)
         return
-    base = cmds.textField(base_field, q=True, text=True) or ""
-    use_number = cmds.checkBox(use_number_checkbox, q=True, value=True)
-    start_num = safe_int(start_field, 1)
-    padding = safe_int(padding_field, 0)
-    placement = cmds.radioButtonGrp(placement_radio, q=True, select=True)  # 1 or 2
-    prefix = cmds.textField(prefix_field, q=True, text=True) or ""
-    suffix = cmds.textField(suffix_field, q=True, text=True) or ""
-    sep = cmds.textField(separator_field, q=True, text=True) or ""
-    try:
-        cmds.undoInfo(openChunk=True)
-        idx = start_num
-        for obj in sel:
-            numstr = build_number_string(idx, padding) if use_number else ""
-            if base == "":
-                base_for_obj = obj
-            else:
-                base_for_obj = base
-            if use_number:
-                if placement == 1:
-                    # number before suffix: base + sep + number then suffix
-                    name_core = base_for_obj + (sep + numstr if sep else numstr)
-                    newname = prefix + name_core + suffix
-                else:
-                    # number after suffix: base + suffix + sep + number
-                    name_core = base_for_obj + suffix
-                    newname = prefix + name_core + (sep + numstr if sep else numstr)
-            else:
-                newname = prefix + base_for_obj + suffix
-            try:
-                cmds.rename(obj, newname)
-            except Exception:
-                cmds.warning("Couldn't rename '%s' to '%s' exactly; Maya adjusted name." % (obj, newname))
-            idx += 1
-    finally:
-        cmds.undoInfo(closeChunk=True)
+    run_rules([spec], label)
+
+def apply_previewed(nodes, new_names, index, title, label):
+    # the panel's nodes, names and name index: exactly the rows the user is looking at
+    if confirm_diff(rne.dry_run(nodes, new_names, index), title):
+        apply_renames(nodes, new_names, label, index)
+
+def preview_rule(reader, title, label, *widgets):
+    # the panel re-reads the widgets on every (debounced) edit
+    def rules():
+        spec = reader(*widgets)
+        return [] if rule_problem(spec) else [spec]
+    rp.show_preview(rules, title,
+                    lambda nodes, new_names, index: apply_previewed(nodes, new_names, index, title, label))
+
+# ------------------ Core operations ------------------
+
+def add_prefix_suffix(prefix_field, suffix_field):
+    run_rule(prefix_suffix_rule, "addPrefixSuffix", prefix_field, suffix_field)
+
+def rename_with_numbering(base_field, use_number_checkbox, start_field, padding_field, placement_radio, prefix_field, suffix_field, separator_field):
+    run_rule(numbering_rule, "renameWithNumbering", base_field, use_number_checkbox, start_field, padding_field,
+             placement_radio, prefix_field, suffix_field, separator_field)
 
 def remove_substring_from_selection(remove_field):
-    sel = get_selection()
-    if not sel:
-        cmds.warning("No selection.")
-        return
-    rem = cmds.textField(remove_field, q=True, text=True) or ""
-    if rem == "":
-        cmds.warning("No substring entered to remove.")
-        return
-    try:
-        cmds.undoInfo(openChunk=True)
-        for obj in sel:
-            newname = obj.replace(rem, "")
-            try:
-                cmds.rename(obj, newname)
-            except Exception:
-                cmds.warning("Couldn't rename '%s' to '%s' exactly; Maya adjusted name." % (obj, newname))
-    finally:
-        cmds.undoInfo(closeChunk=True)
+    run_rule(remove_substring_rule, "removeSubstring", remove_field)
 
 def remove_chars_from_selection(num_start_field, num_end_field):
-    sel = get_selection()
-    if not sel:
-        cmds.warning("No selection.")
-        return
-    num_start = safe_int(num_start_field, 0)
-    num_end = safe_int(num_end_field, 0)
-    if num_start <= 0 and num_end <= 0:
-        cmds.warning("Numbers to remove are both zero; nothing to remove.")
-        return
-    try:
-        cmds.undoInfo(openChunk=True)
-        for obj in sel:
-            s = obj
-            if num_start > 0:
-                if num_start >= len(s):
-                    s = ""
-                else:
-                    s = s[num_start:]
-            if num_end > 0:
-                if num_end >= len(s):
-                    s = ""
-                else:
-                    s = s[:-num_end]
-            try:
-                cmds.rename(obj, s)
-            except Exception:
-                cmds.warning("Couldn't rename '%s' to '%s' exactly; Maya adjusted name." % (obj, s))
-    finally:
-        cmds.undoInfo(closeChunk=True)
+    run_rule(remove_chars_rule, "removeChars", num_start_field, num_end_field)
 
 def remove_numbers_at_ends(remove_start_checkbox, remove_end_checkbox):
-    sel = get_selection()
-    if not sel:
-        cmds.warning("No selection.")
-        return
-    remove_start = cmds.checkBox(remove_start_checkbox, q=True, value=True)
-    remove_end = cmds.checkBox(remove_end_checkbox, q=True, value=True)
-    if not remove_start and not remove_end:
-        cmds.warning("Pick at least one: remove leading or trailing numbers.")
-        return
-    try:
-        cmds.undoInfo(openChunk=True)
-        for obj in sel:
-            s = obj
-            if remove_start:
-                s = re.sub(r'^\d+', '', s)
-            if remove_end:
-                s = re.sub(r'\d+$', '', s)
-            try:
-                cmds.rename(obj, s)
-            except Exception:
-                cmds.warning("Couldn't rename '%s' to '%s' exactly; Maya adjusted name." % (obj, s))
-    finally:
-        cmds.undoInfo(closeChunk=True)
-
-# ------------------ Search & Replace (new section) ------------------
+    run_rule(remove_numbers_rule, "removeNumbers", remove_start_checkbox, remove_end_checkbox)
 
 def search_replace_selection(search_field, replace_field, regex_checkbox, case_checkbox, whole_name_checkbox):
+    spec = search_replace_rule(search_field, replace_field, regex_checkbox, case_checkbox, whole_name_checkbox)
+    problem = rule_problem(spec)
+    if problem:
+        cmds.warning(problem)
+        return
     sel = get_selection()
     if not sel:
         cmds.warning("No selection.")
         return
-    pattern = cmds.textField(search_field, q=True, text=True) or ""
-    repl = cmds.textField(replace_field, q=True, text=True) or ""
-    use_regex = cmds.checkBox(regex_checkbox, q=True, value=True)
-    case_sensitive = cmds.checkBox(case_checkbox, q=True, value=True)
-    whole_name = cmds.checkBox(whole_name_checkbox, q=True, value=True)
-
-    if pattern == "":
-        cmds.warning("Enter a search pattern.")
+    # pattern and replacement are validated up front; nothing is renamed if either is bad
+    pipe = compile_pipeline([spec])
+    if pipe is None:
         return
+    # dry run over the whole selection first, against the same name index the rename will use
+    index = rne.default_backend().name_index()
+    if confirm_diff(pipe.dry_run(sel, index=index), "Search & Replace"):
+        apply_renames(sel, pipe.apply([rne.leaf(obj) for obj in sel]), "searchReplace", index)
 
-    flags = 0
-    if not case_sensitive:
-        flags |= re.IGNORECASE
-
-    try:
-        cmds.undoInfo(openChunk=True)
-        for obj in sel:
-            source = obj
-            newname = source
-            if use_regex:
-                pat = pattern
-                if whole_name:
-                    # ensure it matches whole name
-                    if not pat.startswith('^'):
-                        pat = '^' + pat
-                    if not pat.endswith('$'):
-                        pat = pat + '$'
-                try:
-                    newname = re.sub(pat, repl, source, flags=flags)
-                except re.error as e:
-                    cmds.warning("Invalid regex pattern: %s" % e)
-                    cmds.undoInfo(closeChunk=True)
-                    return
-            else:
-                if whole_name:
-                    # replace only if entire name matches (respecting case option)
-                    if (case_sensitive and source == pattern) or (not case_sensitive and source.lower() == pattern.lower()):
-                        newname = repl
-                else:
-                    if case_sensitive:
-                        newname = source.replace(pattern, repl)
-                    else:
-                        # case-insensitive simple replace via regex escape
-                        try:
-                            newname = re.sub(re.escape(pattern), repl, source, flags=re.IGNORECASE)
-                        except re.error as e:
-                            cmds.warning("Replace failed (regex escape issue): %s" % e)
-                            cmds.undoInfo(closeChunk=True)
-                            return
-            if newname != source:
-                try:
-                    cmds.rename(source, newname)
-                except Exception:
-                    cmds.warning("Couldn't rename '%s' to '%s' exactly; Maya adjusted name." % (source, newname))
-        cmds.undoInfo(closeChunk=True)
-    except Exception:
-        try:
-            cmds.undoInfo(closeChunk=False)
-        except Exception:
-            pass
-
-def print_preview_search_replace(search_field, replace_field, regex_checkbox, case_checkbox, whole_name_checkbox):
-    sel = get_selection()
-    if not sel:
-        print("[Preview] No selection.")
-        return
-    pattern = cmds.textField(search_field, q=True, text=True) or ""
-    repl = cmds.textField(replace_field, q=True, text=True) or ""
-    use_regex = cmds.checkBox(regex_checkbox, q=True, value=True)
-    case_sensitive = cmds.checkBox(case_checkbox, q=True, value=True)
-    whole_name = cmds.checkBox(whole_name_checkbox, q=True, value=True)
-
-    print("[Preview] Search & Replace (pattern: '%s' -> '%s', regex=%s, case_sensitive=%s, whole_name=%s)" %
-          (pattern, repl, use_regex, case_sensitive, whole_name))
-    flags = 0
-    if not case_sensitive:
-        flags |= re.IGNORECASE
-
-    for s in sel:
-        newname = s
-        if pattern == "":
-            newname = s
-        else:
-            if use_regex:
-                pat = pattern
-                if whole_name:
-                    if not pat.startswith('^'):
-                        pat = '^' + pat
-                    if not pat.endswith('$'):
-                        pat = pat + '$'
-                try:
-                    newname = re.sub(pat, repl, s, flags=flags)
-                except re.error as e:
-                    print("[Preview] Invalid regex: %s" % e)
-                    return
-            else:
-                if whole_name:
-                    if (case_sensitive and s == pattern) or (not case_sensitive and s.lower() == pattern.lower()):
-                        newname = repl
-                else:
-                    if case_sensitive:
-                        newname = s.replace(pattern, repl)
-                    else:
-                        newname = re.sub(re.escape(pattern), repl, s, flags=re.IGNORECASE)
-        print("  %s  ->  %s" % (s, newname))
-
-# ------------------ Preview helpers (existing) ------------------
+# ------------------ Previews (live panel) ------------------
 
 def print_selection_names():
-    sel = get_selection()
+    sel = get_selection_names()
     if not sel:
         print("[Preview] No selection.")
         return
@@ -284,93 +210,107 @@ def print_selection_names():
         print("  %02d: %s" % (i, s))
 
 def print_preview_add_prefix_suffix(prefix_field, suffix_field):
-    sel = get_selection()
-    if not sel:
-        print("[Preview] No selection.")
-        return
-    prefix = cmds.textField(prefix_field, q=True, text=True) or ""
-    suffix = cmds.textField(suffix_field, q=True, text=True) or ""
-    print("[Preview] Add Prefix/Suffix:")
-    for s in sel:
-        print("  %s  ->  %s" % (s, prefix + s + suffix))
+    preview_rule(prefix_suffix_rule, "Add Prefix/Suffix", "addPrefixSuffix", prefix_field, suffix_field)
 
 def print_preview_rename(base_field, use_number_checkbox, start_field, padding_field, placement_radio, prefix_field, suffix_field, separator_field):
-    sel = get_selection()
-    if not sel:
-        print("[Preview] No selection.")
-        return
-    base = cmds.textField(base_field, q=True, text=True) or ""
-    use_number = cmds.checkBox(use_number_checkbox, q=True, value=True)
-    start_num = safe_int(start_field, 1)
-    padding = safe_int(padding_field, 0)
-    placement = cmds.radioButtonGrp(placement_radio, q=True, select=True)
-    prefix = cmds.textField(prefix_field, q=True, text=True) or ""
-    suffix = cmds.textField(suffix_field, q=True, text=True) or ""
-    sep = cmds.textField(separator_field, q=True, text=True) or ""
-    print("[Preview] Rename with numbering:")
-    idx = start_num
-    for s in sel:
-        if base == "":
-            base_for_obj = s
-        else:
-            base_for_obj = base
-        if use_number:
-            numstr = build_number_string(idx, padding)
-            if placement == 1:
-                name_core = base_for_obj + (sep + numstr if sep else numstr)
-                newname = prefix + name_core + suffix
-            else:
-                name_core = base_for_obj + suffix
-                newname = prefix + name_core + (sep + numstr if sep else numstr)
-        else:
-            newname = prefix + base_for_obj + suffix
-        print("  %s  ->  %s" % (s, newname))
-        idx += 1
+    preview_rule(numbering_rule, "Rename with numbering", "renameWithNumbering", base_field, use_number_checkbox,
+                 start_field, padding_field, placement_radio, prefix_field, suffix_field, separator_field)
 
 def print_preview_remove_substring(remove_field):
-    sel = get_selection()
-    if not sel:
-        print("[Preview] No selection.")
-        return
-    rem = cmds.textField(remove_field, q=True, text=True) or ""
-    if rem == "":
-        print("[Preview] No substring entered.")
-        return
-    print("[Preview] Remove substring '%s':" % rem)
-    for s in sel:
-        print("  %s  ->  %s" % (s, s.replace(rem, "")))
+    preview_rule(remove_substring_rule, "Remove substring", "removeSubstring", remove_field)
 
 def print_preview_remove_chars(num_start_field, num_end_field):
-    sel = get_selection()
-    if not sel:
-        print("[Preview] No selection.")
-        return
-    num_start = safe_int(num_start_field, 0)
-    num_end = safe_int(num_end_field, 0)
-    print("[Preview] Remove %d chars from start, %d chars from end" % (num_start, num_end))
-    for s in sel:
-        new = s
-        if num_start > 0:
-            new = new[num_start:] if num_start < len(new) else ""
-        if num_end > 0:
-            new = new[:-num_end] if num_end < len(new) else ""
-        print("  %s  ->  %s" % (s, new))
+    preview_rule(remove_chars_rule, "Remove chars", "removeChars", num_start_field, num_end_field)
 
 def print_preview_remove_numbers(remove_start_checkbox, remove_end_checkbox):
-    sel = get_selection()
-    if not sel:
-        print("[Preview] No selection.")
+    preview_rule(remove_numbers_rule, "Remove numbers", "removeNumbers", remove_start_checkbox, remove_end_checkbox)
+
+def print_preview_search_replace(search_field, replace_field, regex_checkbox, case_checkbox, whole_name_checkbox):
+    preview_rule(search_replace_rule, "Search & Replace", "searchReplace", search_field, replace_field,
+                 regex_checkbox, case_checkbox, whole_name_checkbox)
+
+# ------------------ Rule pipeline + presets (JSON in an optionVar) ------------------
+
+pipeline_specs = []
+
+def load_presets():
+    try:
+        return json.loads(cmds.optionVar(q=OPT_PRESETS)) if cmds.optionVar(exists=OPT_PRESETS) else {}
+    except ValueError:
+        return {}
+
+def set_pipeline(specs, pipeline_list):
+    pipeline_specs[:] = specs
+    cmds.textScrollList(pipeline_list, edit=True, removeAll=True)
+    for i, (kind, params) in enumerate(pipeline_specs):
+        cmds.textScrollList(pipeline_list, edit=True, append="%d. %s" % (i + 1, rne.describe_rule(kind, params)))
+
+def add_to_pipeline(pipeline_list, reader, *widgets):
+    spec = reader(*widgets)
+    problem = rule_problem(spec)
+    if problem:
+        cmds.warning(problem)
+        return
+    if compile_pipeline([spec]) is not None:
+        set_pipeline(pipeline_specs + [spec], pipeline_list)
+        rp.schedule_refresh()
+
+def remove_from_pipeline(pipeline_list):
+    picked = cmds.textScrollList(pipeline_list, q=True, selectIndexedItem=True) or []
+    set_pipeline([spec for i, spec in enumerate(pipeline_specs, start=1) if i not in picked], pipeline_list)
+    rp.schedule_refresh()
+
+def run_pipeline():
+    if not pipeline_specs:
+        cmds.warning("Rule pipeline is empty.")
+        return
+    run_rules(list(pipeline_specs), "renamePipeline")
+
+def preview_pipeline():
+    rp.show_preview(lambda: list(pipeline_specs), "Rule pipeline",
+                    lambda nodes, new_names, index: apply_previewed(nodes, new_names, index,
+                                                                    "Rule pipeline", "renamePipeline"))
+
+def refresh_preset_menu(preset_menu):
+    for item in cmds.optionMenu(preset_menu, q=True, itemListLong=True) or []:
+        cmds.deleteUI(item)
+    for name in sorted(load_presets()):
+        cmds.menuItem(label=name, parent=preset_menu)
+
+def save_preset(preset_name_field, preset_menu):
+    name = (cmds.textField(preset_name_field, q=True, text=True) or "").strip()
+    if not name:
+        cmds.warning("Enter a preset name.")
         return
-    remove_start = cmds.checkBox(remove_start_checkbox, q=True, value=True)
-    remove_end = cmds.checkBox(remove_end_checkbox, q=True, value=True)
-    print("[Preview] Remove leading numbers: %s, trailing numbers: %s" % (remove_start, remove_end))
-    for s in sel:
-        new = s
-        if remove_start:
-            new = re.sub(r'^\d+', '', new)
-        if remove_end:
-            new = re.sub(r'\d+$', '', new)
-        print("  %s  ->  %s" % (s, new))
+    if not pipeline_specs:
+        cmds.warning("Rule pipeline is empty.")
+        return
+    presets = load_presets()
+    presets[name] = rne.rules_to_json(pipeline_specs)
+    cmds.optionVar(stringValue=(OPT_PRESETS, json.dumps(presets)))
+    refresh_preset_menu(preset_menu)
+    cmds.optionMenu(preset_menu, edit=True, value=name)
+
+def load_preset(preset_menu, pipeline_list):
+    name = cmds.optionMenu(preset_menu, q=True, value=True)
+    presets = load_presets()
+    if not name or name not in presets:
+        cmds.warning("No preset selected.")
+        return
+    try:
+        specs = rne.rules_from_json(presets[name])
+    except ValueError as e:
+        cmds.warning("Preset '%s' is invalid: %s" % (name, e))
+        return
+    set_pipeline(specs, pipeline_list)
+
+def delete_preset(preset_menu):
+    name = cmds.optionMenu(preset_menu, q=True, value=True)
+    presets = load_presets()
+    if name in presets:
+        del presets[name]
+        cmds.optionVar(stringValue=(OPT_PRESETS, json.dumps(presets)))
+        refresh_preset_menu(preset_menu)
 
 # ------------------ UI ------------------
 
@@ -385,9 +325,10 @@ def create_ui():
     c1 = cmds.columnLayout(adjustableColumn=True)
     prefix_field = cmds.textField(placeholderText="Enter prefix...", annotation="Prefix text to add to beginning")
     suffix_field = cmds.textField(placeholderText="Enter suffix...", annotation="Suffix text to add to end")
-    cmds.rowLayout(numberOfColumns=3, columnWidth3=(160,160,160), adjustableColumn=2)
+    cmds.rowLayout(numberOfColumns=4, columnWidth4=(130,120,120,120), adjustableColumn=2)
     cmds.button(label="Add Prefix+Suffix", c=lambda *_: add_prefix_suffix(prefix_field, suffix_field), annotation="Add prefix and/or suffix to each selected object")
-    cmds.button(label="Preview (print)", c=lambda *_: print_preview_add_prefix_suffix(prefix_field, suffix_field))
+    cmds.button(label="Preview", c=lambda *_: print_preview_add_prefix_suffix(prefix_field, suffix_field))
+    cmds.button(label="+ Pipeline", c=lambda *_: add_to_pipeline(pipeline_list, prefix_suffix_rule, prefix_field, suffix_field))
     cmds.button(label="Select (reselect)", c=lambda *_: cmds.select(get_selection(), r=True))
     cmds.setParent('..')
     cmds.setParent('..')
@@ -412,9 +353,10 @@ def create_ui():
     prefix_field2 = cmds.textField(placeholderText="Prefix (optional)", annotation="Prefix used for this rename operation")
     suffix_field2 = cmds.textField(placeholderText="Suffix (optional)", annotation="Suffix used for this rename operation")
     cmds.setParent('..')
-    cmds.rowLayout(numberOfColumns=2, columnWidth2=(260,260))
+    cmds.rowLayout(numberOfColumns=3, columnWidth3=(175,175,170))
     cmds.button(label="Rename Selection", c=lambda *_: rename_with_numbering(base_field, use_number_checkbox, start_field, padding_field, placement_radio, prefix_field2, suffix_field2, separator_field), annotation="Rename selection according to fields. Numbering uses selection order.")
-    cmds.button(label="Preview (print)", c=lambda *_: print_preview_rename(base_field, use_number_checkbox, start_field, padding_field, placement_radio, prefix_field2, suffix_field2, separator_field))
+    cmds.button(label="Preview", c=lambda *_: print_preview_rename(base_field, use_number_checkbox, start_field, padding_field, placement_radio, prefix_field2, suffix_field2, separator_field))
+    cmds.button(label="+ Pipeline", c=lambda *_: add_to_pipeline(pipeline_list, numbering_rule, base_field, use_number_checkbox, start_field, padding_field, placement_radio, prefix_field2, suffix_field2, separator_field))
     cmds.setParent('..')
     cmds.setParent('..')
 
@@ -423,9 +365,10 @@ def create_ui():
     c3 = cmds.columnLayout(adjustableColumn=True)
     cmds.text(label="Remove substring (all occurrences):")
     remove_field = cmds.textField(placeholderText="Substring to remove")
-    cmds.rowLayout(numberOfColumns=2, columnWidth2=(260,260))
+    cmds.rowLayout(numberOfColumns=3, columnWidth3=(175,175,170))
     cmds.button(label="Remove substring", c=lambda *_: remove_substring_from_selection(remove_field))
-    cmds.button(label="Preview (print)", c=lambda *_: print_preview_remove_substring(remove_field))
+    cmds.button(label="Preview", c=lambda *_: print_preview_remove_substring(remove_field))
+    cmds.button(label="+ Pipeline", c=lambda *_: add_to_pipeline(pipeline_list, remove_substring_rule, remove_field))
     cmds.setParent('..')
 
     cmds.separator(height=8)
@@ -434,18 +377,20 @@ def create_ui():
     cmds.text(label="N chars to remove from start")
     num_end_field = cmds.intField(value=0)
     cmds.text(label="N chars to remove from end")
-    cmds.rowLayout(numberOfColumns=2, columnWidth2=(260,260))
+    cmds.rowLayout(numberOfColumns=3, columnWidth3=(175,175,170))
     cmds.button(label="Remove N chars", c=lambda *_: remove_chars_from_selection(num_start_field, num_end_field))
-    cmds.button(label="Preview (print)", c=lambda *_: print_preview_remove_chars(num_start_field, num_end_field))
+    cmds.button(label="Preview", c=lambda *_: print_preview_remove_chars(num_start_field, num_end_field))
+    cmds.button(label="+ Pipeline", c=lambda *_: add_to_pipeline(pipeline_list, remove_chars_rule, num_start_field, num_end_field))
     cmds.setParent('..')
 
     cmds.separator(height=8)
     cmds.text(label="Remove numbers at start / end:")
     remove_start_checkbox = cmds.checkBox(label="Remove leading numbers", value=True)
     remove_end_checkbox = cmds.checkBox(label="Remove trailing numbers", value=True)
-    cmds.rowLayout(numberOfColumns=2, columnWidth2=(260,260))
+    cmds.rowLayout(numberOfColumns=3, columnWidth3=(175,175,170))
     cmds.button(label="Remove numbers", c=lambda *_: remove_numbers_at_ends(remove_start_checkbox, remove_end_checkbox))
-    cmds.button(label="Preview (print)", c=lambda *_: print_preview_remove_numbers(remove_start_checkbox, remove_end_checkbox))
+    cmds.button(label="Preview", c=lambda *_: print_preview_remove_numbers(remove_start_checkbox, remove_end_checkbox))
+    cmds.button(label="+ Pipeline", c=lambda *_: add_to_pipeline(pipeline_list, remove_numbers_rule, remove_start_checkbox, remove_end_checkbox))
     cmds.setParent('..')
     cmds.setParent('..')
 
@@ -459,18 +404,55 @@ def create_ui():
     regex_checkbox = cmds.checkBox(label="Use Regular Expression", value=False)
     case_checkbox = cmds.checkBox(label="Case Sensitive", value=True)
     whole_name_checkbox = cmds.checkBox(label="Match whole name only", value=False)
-    cmds.rowLayout(numberOfColumns=2, columnWidth2=(260,260))
+    cmds.rowLayout(numberOfColumns=3, columnWidth3=(175,175,170))
     cmds.button(label="Apply Search & Replace", c=lambda *_: search_replace_selection(search_field, replace_field, regex_checkbox, case_checkbox, whole_name_checkbox))
-    cmds.button(label="Preview (print)", c=lambda *_: print_preview_search_replace(search_field, replace_field, regex_checkbox, case_checkbox, whole_name_checkbox))
+    cmds.button(label="Preview", c=lambda *_: print_preview_search_replace(search_field, replace_field, regex_checkbox, case_checkbox, whole_name_checkbox))
+    cmds.button(label="+ Pipeline", c=lambda *_: add_to_pipeline(pipeline_list, search_replace_rule, search_field, replace_field, regex_checkbox, case_checkbox, whole_name_checkbox))
     cmds.setParent('..')
 
+    # Rule pipeline frame: queued rules run in memory, then one rename per node
+    f5 = cmds.frameLayout(label="Rule Pipeline", collapsable=True, marginHeight=8, parent=main_col)
+    c5 = cmds.columnLayout(adjustableColumn=True)
+    pipeline_list = cmds.textScrollList(numberOfRows=6, allowMultiSelection=True)
+    cmds.rowLayout(numberOfColumns=4, columnWidth4=(130,130,130,130))
+    cmds.button(label="Run Pipeline", c=lambda *_: run_pipeline(), annotation="Apply every queued rule, renaming each node once")
+    cmds.button(label="Preview", c=lambda *_: preview_pipeline())
+    cmds.button(label="Remove selected", c=lambda *_: remove_from_pipeline(pipeline_list))
+    cmds.button(label="Clear", c=lambda *_: set_pipeline([], pipeline_list))
+    cmds.setParent('..')
+    cmds.rowLayout(numberOfColumns=5, columnWidth5=(150,130,80,80,80), adjustableColumn=1)
+    preset_name_field = cmds.textField(placeholderText="Preset name")
+    preset_menu = cmds.optionMenu()
+    cmds.button(label="Save", c=lambda *_: save_preset(preset_name_field, preset_menu))
+    cmds.button(label="Load", c=lambda *_: load_preset(preset_menu, pipeline_list))
+    cmds.button(label="Delete", c=lambda *_: delete_preset(preset_menu))
+    cmds.setParent('..')
+    refresh_preset_menu(preset_menu)
+    set_pipeline(pipeline_specs, pipeline_list)
+    cmds.setParent(main_col)
+
     # Bottom controls
     cmds.separator(height=8)
+    cmds.checkBox(label="Batch renames through OpenMaya (one modifier, one undo step)",
+                  value=use_api_backend(),
+                  changeCommand=lambda value: cmds.optionVar(intValue=(OPT_USE_API, int(value))))
     cmds.rowLayout(numberOfColumns=2, columnWidth2=(260,260))
     cmds.button(label="Print current selection names", c=lambda *_: print_selection_names())
     cmds.button(label="Close Window", c=lambda *_: cmds.deleteUI(WINDOW_NAME))
     cmds.setParent('..')
 
+    # live preview: every edit just restarts the preview panel's debounce timer
+    live = lambda *_: rp.schedule_refresh()
+    for field in (prefix_field, suffix_field, base_field, separator_field, prefix_field2, suffix_field2,
+                  remove_field, search_field, replace_field):
+        cmds.textField(field, edit=True, textChangedCommand=live)
+    for field in (start_field, padding_field, num_start_field, num_end_field):
+        cmds.intField(field, edit=True, changeCommand=live)
+    for box in (use_number_checkbox, remove_start_checkbox, remove_end_checkbox, regex_checkbox, case_checkbox,
+                whole_name_checkbox):
+        cmds.checkBox(box, edit=True, changeCommand=live)
+    cmds.radioButtonGrp(placement_radio, edit=True, changeCommand=live)
+
     cmds.showWindow(win)
 
 # Create UI on import/run
@@ -6,6 +6,15 @@ import maya.OpenMayaUI as omui
 import maya.cmds as cmds
 from functools import partial
 
+import sys
+path = "D:/GitHubStuff/University/MayaScripts/PythonScripts"
+
+if path not in sys.path:
+    sys.path.append(path)
+
+import SceneSnapshot as snap
+
+OPT_USE_SNAPSHOT = "rcs_use_snapshot"
 
 def get_maya_main_window():
     ptr = omui.MQtUtil.mainWindow()
@@ -21,6 +30,7 @@ class RigControlSelector(QtWidgets.QDialog):
         self.req_prefix = self.req_infix = self.req_suffix = None
         self.exc_prefix = self.exc_infix = self.exc_suffix = None
         self.rig_field = None
+        self.snapshot_cb = None
         self.build_ui()
 
     def build_ui(self):
@@ -36,6 +46,10 @@ class RigControlSelector(QtWidgets.QDialog):
         btn.clicked.connect(self.grab_selected)
         rig_l.addWidget(btn)
         self.layout().addWidget(rig_group)
+        # Shared scene snapshot (opt-in): cached hierarchy survives between rig UIs
+        self.snapshot_cb = QtWidgets.QCheckBox("Use scene snapshot cache (faster reopening)")
+        self.snapshot_cb.setChecked(bool(cmds.optionVar(exists=OPT_USE_SNAPSHOT) and cmds.optionVar(q=OPT_USE_SNAPSHOT)))
+        self.layout().addWidget(self.snapshot_cb)
         # Generate button
         gen_btn = QtWidgets.QPushButton("Create Control UIs")
         gen_btn.clicked.connect(self.generate_uis)
@@ -74,9 +88,11 @@ class RigControlSelector(QtWidgets.QDialog):
             'infixes': [x.strip() for x in self.exc_infix.text().split(',') if x.strip()],
             'suffixes': [x.strip() for x in self.exc_suffix.text().split(',') if x.strip()]
         }
+        use_snapshot = self.snapshot_cb.isChecked()
+        cmds.optionVar(iv=(OPT_USE_SNAPSHOT, int(use_snapshot)))
         for root in roots:
             if cmds.objExists(root):
-                RigUI(root, reqs, excs)
+                RigUI(root, reqs, excs, use_snapshot)
 
 
 def matches(name, reqs, excs):
@@ -111,7 +127,7 @@ def matches(name, reqs, excs):
     return True
 
 class RigUI(QtWidgets.QDialog):
-    def __init__(self, root, reqs, excs, parent=get_maya_main_window()):
+    def __init__(self, root, reqs, excs, use_snapshot=False, parent=get_maya_main_window()):
         super(RigUI, self).__init__(parent)
         # allow minimize + maximize
         self.setWindowFlags(self.windowFlags() | QtCore.Qt.WindowMinimizeButtonHint | QtCore.Qt.WindowMaximizeButtonHint)
@@ -122,6 +138,7 @@ class RigUI(QtWidgets.QDialog):
         self.root = root
         self.reqs = reqs
         self.excs = excs
+        self.use_snapshot = use_snapshot
         self.checks = []
         self.row_widgets = []
         self.selection_sets = {}
@@ -182,7 +199,11 @@ class RigUI(QtWidgets.QDialog):
         self.scroll.setWidgetResizable(True)
         l.addWidget(self.scroll)
 
-        all_children = cmds.listRelatives(self.root, allDescendents=True, fullPath=True) or []
+        if self.use_snapshot:
+            # shared snapshot: reopening a rig UI reuses the cached hierarchy instead of re-listing it
+            all_children = snap.get_snapshot().descendants(snap.long_names([self.root]))
+        else:
+            all_children = cmds.listRelatives(self.root, allDescendents=True, fullPath=True) or []
         self.all_controls = sorted([c for c in all_children if matches(c.split('|')[-1], self.reqs, self.excs)])
         self.build_control_list(self.all_controls)
         return w
@@ -0,0 +1,318 @@
+# Shared DAG snapshot for the PythonScripts tools: bulk capture once, O(1) lookups, incremental refresh
+#
+#   import SceneSnapshot as snap
+#   s = snap.get_snapshot()          # installs scene callbacks on first use
+#   s.type_of("|rig|spine_01")       # lookups keyed by long name ...
+#   s.path_of(uuid)                  # ... or by UUID
+#   snap.release_snapshot()          # drop cache + callbacks
+
+from contextlib import contextmanager
+
+try:
+    import maya.cmds as cmds
+    import maya.api.OpenMaya as om
+except ImportError:
+    cmds = None
+    om = None
+
+# When more than this fraction of the cached nodes is dirty, a full capture is cheaper
+FULL_REBUILD_RATIO = 0.25
+
+
+def _parent_path(node):
+    if not node or "|" not in node:
+        return None
+    head = node.rsplit("|", 1)[0]
+    return head or None
+
+
+def _uuid_of(mobject):
+    try:
+        return om.MFnDependencyNode(mobject).uuid().asString()
+    except Exception:
+        return None
+
+
+class SceneSnapshot(object):
+    """
+    In-memory copy of the scene's DAG: type, UUID, parent, children and shapes
+    for every DAG node, captured with a handful of bulk ls calls.
+
+    Scene callbacks only record which UUIDs changed; the affected subtrees are
+    re-queried lazily on the next lookup, so edits never trigger a full rebuild.
+    """
+    def __init__(self):
+        self.types = {}
+        self.uuid_by_path = {}
+        self.paths_by_uuid = {}
+        self.children = {}
+        self.shape_paths = set()
+        self.captured = False
+        self._dirty = set()
+        self._callback_ids = []
+
+    # -----------------------
+    # Capture / refresh
+    # -----------------------
+    def clear(self):
+        self.types.clear()
+        self.uuid_by_path.clear()
+        self.paths_by_uuid.clear()
+        self.children.clear()
+        self.shape_paths.clear()
+        self._dirty.clear()
+        self.captured = False
+
+    def capture(self):
+        """Full rebuild of the snapshot from the open scene."""
+        self.clear()
+        self._capture_under(None)
+        self.captured = True
+
+    def _capture_under(self, roots):
+        # roots=None captures the whole DAG; otherwise the given long names and everything below
+        kwargs = dict(dag=True, long=True)
+        args = [roots] if roots is not None else []
+        flat = cmds.ls(*args, showType=True, **kwargs) or []
+        uuids = cmds.ls(*args, uuid=True, **kwargs) or []
+        shapes = cmds.ls(*args, shapes=True, **kwargs) or []
+        paths = flat[0::2]
+        if len(uuids) != len(paths):
+            # the two listings disagree (scene changed mid-query); resolve per path in one call
+            uuids = [(cmds.ls(p, uuid=True) or [None])[0] for p in paths]
+        for path, node_type, uuid in zip(paths, flat[1::2], uuids):
+            self._add(path, node_type, uuid)
+        self.shape_paths.update(shapes)
+
+    def _add(self, path, node_type, uuid):
+        if path in self.types:
+            return
+        self.types[path] = node_type
+        if uuid:
+            self.uuid_by_path[path] = uuid
+            self.paths_by_uuid.setdefault(uuid, []).append(path)
+        parent = _parent_path(path)
+        if parent is not None:
+            self.children.setdefault(parent, []).append(path)
+
+    def _drop_subtree(self, path):
+        if path not in self.types:
+            return
+        parent = _parent_path(path)
+        if parent in self.children:
+            try:
+                self.children[parent].remove(path)
+            except ValueError:
+                pass
+        stack = [path]
+        while stack:
+            node = stack.pop()
+            stack.extend(self.children.pop(node, ()))
+            self.types.pop(node, None)
+            self.shape_paths.discard(node)
+            uuid = self.uuid_by_path.pop(node, None)
+            if uuid in self.paths_by_uuid:
+                paths = [p for p in self.paths_by_uuid[uuid] if p != node]
+                if paths:
+                    self.paths_by_uuid[uuid] = paths
+                else:
+                    del self.paths_by_uuid[uuid]
+
+    def refresh(self):
+        """Bring the snapshot up to date: first call captures, later calls patch dirty subtrees."""
+        if not self.captured:
+            self.capture()
+            return
+        if not self._dirty:
+            return
+        dirty, self._dirty = self._dirty, set()
+        if len(dirty) > FULL_REBUILD_RATIO * max(1, len(self.types)):
+            self.capture()
+            return
+        # drop every stale subtree before recapturing so nested changes are not lost
+        for uuid in dirty:
+            for path in list(self.paths_by_uuid.get(uuid, ())):
+                self._drop_subtree(path)
+        current = cmds.ls(list(dirty), long=True) or []
+        roots = [p for p in current if "|" in p]
+        for path in roots:
+            self._drop_subtree(path)
+        if roots:
+            self._capture_under(roots)
+
+    def mark_dirty(self, uuid):
+        if uuid:
+            self._dirty.add(uuid)
+
+    def invalidate(self):
+        """Forget everything; the next lookup does a full capture."""
+        self.clear()
+
+    # -----------------------
+    # Scene callbacks
+    # -----------------------
+    def install_callbacks(self):
+        if self._callback_ids or om is None:
+            return
+        ids = self._callback_ids
+        ids.append(om.MDGMessage.addNodeAddedCallback(self._on_node_changed, "dagNode"))
+        ids.append(om.MDGMessage.addNodeRemovedCallback(self._on_node_changed, "dagNode"))
+        ids.append(om.MDagMessage.addAllDagChangesCallback(self._on_dag_changed))
+        ids.append(om.MNodeMessage.addNameChangedCallback(om.MObject(), self._on_name_changed))
+        for msg in (om.MSceneMessage.kAfterNew, om.MSceneMessage.kAfterOpen,
+                    om.MSceneMessage.kAfterImport, om.MSceneMessage.kAfterCreateReference,
+                    om.MSceneMessage.kAfterRemoveReference):
+            ids.append(om.MSceneMessage.addCallback(msg, self._on_scene_reset))
+
+    def remove_callbacks(self):
+        if self._callback_ids:
+            om.MMessage.removeCallbacks(self._callback_ids)
+        self._callback_ids = []
+
+    # callbacks must not run commands; they only record what changed
+    def _on_node_changed(self, node, *_):
+        self.mark_dirty(_uuid_of(node))
+
+    def _on_dag_changed(self, msg_type, child, parent, *_):
+        try:
+            self.mark_dirty(_uuid_of(child.node()))
+        except Exception:
+            self.invalidate()
+
+    def _on_name_changed(self, node, prev_name, *_):
+        if node.hasFn(om.MFn.kDagNode):
+            self.mark_dirty(_uuid_of(node))
+
+    def _on_scene_reset(self, *_):
+        self.invalidate()
+
+    # -----------------------
+    # Lookups (long names / UUIDs)
+    # -----------------------
+    def type_of(self, path):
+        self.refresh()
+        return self.types.get(path, "")
+
+    def uuid_of(self, path):
+        self.refresh()
+        return self.uuid_by_path.get(path)
+
+    def path_of(self, uuid):
+        self.refresh()
+        paths = self.paths_by_uuid.get(uuid)
+        return paths[0] if paths else None
+
+    def exists(self, path):
+        self.refresh()
+        return path in self.types
+
+    def parent_of(self, path):
+        self.refresh()
+        parent = _parent_path(path)
+        return parent if parent in self.types else None
+
+    def children_of(self, path):
+        self.refresh()
+        return list(self.children.get(path, ()))
+
+    def shapes_of(self, path):
+        self.refresh()
+        return [c for c in self.children.get(path, ()) if c in self.shape_paths]
+
+    def descendants_of(self, path):
+        self.refresh()
+        out = []
+        stack = [path]
+        while stack:
+            kids = self.children.get(stack.pop(), ())
+            out.extend(kids)
+            stack.extend(kids)
+        return out
+
+    # -----------------------
+    # Scene backend interface (see SelectionFilterEngine)
+    # -----------------------
+    def node_types(self, nodes):
+        self.refresh()
+        types = self.types
+        out = dict((n, types[n]) for n in nodes if n in types)
+        missing = [n for n in nodes if n not in types]
+        if missing:
+            # non-DAG nodes are not cached; answer them with one bulk query
+            flat = cmds.ls(missing, long=True, showType=True) or []
+            out.update(zip(flat[0::2], flat[1::2]))
+        return out
+
+    def shapes(self, nodes):
+        out = []
+        for node in nodes:
+            out.extend(self.shapes_of(node))
+        return out
+
+    def descendants(self, nodes):
+        out = []
+        for node in nodes:
+            out.extend(self.descendants_of(node))
+        return out
+
+    def iter_dag(self, roots=None):
+        self.refresh()
+        if roots is None:
+            for node in list(self.types):
+                yield node
+            return
+        for root in roots:
+            if root in self.types:
+                yield root
+                for node in self.descendants_of(root):
+                    yield node
+
+    def uuids(self, nodes):
+        self.refresh()
+        return dict((n, self.uuid_by_path[n]) for n in nodes if n in self.uuid_by_path)
+
+    def paths(self, uuids):
+        self.refresh()
+        out = {}
+        for uuid in uuids:
+            paths = self.paths_by_uuid.get(uuid)
+            if paths:
+                out[uuid] = paths[0]
+        return out
+
+    def parent(self, children, parent):
+        return cmds.parent(children, parent) or []
+
+    @contextmanager
+    def undo_chunk(self, name):
+        cmds.undoInfo(openChunk=True, chunkName=name)
+        try:
+            yield
+        finally:
+            cmds.undoInfo(closeChunk=True)
+
+
+_SNAPSHOT = None
+
+def get_snapshot():
+    """Shared snapshot used by every tool that opts in; callbacks are installed once."""
+    global _SNAPSHOT
+    if _SNAPSHOT is None:
+        _SNAPSHOT = SceneSnapshot()
+        _SNAPSHOT.install_callbacks()
+    return _SNAPSHOT
+
+def release_snapshot():
+    global _SNAPSHOT
+    if _SNAPSHOT is not None:
+        _SNAPSHOT.remove_callbacks()
+        _SNAPSHOT.clear()
+    _SNAPSHOT = None
+
+def long_names(nodes):
+    """Long names for a mixed list of short/long names, resolved in one call."""
+    if not nodes:
+        return []
+    if all(n.startswith("|") for n in nodes):
+        return list(nodes)
+    return cmds.ls(nodes, long=True) or []
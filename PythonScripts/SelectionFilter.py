@@ -2,8 +2,19 @@
 # Filter Selection Tool v6.4_fix2 — layout flag error fixed (removed invalid columnWidth7)
 
 
+import sys
+path = "D:/GitHubStuff/University/MayaScripts/PythonScripts"
+
+if path not in sys.path:
+    sys.path.append(path)
+
 import re
+import json
 import maya.cmds as cmds
+import SelectionFilterEngine as sfe
+import SceneSnapshot as snap
+#import importlib
+#importlib.reload(sfe)
 
 def filter_selection_ui_v6_4_fix2():
     win = "filterSelectionUI_v6_4_fix2"
@@ -21,6 +32,9 @@ def filter_selection_ui_v6_4_fix2():
     OPT_ORDER = "fs_v6_order"
     OPT_NUMERIC_SORT = "fs_v6_numeric_sort"
     OPT_AUTO_SCAN = "fs_v6_auto_scan_chains"
+    OPT_USE_SNAPSHOT = "fs_v6_use_snapshot"
+    OPT_PIPELINE_PRESETS = "fs_v6_pipeline_presets"
+    OPT_SCOPE = "fs_v6_scope"
 
     def opt_get(key, default):
         try:
@@ -44,27 +58,34 @@ def filter_selection_ui_v6_4_fix2():
     # -----------------------
     # Utilities
     # -----------------------
-    def short_name(node):
-        return node.split("|")[-1] if node else node
-
-    def safe_node_type(node):
-        try:
-            return cmds.nodeType(node)
-        except Exception:
-            return ""
-
-    def ordered_unique(seq):
-        seen = set()
-        out = []
-        for x in seq:
-            if x not in seen:
-                out.append(x)
-                seen.add(x)
-        return out
+    short_name = sfe.short_name
 
     def collect_selected():
         return cmds.ls(sl=True, long=True) or []
 
+    # Shared scene snapshot (opt-in): cached DAG data survives between button clicks
+    def scene_backend():
+        use = bool(cmds.checkBox(snapshot_cb, q=True, value=True))
+        opt_set(OPT_USE_SNAPSHOT, int(use))
+        return snap.get_snapshot() if use else None
+
+    # -----------------------
+    # Scope: where the filters read nodes from
+    # -----------------------
+    SCOPE_KEYS = {"Selection": "selection", "Whole scene (DAG)": "scene", "Under selected roots": "roots"}
+    cmds.frameLayout(label="Scope", collapsable=False, marginWidth=6)
+    cmds.columnLayout(adjustableColumn=True, rowSpacing=4)
+    scope_menu = cmds.optionMenu(label="Filter input:")
+    for scope_label in SCOPE_KEYS:
+        cmds.menuItem(label=scope_label)
+    saved_scope = opt_get(OPT_SCOPE, "selection")
+    for scope_label, scope_key in SCOPE_KEYS.items():
+        if scope_key == saved_scope:
+            cmds.optionMenu(scope_menu, edit=True, value=scope_label)
+    snapshot_cb = cmds.checkBox(label="Use scene snapshot cache (faster repeat clicks)",
+                                value=bool(int(opt_get(OPT_USE_SNAPSHOT, 0))))
+    cmds.setParent(".."); cmds.setParent("..")
+
     # -----------------------
     # Type / Name / Nth sections (kept similar to v6.3)
     # -----------------------
@@ -85,23 +106,26 @@ def filter_selection_ui_v6_4_fix2():
     for label in filter_options:
         type_checkboxes[label] = cmds.checkBox(label=label, value=False)
     cmds.button(label="Apply Type Filter (section)", height=34, bgc=(0.28, 0.52, 0.28),
-                command=lambda *_: apply_type_filter(type_mode_radio, filter_options, type_checkboxes))
+                command=lambda *_: apply_section("type", "Type filter"))
     cmds.setParent(".."); cmds.setParent("..")
 
     # Name filter
     cmds.frameLayout(label="Name Filter", collapsable=False, marginWidth=6)
     cmds.columnLayout(adjustableColumn=True, rowSpacing=4)
     name_mode_radio = cmds.radioButtonGrp(numberOfRadioButtons=2, labelArray2=["Keep","Drop"], select=1)
-    cmds.rowLayout(numberOfColumns=2, adjustableColumn=2)
-    cmds.text(label="Name contains:")
-    name_field = cmds.textField()
+    cmds.rowLayout(numberOfColumns=3, adjustableColumn=2)
+    cmds.text(label="Name pattern:")
+    name_field = cmds.textField(annotation="contains / glob: comma-separated terms (e.g. *_Ctrl, *_Jnt). regex: one pattern.")
+    name_match_menu = cmds.optionMenu()
+    cmds.menuItem(label="contains"); cmds.menuItem(label="glob"); cmds.menuItem(label="regex")
     cmds.setParent("..")
     cmds.rowLayout(numberOfColumns=3)
     case_cb = cmds.checkBox(label="Case sensitive", value=False)
     fullpath_cb = cmds.checkBox(label="Match full path", value=False)
+    match_all_cb = cmds.checkBox(label="Match ALL terms", value=False)
     cmds.setParent("..")
     cmds.button(label="Apply Name Filter (section)", height=34, bgc=(0.35, 0.45, 0.7),
-                command=lambda *_: apply_name_filter(name_mode_radio, name_field, case_cb, fullpath_cb))
+                command=lambda *_: apply_section("name", "Name filter"))
     cmds.setParent(".."); cmds.setParent("..")
 
     # Nth
@@ -115,7 +139,31 @@ def filter_selection_ui_v6_4_fix2():
     nth_offset_field = cmds.intField(value=1, minValue=1)
     cmds.setParent("..")
     cmds.button(label="Apply Nth Filter (section)", height=34, bgc=(0.45, 0.6, 0.35),
-                command=lambda *_: apply_nth_filter(nth_mode_radio, nth_step_field, nth_offset_field))
+                command=lambda *_: apply_section("nth", "Nth"))
+    cmds.setParent(".."); cmds.setParent("..")
+
+    # -----------------------
+    # Filter pipeline: queue the sections above as stages, evaluate in one pass, select once
+    # -----------------------
+    cmds.frameLayout(label="Filter Pipeline (stack stages → one select)", collapsable=True, marginWidth=6)
+    cmds.columnLayout(adjustableColumn=True, rowSpacing=4)
+    cmds.text(label="Stages use the current settings of the sections above.", align="left")
+    cmds.rowLayout(numberOfColumns=4, columnWidth4=[190,190,190,190])
+    cmds.button(label="+ Type stage", height=28, command=lambda *_: add_pipeline_stage("type"))
+    cmds.button(label="+ Name stage", height=28, command=lambda *_: add_pipeline_stage("name"))
+    cmds.button(label="+ Nth stage", height=28, command=lambda *_: add_pipeline_stage("nth"))
+    cmds.button(label="Clear stages", height=28, command=lambda *_: set_pipeline_stages([]))
+    cmds.setParent("..")
+    pipeline_list = cmds.textScrollList(numberOfRows=5, allowMultiSelection=False)
+    cmds.button(label="Run Pipeline on Selection", height=34, bgc=(0.28, 0.52, 0.28),
+                command=lambda *_: run_pipeline())
+    cmds.rowLayout(numberOfColumns=5, adjustableColumn=1)
+    preset_name_field = cmds.textField(placeholderText="Preset name")
+    cmds.button(label="Save Preset", command=lambda *_: save_pipeline_preset())
+    preset_menu = cmds.optionMenu()
+    cmds.button(label="Load", command=lambda *_: load_pipeline_preset())
+    cmds.button(label="Delete", command=lambda *_: delete_pipeline_preset())
+    cmds.setParent("..")
     cmds.setParent(".."); cmds.setParent("..")
 
     # -----------------------
@@ -204,165 +252,147 @@ def filter_selection_ui_v6_4_fix2():
     cmds.setParent("..")  # end main column
 
     # -----------------------
-    # Implementation helpers
+    # Implementation helpers (thin wrappers: read widgets -> SelectionFilterEngine -> select)
     # -----------------------
-    def apply_type_filter(mode_radio, filter_options, checkboxes):
-        sel = collect_selected()
-        if not sel:
-            cmds.warning("Nothing selected."); return
-        mode_index = cmds.radioButtonGrp(mode_radio, query=True, select=True)
-        mode_keep = (mode_index == 1)
-        active_types = []
-        include_groups = False
-        for label, types in filter_options.items():
-            if cmds.checkBox(checkboxes[label], q=True, value=True):
-                if "__GROUP__" in types:
-                    include_groups = True
-                else:
-                    active_types.extend(types)
-        if not active_types and not include_groups:
-            cmds.warning("No object types enabled."); return
-        result = []
-        for item in sel:
-            nt = safe_node_type(item)
-            if nt == "joint" and "joint" in active_types:
-                result.append(item); continue
-            if nt == "transform":
-                shapes = cmds.listRelatives(item, shapes=True, fullPath=True) or []
-                matched = False
-                for s in shapes:
-                    if safe_node_type(s) in active_types:
-                        result.append(item); matched = True; break
-                if matched: continue
-            if nt in active_types:
-                parents = cmds.listRelatives(item, parent=True, fullPath=True) or []
-                if parents: result.extend(parents)
-                else: result.append(item)
-        if include_groups:
-            for item in sel:
-                if safe_node_type(item) != "transform": continue
-                shapes = cmds.listRelatives(item, shapes=True) or []
-                if shapes: continue
-                descendants = cmds.listRelatives(item, ad=True, fullPath=True) or []
-                bad = any(safe_node_type(d) == "joint" or safe_node_type(d).lower().endswith("constraint") for d in descendants)
-                if not bad: result.append(item)
-        result = ordered_unique(result)
-        if mode_keep:
-            cmds.select(result, r=True); cmds.inViewMessage(amg=f"<hl>Type filter (keep) → {len(result)} objects</hl>", pos="topCenter", fade=True)
-        else:
-            to_remove = set(result)
-            new_sel = [x for x in sel if x not in to_remove]
-            if new_sel:
-                cmds.select(new_sel, r=True); cmds.inViewMessage(amg=f"<hl>Type filter (drop) → removed {len(sel)-len(new_sel)} objects</hl>", pos="topCenter", fade=True)
-            else:
-                cmds.select(clear=True); cmds.inViewMessage(amg=f"<hl>Type filter (drop) → removed all</hl>", pos="topCenter", fade=True)
-
-    def apply_name_filter(mode_radio, name_field, case_cb, fullpath_cb):
-        sel = collect_selected()
-        if not sel:
-            cmds.warning("Nothing selected."); return
-        mode_index = cmds.radioButtonGrp(mode_radio, query=True, select=True)
-        mode_keep = (mode_index == 1)
+    def read_name_matcher(name_field, case_cb, fullpath_cb):
         text = cmds.textField(name_field, q=True, text=True)
         if not text:
-            cmds.warning("Name filter is empty."); return
-        case = cmds.checkBox(case_cb, q=True, value=True)
-        full = cmds.checkBox(fullpath_cb, q=True, value=True)
-        needle = text if case else text.lower()
-        result = []
-        for item in sel:
-            target = item if full else short_name(item)
-            target = target if case else target.lower()
-            if needle in target:
-                result.append(item)
-        result = ordered_unique(result)
-        if mode_keep:
-            cmds.select(result, r=True); cmds.inViewMessage(amg=f"<hl>Name filter (keep) → {len(result)} objects</hl>", pos="topCenter", fade=True)
-        else:
-            to_remove = set(result)
-            new_sel = [x for x in sel if x not in to_remove]
-            if new_sel:
-                cmds.select(new_sel, r=True); cmds.inViewMessage(amg=f"<hl>Name filter (drop) → removed {len(sel)-len(new_sel)} objects</hl>", pos="topCenter", fade=True)
-            else:
-                cmds.select(clear=True); cmds.inViewMessage(amg=f"<hl>Name filter (drop) → removed all</hl>", pos="topCenter", fade=True)
-
-    def apply_nth_filter(nth_mode_radio, nth_step_field, nth_offset_field):
-        sel = collect_selected()
-        if not sel:
+            cmds.warning("Name filter is empty."); return None
+        case = bool(cmds.checkBox(case_cb, q=True, value=True))
+        full = bool(cmds.checkBox(fullpath_cb, q=True, value=True))
+        require_all = bool(cmds.checkBox(match_all_cb, q=True, value=True))
+        match_mode = cmds.optionMenu(name_match_menu, q=True, value=True)
+        try:
+            return sfe.compile_name_matcher(text, match_mode, case, full, require_all)
+        except (re.error, ValueError) as e:
+            cmds.warning(f"Invalid name pattern: {e}"); return None
+
+    def apply_section(kind, label):
+        spec = stage_from_ui(kind)
+        if spec is not None:
+            run_stages([spec], label)
+
+    def run_stages(specs, label):
+        scope = SCOPE_KEYS[cmds.optionMenu(scope_menu, q=True, value=True)]
+        opt_set(OPT_SCOPE, scope)
+        sel = collect_selected() if scope != "scene" else []
+        if scope != "scene" and not sel:
             cmds.warning("Nothing selected."); return
-        mode_index = cmds.radioButtonGrp(nth_mode_radio, query=True, select=True)
-        mode_keep = (mode_index == 1)
-        step = cmds.intField(nth_step_field, q=True, value=True)
-        offset = cmds.intField(nth_offset_field, q=True, value=True)
-        offset = max(1, offset)
-        picked = [sel[i] for i in range(offset - 1, len(sel), step)]
-        picked = ordered_unique(picked)
-        if mode_keep:
-            cmds.select(picked, r=True); cmds.inViewMessage(amg=f"<hl>Nth (keep) → {len(picked)} objects</hl>", pos="topCenter", fade=True)
+        backend = scene_backend() or sfe.MayaSceneBackend()
+        # scene / roots scopes stream from a DAG walk; nothing is selected until the end
+        seen = [0]
+        def counted(nodes):
+            for node in nodes:
+                seen[0] += 1
+                yield node
+        pipe = sfe.SelectionPipeline(backend=backend, specs=specs)
+        result = pipe.run(counted(sfe.scope_nodes(scope, sel, backend)))
+        if result:
+            cmds.select(result, r=True)
         else:
-            to_remove = set(picked)
-            new_sel = [x for x in sel if x not in to_remove]
-            if new_sel:
-                cmds.select(new_sel, r=True); cmds.inViewMessage(amg=f"<hl>Nth (drop) → removed {len(sel)-len(new_sel)} objects</hl>", pos="topCenter", fade=True)
-            else:
-                cmds.select(clear=True); cmds.inViewMessage(amg=f"<hl>Nth (drop) → removed all</hl>", pos="topCenter", fade=True)
+            cmds.select(clear=True)
+        if len(specs) > 1 or specs[0][1].get("keep", True):
+            cmds.inViewMessage(amg=f"<hl>{label} (keep) → {len(result)} objects</hl>", pos="topCenter", fade=True)
+        elif result:
+            cmds.inViewMessage(amg=f"<hl>{label} (drop) → removed {seen[0]-len(result)} objects</hl>", pos="topCenter", fade=True)
+        else:
+            cmds.inViewMessage(amg=f"<hl>{label} (drop) → removed all</hl>", pos="topCenter", fade=True)
 
     # -----------------------
-    # Reparenting logic (name-based unchanged, numbering updated + fix)
+    # Pipeline stages + presets (stored as JSON in an optionVar)
     # -----------------------
-    def remove_pattern_once(name, pattern, mode="contains", case_sensitive=False):
-        if not pattern:
-            return None
-        if not case_sensitive:
-            nl = name.lower(); pl = pattern.lower()
-        else:
-            nl = name; pl = pattern
-        if mode == "prefix":
-            if nl.startswith(pl):
-                return name[len(pattern):]
-            return None
-        if mode == "suffix":
-            if nl.endswith(pl):
-                return name[:len(name)-len(pattern)]
-            return None
-        idx = nl.find(pl)
-        if idx == -1:
-            return None
-        return name[:idx] + name[idx+len(pattern):]
+    pipeline_specs = []
+
+    def set_pipeline_stages(specs):
+        pipeline_specs[:] = specs
+        cmds.textScrollList(pipeline_list, edit=True, removeAll=True)
+        for i, (kind, params) in enumerate(pipeline_specs):
+            cmds.textScrollList(pipeline_list, edit=True, append=f"{i+1}. {sfe.describe_stage(kind, params)}")
+
+    def stage_from_ui(kind):
+        if kind == "type":
+            enabled = [label for label in filter_options if cmds.checkBox(type_checkboxes[label], q=True, value=True)]
+            active_types, include_groups = sfe.split_types(filter_options, enabled)
+            if not active_types and not include_groups:
+                cmds.warning("No object types enabled."); return None
+            keep = cmds.radioButtonGrp(type_mode_radio, q=True, select=True) == 1
+            return ("type", dict(active_types=active_types, include_groups=include_groups, keep=keep))
+        if kind == "name":
+            if read_name_matcher(name_field, case_cb, fullpath_cb) is None:
+                return None
+            return ("name", dict(pattern=cmds.textField(name_field, q=True, text=True),
+                                 mode=cmds.optionMenu(name_match_menu, q=True, value=True),
+                                 case_sensitive=bool(cmds.checkBox(case_cb, q=True, value=True)),
+                                 full_path=bool(cmds.checkBox(fullpath_cb, q=True, value=True)),
+                                 require_all=bool(cmds.checkBox(match_all_cb, q=True, value=True)),
+                                 keep=cmds.radioButtonGrp(name_mode_radio, q=True, select=True) == 1))
+        return ("nth", dict(step=cmds.intField(nth_step_field, q=True, value=True),
+                            offset=cmds.intField(nth_offset_field, q=True, value=True),
+                            keep=cmds.radioButtonGrp(nth_mode_radio, q=True, select=True) == 1))
+
+    def add_pipeline_stage(kind):
+        spec = stage_from_ui(kind)
+        if spec is not None:
+            set_pipeline_stages(pipeline_specs + [spec])
+
+    def run_pipeline():
+        if not pipeline_specs:
+            cmds.warning("Pipeline has no stages."); return
+        run_stages(list(pipeline_specs), f"Pipeline ({len(pipeline_specs)} stages)")
+
+    def load_presets():
+        try:
+            return json.loads(opt_get(OPT_PIPELINE_PRESETS, "{}") or "{}")
+        except ValueError:
+            return {}
+
+    def refresh_preset_menu():
+        for item in cmds.optionMenu(preset_menu, q=True, itemListLong=True) or []:
+            cmds.deleteUI(item)
+        for name in sorted(load_presets()):
+            cmds.menuItem(label=name, parent=preset_menu)
+
+    def save_pipeline_preset():
+        name = (cmds.textField(preset_name_field, q=True, text=True) or "").strip()
+        if not name or not pipeline_specs:
+            cmds.warning("Enter a preset name and add at least one stage."); return
+        presets = load_presets()
+        presets[name] = sfe.pipeline_to_json(pipeline_specs)
+        opt_set(OPT_PIPELINE_PRESETS, json.dumps(presets))
+        refresh_preset_menu()
+        cmds.optionMenu(preset_menu, edit=True, value=name)
+
+    def selected_preset():
+        if not cmds.optionMenu(preset_menu, q=True, numberOfItems=True):
+            cmds.warning("No saved pipeline presets."); return None
+        return cmds.optionMenu(preset_menu, q=True, value=True)
+
+    def load_pipeline_preset():
+        name = selected_preset()
+        presets = load_presets()
+        if name not in presets:
+            return
+        try:
+            set_pipeline_stages(sfe.pipeline_from_json(presets[name]))
+        except ValueError as e:
+            cmds.warning(f"Preset '{name}' could not be loaded: {e}")
 
+    def delete_pipeline_preset():
+        name = selected_preset()
+        presets = load_presets()
+        if presets.pop(name, None) is not None:
+            opt_set(OPT_PIPELINE_PRESETS, json.dumps(presets))
+            refresh_preset_menu()
+
+    # -----------------------
+    # Reparenting (planning + execution live in SelectionFilterEngine)
+    # -----------------------
     def plan_name_based_reparent(sel):
         parent_pat = cmds.textField(parent_string_field, q=True, text=True) or ""
         child_pat = cmds.textField(child_string_field, q=True, text=True) or ""
         parent_mode = cmds.optionMenu(parent_mode_menu, q=True, value=True)
         child_mode = cmds.optionMenu(child_mode_menu, q=True, value=True)
-        if not parent_pat or not child_pat:
-            return {}, []
-        parents_by_base = {}
-        children_by_base = {}
-        all_children = set()
-        for item in sel:
-            sname = short_name(item)
-            base_p = remove_pattern_once(sname, parent_pat, mode=parent_mode, case_sensitive=False)
-            if base_p is not None:
-                parents_by_base.setdefault(base_p, []).append(item)
-            base_c = remove_pattern_once(sname, child_pat, mode=child_mode, case_sensitive=False)
-            if base_c is not None:
-                children_by_base.setdefault(base_c, []).append(item)
-                all_children.add(item)
-        plan = {}; unassigned = []
-        for base_key in children_by_base.keys():
-            if base_key in parents_by_base:
-                parent_candidates = parents_by_base[base_key]
-                chosen_parent = parent_candidates[0]
-                kids = children_by_base[base_key]
-                kids_filtered = [k for k in kids if k != chosen_parent]
-                if kids_filtered:
-                    plan[chosen_parent] = kids_filtered
-        for c in all_children:
-            matched = any(c in kids for kids in plan.values())
-            if not matched:
-                unassigned.append(c)
-        return plan, unassigned
+        return sfe.plan_name_reparent(sel, parent_pat, child_pat, parent_mode, child_mode)
 
     def plan_numbering_reparent(sel):
         prefix = cmds.textField(prefix_field, q=True, text=True) or ""
@@ -378,66 +408,18 @@ def filter_selection_ui_v6_4_fix2():
         opt_set(OPT_NUMERIC_SORT, int(numeric_sort_as_int))
         opt_set(OPT_AUTO_SCAN, int(auto_scan))
 
-        pat = r"^" + re.escape(prefix) + r"(\d+)" + re.escape(suffix) + r"$"
-        regex = re.compile(pat)
-
-        matched = []   # list of tuples (base_key, num_key, node, num_text)
-        unmatched = []
-
-        for item in sel:
-            sname = short_name(item)
-            m = regex.match(sname)
-            if m:
-                num_text = m.group(1)
-                if numeric_sort_as_int:
-                    try:
-                        num_key = int(num_text)
-                    except:
-                        num_key = num_text
-                else:
-                    num_key = num_text
-                base_key = sname[:m.start(1)] + sname[m.end(1):]
-                matched.append((base_key, num_key, item, num_text))
-            else:
-                unmatched.append(item)
-
-        if not matched:
-            return [], unmatched
+        # cached per (selection, settings): Preview then Apply plans only once
+        return sfe.plan_numbering(tuple(sel), prefix, suffix, ordering == "decreasing",
+                                  numeric_sort_as_int, auto_scan)
 
-        groups = {}
-        if auto_scan:
-            for base, num_key, node, num_text in matched:
-                groups.setdefault(base, []).append((num_key, node, num_text))
-        else:
-            key = "_ALL_"
-            groups[key] = [(num_key, node, num_text) for (_, num_key, node, num_text) in matched]
-
-        chains = []
-        reverse = (ordering == "decreasing")
-        for base, entries in groups.items():
-            try:
-                entries.sort(key=lambda t: t[0], reverse=reverse)
-            except Exception:
-                entries.sort(key=lambda t: str(t[0]), reverse=reverse)
-            ordered_nodes = [t[1] for t in entries]
-            ordered_info = [(t[1], t[2], t[0]) for t in entries]  # (node, num_text, num_key)
-            chains.append((ordered_nodes, ordered_info, base))  # keep info for preview
-        return chains, unmatched
-
-    # Resolve a node to its current transform path just before parenting.
-    def resolve_transform_current(node):
-        if cmds.objExists(node):
-            nt = safe_node_type(node)
-            if nt in ("transform", "joint"):
-                return node
-            parents = cmds.listRelatives(node, parent=True, fullPath=True) or []
-            return parents[0] if parents else node
-        s = short_name(node)
-        candidates = cmds.ls(s, long=True) or []
-        if not candidates:
-            return node
-        candidates_sorted = sorted(candidates, key=lambda c: len(c))
-        return candidates_sorted[0]
+    def cycle_preview_lines(pairs):
+        cycles = sfe.find_cycles(pairs)
+        if not cycles:
+            return []
+        lines = ["", f"Would-be cycles ({len(cycles)}) - these moves are skipped when 'Prevent cycles' is on:"]
+        for cycle in cycles[:200]:
+            lines.append("  - " + " -> ".join(short_name(n) for n in cycle + cycle[:1]))
+        return lines
 
     def preview_reparenting():
         sel = collect_selected()
@@ -457,18 +439,24 @@ def filter_selection_ui_v6_4_fix2():
                 preview_lines.append(""); preview_lines.append("Unassigned children (no matching parent):")
                 for u in unassigned[:200]:
                     preview_lines.append("  - " + short_name(u))
+            preview_lines.extend(cycle_preview_lines(sfe.name_plan_pairs(plan)))
         else:
             chains, unmatched = plan_numbering_reparent(sel)
             if not chains:
                 cmds.confirmDialog(title="Preview Reparenting", message="No numeric matches found for given prefix/suffix.", button=["OK"]); return
-            for i, (chain_nodes, chain_info, base) in enumerate(chains):
-                preview_lines.append(f"Planned chain #{i+1} (top -> ... -> bottom) base='{base}':")
-                for node, num_text, num_key in chain_info:
+            for i, chain in enumerate(chains):
+                preview_lines.append(f"Planned chain #{i+1} (top -> ... -> bottom) base='{chain.base}':")
+                for node, num_text, num_key in chain.info:
                     preview_lines.append(f"  - {short_name(node)}   (token='{num_text}', parsed={num_key})")
+                if chain.gaps:
+                    preview_lines.append("  ! missing numbers: " + ", ".join(str(n) for n in chain.gaps))
+                if chain.duplicates:
+                    preview_lines.append("  ! duplicate numbers: " + ", ".join(str(n) for n in chain.duplicates))
             if unmatched:
                 preview_lines.append(""); preview_lines.append("Unmatched (did not fit prefix+number+suffix):")
                 for u in unmatched[:200]:
                     preview_lines.append("  - " + short_name(u))
+            preview_lines.extend(cycle_preview_lines(sfe.chain_pairs(chains)))
         message = "\n".join(preview_lines[:4000]) or "No planned changes."
         cmds.confirmDialog(title="Preview Reparenting", message=message, button=["OK"], defaultButton="OK", dismissString="OK")
 
@@ -487,27 +475,12 @@ def filter_selection_ui_v6_4_fix2():
             plan, unassigned = plan_name_based_reparent(sel)
             if not plan and not unassigned:
                 cmds.warning("No reparent actions planned."); return
-            applied = 0
-            for p, kids in plan.items():
-                parent_node = p
-                if not cmds.objExists(parent_node):
-                    continue
-                for kid in kids:
-                    if not cmds.objExists(kid):
-                        continue
-                    if prevent_cycles:
-                        if parent_node == kid: continue
-                        descendants = cmds.listRelatives(kid, ad=True, fullPath=True) or []
-                        if parent_node in descendants: continue
-                    try:
-                        cmds.parent(kid, parent_node)
-                        applied += 1
-                    except Exception as e:
-                        cmds.warning(f"Failed to parent {kid} to {parent_node}: {e}")
+            stats = run_reparent_plan(sfe.name_plan_pairs(plan), prevent_cycles)
+            rate = reparent_rate_text(stats)
             if unassigned:
-                cmds.inViewMessage(amg=f"<hl>Reparenting done. {applied} moved. {len(unassigned)} children unassigned.</hl>", pos="topCenter", fade=True)
+                cmds.inViewMessage(amg=f"<hl>Reparenting done. {stats['moved']} moved{rate}. {len(unassigned)} children unassigned.</hl>", pos="topCenter", fade=True)
             else:
-                cmds.inViewMessage(amg=f"<hl>Reparenting done. {applied} moved.</hl>", pos="topCenter", fade=True)
+                cmds.inViewMessage(amg=f"<hl>Reparenting done. {stats['moved']} moved{rate}.</hl>", pos="topCenter", fade=True)
         else:
             chains, unmatched = plan_numbering_reparent(sel)
             if not chains:
@@ -522,31 +495,28 @@ def filter_selection_ui_v6_4_fix2():
                     return
                 chosen_chains = [chains[chain_index - 1]]
 
-            applied = 0
-            for chain_nodes, chain_info, base in chosen_chains:
-                for i in range(len(chain_nodes) - 1, 0, -1):
-                    child_node_orig = chain_nodes[i]
-                    parent_node_orig = chain_nodes[i - 1]
-                    parent_r = resolve_transform_current(parent_node_orig)
-                    child_r = resolve_transform_current(child_node_orig)
-                    if not cmds.objExists(parent_r) or not cmds.objExists(child_r):
-                        continue
-                    if prevent_cycles:
-                        if parent_r == child_r:
-                            continue
-                        descendants = cmds.listRelatives(child_r, ad=True, fullPath=True) or []
-                        if parent_r in descendants:
-                            continue
-                    try:
-                        cmds.parent(child_r, parent_r)
-                        applied += 1
-                    except Exception as e:
-                        cmds.warning(f"Failed to parent {child_r} under {parent_r}: {e}")
-
+            stats = run_reparent_plan(sfe.chain_pairs(chosen_chains), prevent_cycles)
+            rate = reparent_rate_text(stats)
             if unmatched:
-                cmds.inViewMessage(amg=f"<hl>Numbering reparent done. {applied} moved. {len(unmatched)} unmatched.</hl>", pos="topCenter", fade=True)
+                cmds.inViewMessage(amg=f"<hl>Numbering reparent done. {stats['moved']} moved{rate}. {len(unmatched)} unmatched.</hl>", pos="topCenter", fade=True)
             else:
-                cmds.inViewMessage(amg=f"<hl>Numbering reparent done. {applied} moved.</hl>", pos="topCenter", fade=True)
+                cmds.inViewMessage(amg=f"<hl>Numbering reparent done. {stats['moved']} moved{rate}.</hl>", pos="topCenter", fade=True)
+
+    # Validate, then move everything with one parent command per destination and a single undo step
+    def run_reparent_plan(pairs, prevent_cycles):
+        stats, cycles, errors = sfe.reparent(pairs, prevent_cycles)
+        for kid, parent_node, err in errors[:50]:
+            cmds.warning(f"Failed to parent {kid} under {parent_node}: {err}")
+        if len(errors) > 50:
+            cmds.warning(f"... {len(errors) - 50} more failed moves not shown.")
+        if cycles:
+            cmds.warning(f"Skipped {stats['skipped']} move(s) that would create {len(cycles)} cycle(s). See Preview for details.")
+        return stats
+
+    # timing and failures for the "... done" in-view messages
+    def reparent_rate_text(stats):
+        failed = f", {stats['failed']} failed" if stats['failed'] else ""
+        return f" in {stats['seconds']:.2f}s ({stats['moves_per_sec']:.0f}/s){failed}"
 
     # -----------------------
     # Bottom utilities
@@ -565,6 +535,7 @@ def filter_selection_ui_v6_4_fix2():
     cmds.button(label="Close", height=34, bgc=(0.55,0.32,0.32), command=lambda *_: cmds.deleteUI(win))
     cmds.setParent("..")
 
+    refresh_preset_menu()
     cmds.showWindow(win)
 
 # Run UI
@@ -0,0 +1,891 @@
+# Headless engine for the Filter Selection Tool: filters, reparent planners/executor and a pipeline
+# Works inside Maya (MayaSceneBackend), from mayapy/batch scripts, or without Maya (DictSceneBackend)
+#
+#   import SelectionFilterEngine as sfe
+#   nodes = sfe.type_filter(cmds.ls(sl=True, long=True), ["joint"])
+#   sfe.SelectionPipeline().name_filter("Spine_*", mode="glob").reparent_numbered("Spine_", "_Jnt").run(nodes)
+
+import re
+import json
+import time
+import fnmatch
+from collections import namedtuple
+from contextlib import contextmanager
+from functools import lru_cache
+
+try:
+    import maya.cmds as cmds
+    import maya.api.OpenMaya as om
+except ImportError:
+    cmds = None
+    om = None
+
+GROUP_TOKEN = "__GROUP__"
+
+# Node types that live in the DAG as transforms rather than shapes
+TRANSFORM_TYPES = ("transform", "joint")
+
+
+# -----------------------
+# Path helpers
+# -----------------------
+def short_name(node):
+    return node.split("|")[-1] if node else node
+
+def parent_path(node):
+    """Parent of a long DAG path ("|a|b" -> "|a"), or None for roots and non-DAG nodes."""
+    if not node or "|" not in node:
+        return None
+    head = node.rsplit("|", 1)[0]
+    return head or None
+
+def ordered_unique(seq):
+    seen = set()
+    out = []
+    for x in seq:
+        if x not in seen:
+            out.append(x)
+            seen.add(x)
+    return out
+
+def is_constraint_type(node_type):
+    return node_type.lower().endswith("constraint")
+
+
+# -----------------------
+# Scene backends
+# -----------------------
+class MayaSceneBackend(object):
+    """
+    Bulk queries against the open Maya scene. Every method takes a list of long
+    names and answers with a single command, never one call per node.
+    """
+    def node_types(self, nodes):
+        if not nodes:
+            return {}
+        flat = cmds.ls(nodes, long=True, showType=True) or []
+        return dict(zip(flat[0::2], flat[1::2]))
+
+    def shapes(self, nodes):
+        if not nodes:
+            return []
+        return cmds.listRelatives(nodes, shapes=True, fullPath=True) or []
+
+    def descendants(self, nodes):
+        if not nodes:
+            return []
+        return cmds.listRelatives(nodes, allDescendents=True, fullPath=True) or []
+
+    def uuids(self, nodes):
+        """{long_name: uuid}. Both listings get the same arguments, so they pair up in order."""
+        if not nodes:
+            return {}
+        paths = cmds.ls(nodes, long=True) or []
+        ids = cmds.ls(nodes, uuid=True) or []
+        if len(paths) != len(ids):
+            return dict((p, (cmds.ls(p, uuid=True) or [None])[0]) for p in paths)
+        return dict(zip(paths, ids))
+
+    def paths(self, uuids):
+        """{uuid: current long name} for every uuid that still exists."""
+        if not uuids:
+            return {}
+        ids = cmds.ls(uuids, uuid=True) or []
+        paths = cmds.ls(uuids, long=True) or []
+        if len(paths) != len(ids):
+            return dict((u, (cmds.ls(u, long=True) or [None])[0]) for u in uuids)
+        return dict(zip(ids, paths))
+
+    def iter_dag(self, roots=None):
+        """
+        Stream long names from an MItDag walk (whole scene, or each root's subtree),
+        so scene-wide filters never build a selection first.
+        """
+        it = om.MItDag(om.MItDag.kDepthFirst, om.MFn.kInvalid)
+        if roots is None:
+            while not it.isDone():
+                path = it.fullPathName()
+                if path:
+                    yield path
+                it.next()
+            return
+        sl = om.MSelectionList()
+        for root in roots:
+            try:
+                sl.add(root)
+            except RuntimeError:
+                pass
+        for i in range(sl.length()):
+            try:
+                root_path = sl.getDagPath(i)
+            except TypeError:
+                continue
+            it.reset(root_path, om.MItDag.kDepthFirst, om.MFn.kInvalid)
+            while not it.isDone():
+                yield it.fullPathName()
+                it.next()
+
+    def parent(self, children, parent):
+        """Parent all children under parent in one command; returns their new names."""
+        return cmds.parent(children, parent) or []
+
+    @contextmanager
+    def undo_chunk(self, name):
+        cmds.undoInfo(openChunk=True, chunkName=name)
+        try:
+            yield
+        finally:
+            cmds.undoInfo(closeChunk=True)
+
+
+class DictSceneBackend(object):
+    """
+    Fake scene graph built from {long_name: node_type}. Lets the engine run
+    without Maya so filters can be profiled against synthetic rigs.
+    """
+    def __init__(self, nodes):
+        self.types = dict(nodes)
+        self.children = {}
+        self.uuid_by_path = {}
+        self.path_by_uuid = {}
+        for i, node in enumerate(self.types):
+            parent = parent_path(node)
+            if parent is not None:
+                self.children.setdefault(parent, []).append(node)
+            uuid = "FAKE-%08d" % i
+            self.uuid_by_path[node] = uuid
+            self.path_by_uuid[uuid] = node
+
+    def _is_shape(self, node):
+        nt = self.types.get(node, "")
+        return nt not in TRANSFORM_TYPES and not is_constraint_type(nt)
+
+    def node_types(self, nodes):
+        return dict((n, self.types[n]) for n in nodes if n in self.types)
+
+    def shapes(self, nodes):
+        out = []
+        for node in nodes:
+            out.extend(c for c in self.children.get(node, ()) if self._is_shape(c))
+        return out
+
+    def descendants(self, nodes):
+        out = []
+        stack = list(nodes)
+        while stack:
+            kids = self.children.get(stack.pop(), ())
+            out.extend(kids)
+            stack.extend(kids)
+        return out
+
+    def iter_dag(self, roots=None):
+        if roots is None:
+            for node in list(self.types):
+                yield node
+            return
+        for root in roots:
+            if root in self.types:
+                yield root
+                for node in self.descendants([root]):
+                    yield node
+
+    def uuids(self, nodes):
+        return dict((n, self.uuid_by_path[n]) for n in nodes if n in self.uuid_by_path)
+
+    def paths(self, uuids):
+        return dict((u, self.path_by_uuid[u]) for u in uuids if u in self.path_by_uuid)
+
+    def parent(self, children, parent):
+        if parent not in self.types:
+            raise RuntimeError("No object matches name: %s" % parent)
+        out = []
+        for child in children:
+            if child not in self.types:
+                raise RuntimeError("No object matches name: %s" % child)
+            new_root = parent + "|" + short_name(child)
+            old_parent = parent_path(child)
+            if old_parent is not None:
+                self.children[old_parent].remove(child)
+            moved = [child] + self.descendants([child])
+            for node in moved:
+                new_node = new_root + node[len(child):]
+                self.types[new_node] = self.types.pop(node)
+                uuid = self.uuid_by_path.pop(node)
+                self.uuid_by_path[new_node] = uuid
+                self.path_by_uuid[uuid] = new_node
+                if node in self.children:
+                    self.children[new_node] = [new_root + c[len(child):] for c in self.children.pop(node)]
+            self.children.setdefault(parent, []).append(new_root)
+            out.append(short_name(new_root))
+        return out
+
+    @contextmanager
+    def undo_chunk(self, name):
+        yield
+
+
+def default_backend():
+    if cmds is None:
+        raise RuntimeError("maya.cmds is not available; pass a backend explicitly.")
+    return MayaSceneBackend()
+
+
+# -----------------------
+# Type classification
+# -----------------------
+class TypeClassifier(object):
+    """
+    Indexes node types and shape types for a whole selection up front, then
+    answers type-filter queries from memory. Group-ness ("__GROUP__": a shapeless
+    transform with no joint/constraint below it) is resolved lazily with one
+    descendant query for all candidate transforms.
+    """
+    def __init__(self, nodes, backend=None):
+        self.backend = backend or default_backend()
+        self.nodes = list(nodes)
+        self.types = self.backend.node_types(self.nodes)
+        self.shape_types = {}
+        self._groups = None
+
+        transforms = [n for n in self.nodes if self.types.get(n) == "transform"]
+        shapes = self.backend.shapes(transforms)
+        types = self.backend.node_types(shapes)
+        for shape in shapes:
+            self.shape_types.setdefault(parent_path(shape), []).append(types.get(shape, ""))
+
+    def node_type(self, node):
+        return self.types.get(node, "")
+
+    def groups(self):
+        if self._groups is None:
+            candidates = [n for n in self.nodes
+                          if self.types.get(n) == "transform" and n not in self.shape_types]
+            descendants = ordered_unique(self.backend.descendants(candidates))
+            types = self.backend.node_types(descendants)
+            blocked = set()
+            for node in descendants:
+                nt = types.get(node, "")
+                if nt != "joint" and not is_constraint_type(nt):
+                    continue
+                # mark every ancestor; stop once we reach a chain already marked
+                up = parent_path(node)
+                while up and up not in blocked:
+                    blocked.add(up)
+                    up = parent_path(up)
+            self._groups = set(n for n in candidates if n not in blocked)
+        return self._groups
+
+    def matches(self, active_types, include_groups=False):
+        """Nodes picked by the filter, in selection order (shapes resolve to their transform)."""
+        active = set(active_types)
+        result = []
+        for item in self.nodes:
+            nt = self.types.get(item, "")
+            if nt == "joint" and "joint" in active:
+                result.append(item); continue
+            if nt == "transform" and any(t in active for t in self.shape_types.get(item, ())):
+                result.append(item); continue
+            if nt in active:
+                result.append(parent_path(item) or item)
+        if include_groups:
+            groups = self.groups()
+            result.extend(n for n in self.nodes if n in groups)
+        return ordered_unique(result)
+
+
+def split_types(filter_options, enabled_labels):
+    """Turn the UI's label -> [types] table into (active_types, include_groups)."""
+    active_types = []
+    include_groups = False
+    for label in enabled_labels:
+        types = filter_options[label]
+        if GROUP_TOKEN in types:
+            include_groups = True
+        else:
+            active_types.extend(types)
+    return active_types, include_groups
+
+def keep_or_drop(sel, picked, keep=True):
+    """Final selection for a Keep/Drop radio: the picked nodes, or sel minus them."""
+    if keep:
+        return ordered_unique(picked)
+    to_remove = set(picked)
+    return [x for x in sel if x not in to_remove]
+
+
+# -----------------------
+# Name matching
+# -----------------------
+NAME_MATCH_MODES = ("contains", "glob", "regex")
+
+class NameMatcher(object):
+    """
+    Name test compiled once from the UI's pattern text.
+
+    contains / glob: comma-separated terms, any term (or all with require_all) must hit.
+    regex: the whole text is one pattern, searched anywhere in the name.
+    Use compile_name_matcher() to share compiled matchers between clicks.
+    """
+    def __init__(self, pattern, mode="contains", case_sensitive=False, full_path=False, require_all=False):
+        if mode not in NAME_MATCH_MODES:
+            raise ValueError("Unknown name match mode: %s" % mode)
+        self.full_path = full_path
+        self.case_sensitive = case_sensitive
+        self._fold = (mode == "contains" and not case_sensitive)
+        combine = all if require_all else any
+        flags = 0 if case_sensitive else re.IGNORECASE
+
+        if mode == "regex":
+            search = re.compile(pattern, flags).search
+            self._test = lambda name: search(name) is not None
+            return
+
+        terms = [t.strip() for t in pattern.split(",") if t.strip()]
+        if not terms:
+            raise ValueError("Name pattern is empty.")
+        if mode == "contains":
+            needles = [t if case_sensitive else t.lower() for t in terms]
+            if len(needles) == 1:
+                needle = needles[0]
+                self._test = lambda name: needle in name
+            else:
+                self._test = lambda name: combine(n in name for n in needles)
+        elif require_all and len(terms) > 1:
+            matchers = [re.compile(fnmatch.translate(t), flags).match for t in terms]
+            self._test = lambda name: all(m(name) is not None for m in matchers)
+        else:
+            # any-of globs fold into one alternation, a single regex call per name
+            joined = "|".join("(?:%s)" % fnmatch.translate(t) for t in terms)
+            match = re.compile(joined, flags).match
+            self._test = lambda name: match(name) is not None
+
+    def target(self, node):
+        name = node if self.full_path else node.rsplit("|", 1)[-1]
+        return name.lower() if self._fold else name
+
+    def matches(self, node):
+        return self._test(self.target(node))
+
+    def select(self, nodes, invert=False):
+        """Lazily yield the nodes that match (or, with invert, the ones that do not)."""
+        test = self._test
+        target = self.target
+        for node in nodes:
+            if (test(target(node))) != invert:
+                yield node
+
+
+@lru_cache(maxsize=64)
+def compile_name_matcher(pattern, mode="contains", case_sensitive=False, full_path=False, require_all=False):
+    """Cached NameMatcher keyed by pattern + flags; raises re.error / ValueError on bad input."""
+    return NameMatcher(pattern, mode, case_sensitive, full_path, require_all)
+
+# where filters read their input: the selection, the whole DAG, or everything under the selected roots
+SCOPES = ("selection", "scene", "roots")
+
+def scope_nodes(scope, selection=(), backend=None):
+    """Input stream for a scope; scene/roots scopes come from the backend's DAG walk, lazily."""
+    if scope == "selection":
+        return iter(selection)
+    if scope not in SCOPES:
+        raise ValueError("Unknown scope: %s" % scope)
+    backend = backend or default_backend()
+    return backend.iter_dag(None if scope == "scene" else list(selection))
+
+
+# -----------------------
+# Numbering chains
+# -----------------------
+_DIGITS = re.compile(r"(\d+)")
+_LAST_NUMBER = re.compile(r"(\d+)(?!.*\d)")
+
+# nodes: top -> bottom; info: (node, num_text, num_key) per node; gaps: missing numbers;
+# duplicates: numbers used by more than one node
+NumberChain = namedtuple("NumberChain", "nodes info base gaps duplicates")
+
+def natural_key(text):
+    """Sort key that orders every digit run numerically: Spine_2_Sub_10 < Spine_10_Sub_2."""
+    parts = _DIGITS.split(text)
+    parts[0::2] = [p.lower() for p in parts[0::2]]
+    parts[1::2] = [int(p) for p in parts[1::2]]
+    return parts
+
+def _gaps_and_duplicates(numbers, limit=50):
+    seen = set()
+    dups = set()
+    for n in numbers:
+        if n in seen:
+            dups.add(n)
+        seen.add(n)
+    gaps = []
+    if seen:
+        lo, hi = min(seen), max(seen)
+        if hi - lo < 100000:
+            gaps = [n for n in range(lo, hi + 1) if n not in seen][:limit]
+    return gaps, sorted(dups)
+
+@lru_cache(maxsize=8)
+def plan_numbering(nodes, prefix="", suffix="", descending=False, numeric_sort=True, auto_scan=True):
+    """
+    Plan numbered chains for a tuple of long names. Returns (chains, unmatched).
+
+    With a prefix and/or suffix, names must be prefix + digits + suffix. With both
+    empty, the last digit run of each name is the chain number and the rest of
+    the name (Spine_02_Sub_#) is its base. Names are grouped by base in one pass,
+    each chain is sorted once (ties broken by a natural key over every number in
+    the name) and checked for gaps and duplicate numbers. Results are cached per
+    argument set, so Preview followed by Apply plans only once; treat them as
+    read-only.
+    """
+    if prefix or suffix:
+        regex = re.compile(r"^" + re.escape(prefix) + r"(\d+)" + re.escape(suffix) + r"$")
+        find = regex.match
+    else:
+        find = _LAST_NUMBER.search
+
+    groups = {}
+    unmatched = []
+    for node in nodes:
+        sname = short_name(node)
+        m = find(sname)
+        if not m:
+            unmatched.append(node)
+            continue
+        num_text = m.group(1)
+        num_key = int(num_text) if numeric_sort else num_text
+        base = sname[:m.start(1)] + ("" if (prefix or suffix) else "#") + sname[m.end(1):]
+        key = base if auto_scan else "_ALL_"
+        groups.setdefault(key, []).append((num_key, natural_key(sname), node, num_text))
+
+    chains = []
+    for base in sorted(groups, key=natural_key):
+        entries = groups[base]
+        entries.sort(key=lambda t: (t[0], t[1]), reverse=descending)
+        gaps, dups = _gaps_and_duplicates([int(t[3]) for t in entries])
+        chains.append(NumberChain(
+            nodes=[t[2] for t in entries],
+            info=[(t[2], t[3], t[0]) for t in entries],
+            base=base, gaps=gaps, duplicates=dups))
+    return chains, unmatched
+
+
+# -----------------------
+# Reparent plan validation
+# -----------------------
+def transforms_for(nodes, backend=None):
+    """Map each node to the transform it would be parented as (shapes resolve to their parent)."""
+    types = (backend or default_backend()).node_types(list(nodes))
+    out = {}
+    for node in nodes:
+        nt = types.get(node)
+        if nt is None or nt in TRANSFORM_TYPES:
+            out[node] = node
+        else:
+            out[node] = parent_path(node) or node
+    return out
+
+def find_cycles(pairs):
+    """
+    Cycles the plan would create, given (child, parent) pairs of long names.
+
+    Every node's final parent is its planned parent if it moves, otherwise the
+    parent in its current long name. Walking those links once per node (with
+    the usual visiting/done marks) finds every loop in O(nodes + path depth),
+    without querying descendants.
+    """
+    planned = {}
+    for child, parent in pairs:
+        planned[child] = parent
+
+    def final_parent(node):
+        if node in planned:
+            return planned[node]
+        return parent_path(node)
+
+    state = {}  # 1 = on the current walk, 2 = finished
+    cycles = []
+    for start in planned:
+        if start in state:
+            continue
+        walk = []
+        node = start
+        while node is not None and node not in state:
+            state[node] = 1
+            walk.append(node)
+            node = final_parent(node)
+        if node is not None and state[node] == 1:
+            cycles.append(walk[walk.index(node):])
+        for n in walk:
+            state[n] = 2
+    return cycles
+
+def drop_cyclic_pairs(pairs):
+    """
+    Remove every pair whose child sits on a would-be cycle, re-checking until
+    the remaining plan is acyclic. Returns (safe_pairs, cycles_found).
+    """
+    pairs = list(pairs)
+    found = []
+    while True:
+        cycles = find_cycles(pairs)
+        if not cycles:
+            return pairs, found
+        found.extend(cycles)
+        blocked = set(n for cycle in cycles for n in cycle)
+        pairs = [(c, p) for c, p in pairs if c not in blocked]
+
+
+# -----------------------
+# Reparent execution
+# -----------------------
+class ReparentExecutor(object):
+    """
+    Runs a validated (child, parent) plan: children are grouped by destination
+    parent and moved with one parent command per group, all inside a single
+    named undo chunk. Every node is tracked by UUID captured up front; each
+    group resolves its current long names from one UUID -> path query, so
+    earlier moves (or Maya renaming a clashing child) never leave later moves
+    acting on stale or ambiguous names.
+    """
+    def __init__(self, pairs, backend=None, undo_name="filterSelectionReparent"):
+        self.backend = backend or default_backend()
+        self.undo_name = undo_name
+        groups = {}
+        for child, parent in pairs:
+            if child != parent:
+                groups.setdefault(parent, []).append(child)
+        nodes = list(groups)
+        for kids in groups.values():
+            nodes.extend(kids)
+        self.uuid = self.backend.uuids(ordered_unique(nodes))
+        self.groups = groups
+        self.errors = []
+
+    def _move(self, kids, parent):
+        """Move kids under parent; returns how many moved. Falls back per child if the batch fails."""
+        ids = [self.uuid.get(n) for n in [parent] + kids]
+        now = self.backend.paths([u for u in ids if u])
+        parent_now = now.get(ids[0])
+        if parent_now is None:
+            self.errors.extend((k, parent, "parent no longer exists") for k in kids)
+            return 0
+        current = []
+        for kid, uuid in zip(kids, ids[1:]):
+            if uuid in now:
+                current.append(now[uuid])
+            else:
+                self.errors.append((kid, parent_now, "node no longer exists"))
+        if not current:
+            return 0
+        try:
+            self.backend.parent(current, parent_now)
+            return len(current)
+        except Exception:
+            pass
+        moved = 0
+        for kid_now in current:
+            try:
+                self.backend.parent([kid_now], parent_now)
+                moved += 1
+            except Exception as e:
+                self.errors.append((kid_now, parent_now, str(e)))
+        return moved
+
+    def run(self):
+        """Execute the plan. Returns stats: moved, failed, groups, seconds, moves_per_sec."""
+        start = time.time()
+        moved = 0
+        with self.backend.undo_chunk(self.undo_name):
+            for parent, kids in self.groups.items():
+                moved += self._move(kids, parent)
+        seconds = time.time() - start
+        return {
+            "moved": moved,
+            "failed": len(self.errors),
+            "groups": len(self.groups),
+            "seconds": seconds,
+            "moves_per_sec": moved / seconds if seconds > 0 else float(moved),
+        }
+
+
+# -----------------------
+# Plain-argument filters and planners (what the UI buttons call)
+# -----------------------
+def type_filter(nodes, active_types, include_groups=False, keep=True, backend=None):
+    picked = TypeClassifier(nodes, backend=backend).matches(active_types, include_groups)
+    return keep_or_drop(nodes, picked, keep)
+
+def name_filter(nodes, pattern, mode="contains", case_sensitive=False, full_path=False,
+                require_all=False, keep=True):
+    matcher = compile_name_matcher(pattern, mode, case_sensitive, full_path, require_all)
+    return ordered_unique(matcher.select(nodes, invert=not keep))
+
+def nth_filter(nodes, step, offset=1, keep=True):
+    """Every step-th node starting at the 1-based offset."""
+    nodes = list(nodes)
+    picked = nodes[max(1, offset) - 1::max(1, step)]
+    return keep_or_drop(nodes, picked, keep)
+
+def remove_pattern_once(name, pattern, mode="contains", case_sensitive=False):
+    """name with one prefix/suffix/contains occurrence of pattern removed, or None if absent."""
+    if not pattern:
+        return None
+    if not case_sensitive:
+        nl = name.lower(); pl = pattern.lower()
+    else:
+        nl = name; pl = pattern
+    if mode == "prefix":
+        if nl.startswith(pl):
+            return name[len(pattern):]
+        return None
+    if mode == "suffix":
+        if nl.endswith(pl):
+            return name[:len(name)-len(pattern)]
+        return None
+    idx = nl.find(pl)
+    if idx == -1:
+        return None
+    return name[:idx] + name[idx+len(pattern):]
+
+def plan_name_reparent(nodes, parent_pattern, child_pattern, parent_mode="suffix", child_mode="suffix"):
+    """
+    Pair children with parents whose names share a base once the parent/child
+    strings are removed. Returns ({parent: [children]}, unassigned_children).
+    """
+    if not parent_pattern or not child_pattern:
+        return {}, []
+    parents_by_base = {}
+    children_by_base = {}
+    all_children = []
+    for item in nodes:
+        sname = short_name(item)
+        base_p = remove_pattern_once(sname, parent_pattern, mode=parent_mode)
+        if base_p is not None:
+            parents_by_base.setdefault(base_p, []).append(item)
+        base_c = remove_pattern_once(sname, child_pattern, mode=child_mode)
+        if base_c is not None:
+            children_by_base.setdefault(base_c, []).append(item)
+            all_children.append(item)
+    plan = {}
+    for base_key, kids in children_by_base.items():
+        if base_key in parents_by_base:
+            chosen_parent = parents_by_base[base_key][0]
+            kids_filtered = [k for k in kids if k != chosen_parent]
+            if kids_filtered:
+                plan[chosen_parent] = kids_filtered
+    planned = set(k for kids in plan.values() for k in kids)
+    unassigned = ordered_unique(c for c in all_children if c not in planned)
+    return plan, unassigned
+
+def name_plan_pairs(plan):
+    """(child, parent) pairs for a name-based plan, in execution order."""
+    return [(kid, p) for p, kids in plan.items() for kid in kids]
+
+def chain_pairs(chains, backend=None):
+    """(child, parent) transform pairs for numbering chains, bottom of each chain first."""
+    pairs = []
+    for chain in chains:
+        chain_nodes = chain.nodes
+        for i in range(len(chain_nodes) - 1, 0, -1):
+            pairs.append((chain_nodes[i], chain_nodes[i - 1]))
+    if not pairs:
+        return []
+    xf = transforms_for([n for pair in pairs for n in pair], backend)
+    return [(xf[c], xf[p]) for c, p in pairs]
+
+def reparent(pairs, prevent_cycles=True, backend=None, undo_name="filterSelectionReparent"):
+    """
+    Validate and execute a (child, parent) plan. Returns (stats, cycles, errors):
+    stats as ReparentExecutor.run() plus "skipped" (moves dropped to avoid cycles).
+    """
+    pairs = list(pairs)
+    cycles = []
+    skipped = 0
+    if prevent_cycles:
+        safe_pairs, cycles = drop_cyclic_pairs(pairs)
+        skipped = len(pairs) - len(safe_pairs)
+        pairs = safe_pairs
+    executor = ReparentExecutor(pairs, backend=backend, undo_name=undo_name)
+    stats = executor.run()
+    stats["skipped"] = skipped
+    return stats, cycles, executor.errors
+
+
+# -----------------------
+# Lazy stages
+# -----------------------
+PIPELINE_CHUNK = 5000
+
+def _chunks(nodes, size):
+    chunk = []
+    for node in nodes:
+        chunk.append(node)
+        if len(chunk) >= size:
+            yield chunk
+            chunk = []
+    if chunk:
+        yield chunk
+
+def iter_unique(nodes):
+    seen = set()
+    for node in nodes:
+        if node not in seen:
+            seen.add(node)
+            yield node
+
+def iter_type_filter(nodes, active_types, include_groups=False, keep=True, backend=None, chunk_size=PIPELINE_CHUNK):
+    """Streaming type filter: each chunk of nodes is classified with one set of bulk queries."""
+    for chunk in _chunks(nodes, chunk_size):
+        picked = TypeClassifier(chunk, backend=backend).matches(active_types, include_groups)
+        if keep:
+            for node in picked:
+                yield node
+        else:
+            removed = set(picked)
+            for node in chunk:
+                if node not in removed:
+                    yield node
+
+def iter_nth_filter(nodes, step, offset=1, keep=True):
+    start = max(1, offset) - 1
+    step = max(1, step)
+    for i, node in enumerate(nodes):
+        hit = i >= start and (i - start) % step == 0
+        if hit == keep:
+            yield node
+
+
+# -----------------------
+# Pipeline
+# -----------------------
+PIPELINE_STAGES = ("type", "name", "nth", "reparent_name", "reparent_number")
+
+def describe_stage(kind, params):
+    """One-line summary of a stage for lists and logs."""
+    mode = "keep" if params.get("keep", True) else "drop"
+    if kind == "type":
+        types = list(params.get("active_types", []))
+        if params.get("include_groups"):
+            types.append("groups")
+        return "Type (%s): %s" % (mode, ", ".join(types))
+    if kind == "name":
+        return "Name (%s, %s): %s" % (mode, params.get("mode", "contains"), params.get("pattern", ""))
+    if kind == "nth":
+        return "Nth (%s): every %s from %s" % (mode, params.get("step"), params.get("offset", 1))
+    if kind == "reparent_name":
+        return "Reparent by name: %s <- %s" % (params.get("parent_pattern"), params.get("child_pattern"))
+    return "Reparent by number: %s#%s" % (params.get("prefix", ""), params.get("suffix", ""))
+
+def pipeline_to_json(specs):
+    return json.dumps([[kind, params] for kind, params in specs])
+
+def pipeline_from_json(text):
+    """[(kind, params), ...] from a saved preset; unknown stage kinds raise ValueError."""
+    specs = [(kind, dict(params)) for kind, params in json.loads(text)]
+    for kind, _ in specs:
+        if kind not in PIPELINE_STAGES:
+            raise ValueError("Unknown pipeline stage: %s" % kind)
+    return specs
+
+
+class SelectionPipeline(object):
+    """
+    Queued filter stages (and an optional reparent) evaluated lazily: the
+    filters form one generator chain over the input, so stacking stages costs
+    a single pass and the caller selects once at the end.
+
+        pipe = SelectionPipeline(backend)
+        pipe.type_filter(["joint"]).name_filter("*_Jnt", mode="glob").reparent_numbered("Spine_", "_Jnt")
+        nodes = pipe.run(nodes)      # pipe.stats holds the reparent result
+
+    Stages are plain (kind, params) specs, so a pipeline round-trips through
+    to_json()/from_json() for presets.
+    """
+    def __init__(self, backend=None, specs=None, chunk_size=PIPELINE_CHUNK):
+        self.backend = backend or default_backend()
+        self.chunk_size = chunk_size
+        self.specs = []
+        self.stats = None
+        for kind, params in specs or ():
+            self.add(kind, **params)
+
+    def add(self, kind, **params):
+        if kind not in PIPELINE_STAGES:
+            raise ValueError("Unknown pipeline stage: %s" % kind)
+        if kind == "name":
+            # fail on a bad pattern when the stage is queued, not halfway through a run
+            compile_name_matcher(params["pattern"], params.get("mode", "contains"),
+                                 params.get("case_sensitive", False), params.get("full_path", False),
+                                 params.get("require_all", False))
+        self.specs.append((kind, params))
+        return self
+
+    def type_filter(self, active_types, include_groups=False, keep=True):
+        return self.add("type", active_types=list(active_types), include_groups=include_groups, keep=keep)
+
+    def name_filter(self, pattern, mode="contains", case_sensitive=False, full_path=False,
+                    require_all=False, keep=True):
+        return self.add("name", pattern=pattern, mode=mode, case_sensitive=case_sensitive,
+                        full_path=full_path, require_all=require_all, keep=keep)
+
+    def nth_filter(self, step, offset=1, keep=True):
+        return self.add("nth", step=step, offset=offset, keep=keep)
+
+    def reparent_by_name(self, parent_pattern, child_pattern, parent_mode="suffix", child_mode="suffix",
+                         prevent_cycles=True):
+        return self.add("reparent_name", parent_pattern=parent_pattern, child_pattern=child_pattern,
+                        parent_mode=parent_mode, child_mode=child_mode, prevent_cycles=prevent_cycles)
+
+    def reparent_numbered(self, prefix="", suffix="", descending=False, numeric_sort=True,
+                          auto_scan=True, prevent_cycles=True):
+        return self.add("reparent_number", prefix=prefix, suffix=suffix, descending=descending,
+                        numeric_sort=numeric_sort, auto_scan=auto_scan, prevent_cycles=prevent_cycles)
+
+    def describe(self):
+        return [describe_stage(kind, params) for kind, params in self.specs]
+
+    def to_json(self):
+        return pipeline_to_json(self.specs)
+
+    @classmethod
+    def from_json(cls, text, backend=None):
+        return cls(backend=backend, specs=pipeline_from_json(text))
+
+    def _reparent(self, nodes, pairs, prevent_cycles):
+        # hand the moved nodes to later stages under their new long names
+        ids = self.backend.uuids(nodes)
+        self.stats = reparent(pairs, prevent_cycles, self.backend)[0]
+        now = self.backend.paths(list(ids.values()))
+        return [now.get(ids.get(n), n) for n in nodes]
+
+    def _stage(self, nodes, kind, p):
+        if kind == "type":
+            return iter_type_filter(nodes, p["active_types"], p.get("include_groups", False),
+                                    p.get("keep", True), self.backend, self.chunk_size)
+        if kind == "name":
+            matcher = compile_name_matcher(p["pattern"], p.get("mode", "contains"),
+                                           p.get("case_sensitive", False), p.get("full_path", False),
+                                           p.get("require_all", False))
+            return matcher.select(nodes, invert=not p.get("keep", True))
+        if kind == "nth":
+            return iter_nth_filter(nodes, p["step"], p.get("offset", 1), p.get("keep", True))
+        # reparent stages need the whole filtered set, so the chain materialises here
+        nodes = list(iter_unique(nodes))
+        if kind == "reparent_name":
+            plan, _ = plan_name_reparent(nodes, p["parent_pattern"], p["child_pattern"],
+                                         p.get("parent_mode", "suffix"), p.get("child_mode", "suffix"))
+            return iter(self._reparent(nodes, name_plan_pairs(plan), p.get("prevent_cycles", True)))
+        chains, _ = plan_numbering(tuple(nodes), p.get("prefix", ""), p.get("suffix", ""),
+                                   p.get("descending", False), p.get("numeric_sort", True),
+                                   p.get("auto_scan", True))
+        return iter(self._reparent(nodes, chain_pairs(chains, self.backend), p.get("prevent_cycles", True)))
+
+    def iterate(self, nodes):
+        """Generator over the pipeline's output; nothing runs until it is consumed."""
+        stream = iter(nodes)
+        for kind, params in self.specs:
+            stream = self._stage(stream, kind, params)
+        return iter_unique(stream)
+
+    def run(self, nodes):
+        return list(self.iterate(nodes))
@@ -0,0 +1,164 @@
+# Shading-assignment snapshot: capture every shadingEngine membership in bulk, restore it in one batch
+#
+#   import ShadingSnapshot as shs
+#   shot = shs.ShadingSnapshot.capture()          # one sets -q per shading engine
+#   shot.save(shs.snapshot_path())                # <scene>.shading.json.gz next to the scene
+#   ...                                           # reassign materials, render a pass
+#   shs.ShadingSnapshot.load(shs.snapshot_path()).restore()   # one sets -forceElement per engine
+#
+# On disk the node paths are stored once in a table; each engine lists rows of
+# [node index] (whole object) or [node index, "f[0:99]", ...] with adjacent
+# component ranges merged, gzip-compressed.
+
+import os
+import re
+import json
+import gzip
+import time
+from contextlib import contextmanager
+
+try:
+    import maya.cmds as cmds
+except ImportError:
+    cmds = None
+
+FORMAT_VERSION = 1
+SNAPSHOT_SUFFIX = ".shading.json.gz"
+_RANGE = re.compile(r"^(\w+)\[(\d+)(?::(\d+))?\]$")
+
+
+def compress_ranges(components):
+    """
+    Merge adjacent/overlapping single-index ranges per component type:
+    ["f[0:4]", "f[5]", "f[9:12]"] -> ["f[0:5]", "f[9:12]"]. Anything else is kept as is.
+    """
+    spans = {}
+    other = []
+    for comp in components:
+        m = _RANGE.match(comp)
+        if not m:
+            other.append(comp)
+            continue
+        start = int(m.group(2))
+        end = int(m.group(3)) if m.group(3) is not None else start
+        spans.setdefault(m.group(1), []).append((start, end))
+    out = []
+    for kind, ranges in spans.items():
+        ranges.sort()
+        merged = [list(ranges[0])]
+        for start, end in ranges[1:]:
+            if start <= merged[-1][1] + 1:
+                merged[-1][1] = max(merged[-1][1], end)
+            else:
+                merged.append([start, end])
+        out.extend("%s[%d]" % (kind, s) if s == e else "%s[%d:%d]" % (kind, s, e) for s, e in merged)
+    return out + other
+
+def snapshot_path(scene=None):
+    """<scene>.shading.json.gz for the given (default: open) scene, or None if it was never saved."""
+    scene = scene or cmds.file(q=True, sceneName=True)
+    if not scene:
+        return None
+    return os.path.splitext(scene)[0] + SNAPSHOT_SUFFIX
+
+
+@contextmanager
+def _undo_chunk(name):
+    cmds.undoInfo(openChunk=True, chunkName=name)
+    try:
+        yield
+    finally:
+        cmds.undoInfo(closeChunk=True)
+
+
+class ShadingSnapshot(object):
+    """
+    Shading-engine memberships of a scene. nodes is the path table; engines maps
+    each shadingEngine to rows of [node index] or [node index, component, ...].
+    """
+    def __init__(self, nodes=None, engines=None):
+        self.nodes = nodes or []
+        self.engines = engines or {}
+
+    # -----------------------
+    # Capture / restore
+    # -----------------------
+    @classmethod
+    def capture(cls, engines=None):
+        """One sets -q (plus one ls for long names) per shading engine."""
+        snapshot = cls()
+        index = {}
+        for sg in engines or cmds.ls(type="shadingEngine") or []:
+            members = cmds.sets(sg, q=True) or []
+            if not members:
+                continue
+            whole = []
+            components = {}
+            for member in cmds.ls(members, long=True) or []:
+                node, _, comp = member.partition(".")
+                i = index.get(node)
+                if i is None:
+                    i = index[node] = len(snapshot.nodes)
+                    snapshot.nodes.append(node)
+                if comp:
+                    components.setdefault(i, []).append(comp)
+                else:
+                    whole.append(i)
+            rows = [[i] for i in whole]
+            rows.extend([i] + compress_ranges(comps) for i, comps in components.items())
+            snapshot.engines[sg] = rows
+        return snapshot
+
+    def restore(self):
+        """
+        Reassign every captured membership: whole objects first, then components,
+        one sets -forceElement per engine each. Nodes or engines that no longer
+        exist are skipped. One undo step. Returns stats (engines, members, missing, seconds).
+        """
+        start = time.perf_counter()
+        existing = set(cmds.ls(self.nodes, long=True) or []) if self.nodes else set()
+        engines = set(cmds.ls(list(self.engines), type="shadingEngine") or []) if self.engines else set()
+        stats = dict(engines=0, members=0, missing=0)
+        with _undo_chunk("restoreShadingSnapshot"):
+            for whole_pass in (True, False):
+                for sg, rows in self.engines.items():
+                    members = []
+                    for row in rows:
+                        if (len(row) == 1) != whole_pass:
+                            continue
+                        node = self.nodes[row[0]]
+                        if node not in existing or sg not in engines:
+                            stats["missing"] += 1
+                            continue
+                        if whole_pass:
+                            members.append(node)
+                        else:
+                            members.extend("%s.%s" % (node, comp) for comp in row[1:])
+                    if members:
+                        cmds.sets(members, e=True, forceElement=sg)
+                        stats["engines"] += 1
+                        stats["members"] += len(members)
+        stats["seconds"] = time.perf_counter() - start
+        return stats
+
+    # -----------------------
+    # Disk format
+    # -----------------------
+    def to_dict(self):
+        return {"version": FORMAT_VERSION, "nodes": self.nodes, "engines": self.engines}
+
+    @classmethod
+    def from_dict(cls, data):
+        if data.get("version") != FORMAT_VERSION:
+            raise ValueError("Unsupported shading snapshot version: %r" % data.get("version"))
+        return cls(list(data["nodes"]), dict(data["engines"]))
+
+    def save(self, path):
+        with gzip.open(path, "wt", encoding="utf-8") as f:
+            json.dump(self.to_dict(), f, separators=(",", ":"))
+        return path
+
+    @classmethod
+    def load(cls, path):
+        with gzip.open(path, "rt", encoding="utf-8") as f:
+            return cls.from_dict(json.load(f))
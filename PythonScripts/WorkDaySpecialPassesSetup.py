@@ -1,8 +1,32 @@
 #Script for setting up the special render passes for Work Day short film
 
+import os
+import sys
+import subprocess
+
 import maya.cmds as cmds
+import maya.api.OpenMaya as om
+import maya.app.renderSetup.model.renderLayer as renderLayer
+import maya.app.renderSetup.model.renderSetup as renderSetup
+import maya.app.renderSetup.model.selector as selector
+import maya.app.renderSetup.model.typeIDs as typeIDs
+
+path = "D:/GitHubStuff/University/MayaScripts/PythonScripts"
+
+if path not in sys.path:
+    sys.path.append(path)
+
+import PassRenderQueue as prq
+import ShadingSnapshot as shs
+#import importlib
+#importlib.reload(prq)
+#importlib.reload(shs)
 
 WINDOW_NAME = "specialPassSetupUI"
+BATCH_WORKERS_FIELD = "specialPassBatchWorkers"
+BATCH_RENDER_CHECK = "specialPassBatchRender"
+LAYER_MODE_CHECK = "specialPassLayerMode"
+OPT_LAYER_MODE = "wdsp_use_render_layers"
 
 PASS_MATERIALS = {
     "SmallNoise": "ExtraRenderPasses:SmallNoiseMat",
@@ -15,6 +39,27 @@ SKELLY_ALPHA_BLACK = "ExtraRenderPasses:FlatBlackMat"
 SKELLY_ALPHA_WHITE = "ExtraRenderPasses:FlatWhiteMat"
 SKELLY_ALPHA_OBJECT = "Skeleton:Skeleton_Asset"
 
+PASS_NAMES = list(PASS_MATERIALS) + ["SkellyAlpha"]
+
+# render layer mode: one "<Pass>_pass" render-setup layer per pass
+LAYER_SUFFIX = "_pass"
+BEAUTY_VERSION = "Beauty"
+
+# beauty shading snapshots taken this session, keyed by scene path; saved scenes only,
+# and dropped whenever a scene is created or opened
+_SHADING_SNAPSHOTS = {}
+
+# (mesh shapes, their transforms), cached until the DAG changes
+_MESH_INDEX = None
+
+# ids of the scene callbacks installed by this copy of the module; they are also
+# kept on sys under this name, so re-running the script can remove the old ones
+_SCENE_CALLBACKS = []
+_SCENE_CALLBACKS_KEY = "_workDaySpecialPassesCallbacks"
+
+# batch mode writes <scene>_<Pass> variants into this folder next to the scene
+BATCH_FOLDER = "passes"
+
 
 # ----------------------------
 # helpers
@@ -77,19 +122,126 @@ def _get_material_shading_group(material):
     return sg
 
 
-def _get_all_renderable_mesh_transforms():
+def _scan_mesh_index():
+    # structure only: mesh shapes and their parent transforms, nothing that changes per frame
     shapes = cmds.ls(type="mesh", long=True, noIntermediate=True) or []
-    transforms = []
-    seen = set()
+    if not shapes:
+        return [], []
+    transforms = cmds.listRelatives(shapes, parent=True, fullPath=True) or []
+    return shapes, list(dict.fromkeys(transforms))
+
+
+def _static_plug_off(plug):
+    # off and not driven: keyed/connected values can change per frame, so they never exclude
+    return not plug.isDestination and not plug.asBool()
+
+
+def _static_off_paths(paths, attr):
+    """DAG paths whose attr is off and not driven; all nodes go through one MSelectionList."""
+    sl = om.MSelectionList()
+    for node_path in paths:
+        sl.add(node_path)
+    off = set()
+    for i in range(sl.length()):
+        dag = sl.getDagPath(i)
+        if _static_plug_off(om.MFnDependencyNode(dag.node()).findPlug(attr, False)):
+            off.add(dag.fullPathName())
+    return off
+
+
+def _under(shapes, roots):
+    # shapes that are one of the roots or below one of them
+    if not roots:
+        return set()
+    prefixes = tuple(root + "|" for root in roots)
+    return set(shape for shape in shapes if shape in roots or shape.startswith(prefixes))
+
+
+def _non_rendering_mesh_shapes(shapes):
+    """
+    Shapes that can't render on any frame: templated, hidden (visibility off on the
+    shape or a parent), primaryVisibility off, or in a hidden display layer (when
+    those attributes are not animated). Checked on every call since none of it is
+    part of the cached index.
+    """
+    excluded = set(cmds.ls(shapes, templated=True, long=True) or [])
+    excluded.update(_static_off_paths(shapes, "primaryVisibility"))
 
+    ancestors = set()
     for shape in shapes:
-        parents = cmds.listRelatives(shape, parent=True, fullPath=True) or []
-        for tr in parents:
-            if tr not in seen:
-                seen.add(tr)
-                transforms.append(tr)
+        parts = shape.split("|")
+        ancestors.update("|".join(parts[:i]) for i in range(2, len(parts)))
+    excluded.update(_under(shapes, _static_off_paths(ancestors.union(shapes), "visibility")))
+
+    hidden_roots = []
+    for layer in cmds.ls(type="displayLayer") or []:
+        if layer.endswith("defaultLayer"):
+            continue
+        sl = om.MSelectionList()
+        sl.add(layer)
+        if _static_plug_off(om.MFnDependencyNode(sl.getDependNode(0)).findPlug("visibility", False)):
+            members = cmds.editDisplayLayerMembers(layer, q=True, fullNames=True) or []
+            hidden_roots.extend(cmds.ls(members, long=True) or [])
+    excluded.update(_under(shapes, set(hidden_roots)))
+
+    return excluded
+
 
-    return transforms
+def _invalidate_mesh_index(*_):
+    # runs inside Maya callbacks: only drop the cache, never query the scene here
+    global _MESH_INDEX
+    _MESH_INDEX = None
+
+
+def _clear_shading_snapshots(*_):
+    # File > New / Open: snapshots of the previous scene must never be restored into this one
+    _SHADING_SNAPSHOTS.clear()
+    _invalidate_mesh_index()
+
+
+def _install_scene_callbacks():
+    if _SCENE_CALLBACKS:
+        return
+    # a re-run of this script starts with fresh globals; the previous run's callbacks go first
+    stale = getattr(sys, _SCENE_CALLBACKS_KEY, None)
+    if stale:
+        try:
+            om.MMessage.removeCallbacks(stale)
+        except RuntimeError:
+            pass
+    ids = _SCENE_CALLBACKS
+    ids.append(om.MDGMessage.addNodeAddedCallback(_invalidate_mesh_index, "dagNode"))
+    ids.append(om.MDGMessage.addNodeRemovedCallback(_invalidate_mesh_index, "dagNode"))
+    ids.append(om.MDagMessage.addAllDagChangesCallback(_invalidate_mesh_index))
+    ids.append(om.MNodeMessage.addNameChangedCallback(om.MObject(), _invalidate_mesh_index))
+    for msg in (om.MSceneMessage.kAfterNew, om.MSceneMessage.kAfterOpen):
+        ids.append(om.MSceneMessage.addCallback(msg, _clear_shading_snapshots))
+    for msg in (om.MSceneMessage.kAfterImport, om.MSceneMessage.kAfterCreateReference,
+                om.MSceneMessage.kAfterRemoveReference):
+        ids.append(om.MSceneMessage.addCallback(msg, _invalidate_mesh_index))
+    setattr(sys, _SCENE_CALLBACKS_KEY, ids)
+
+
+def _get_all_renderable_mesh_transforms():
+    """
+    Transforms of the non-intermediate meshes, minus the ones that can't render on
+    any frame (see _non_rendering_mesh_shapes). The mesh/transform index is scanned
+    once and reused until the DAG changes; the render filter runs on every call.
+    Per-frame visibility is not filtered, so animated visibility still gets the pass.
+    """
+    global _MESH_INDEX
+    _install_scene_callbacks()
+    if _MESH_INDEX is None:
+        _MESH_INDEX = _scan_mesh_index()
+    shapes, transforms = _MESH_INDEX
+
+    excluded = _non_rendering_mesh_shapes(shapes)
+    if not excluded:
+        return list(transforms)
+    kept = [shape for shape in shapes if shape not in excluded]
+    if not kept:
+        return []
+    return list(dict.fromkeys(cmds.listRelatives(kept, parent=True, fullPath=True) or []))
 
 
 def _assign_material_to_nodes(nodes, material):
@@ -282,11 +434,359 @@ def setup_skelly_alpha(*_):
     cmds.inViewMessage(amg='Pass "SkellyAlpha" applied.', pos="topCenter", fade=True)
 
 
+# ----------------------------
+# render layer mode
+# ----------------------------
+# Each pass is a render-setup layer whose collections carry material overrides,
+# so the beauty assignments are never touched and switching passes is a layer
+# switch. Layers are created the first time a pass is used.
+
+def _pass_collections(pass_name):
+    """(collection pattern, material) pairs for a pass; later collections win."""
+    if pass_name == "SkellyAlpha":
+        return [("*", SKELLY_ALPHA_BLACK), (SKELLY_ALPHA_OBJECT, SKELLY_ALPHA_WHITE)]
+    return [("*", PASS_MATERIALS[pass_name])]
+
+
+def _find_render_layer(layer_name):
+    for layer in renderSetup.instance().getRenderLayers():
+        if layer.name() == layer_name:
+            return layer
+    return None
+
+
+def _layer_complete(layer, pass_name):
+    # one collection per material, each carrying its material override
+    collections = layer.getCollections()
+    if len(collections) != len(_pass_collections(pass_name)):
+        return False
+    return all(collection.getOverrides() for collection in collections)
+
+
+def _delete_render_layer(layer):
+    rs = renderSetup.instance()
+    if rs.getVisibleRenderLayer().name() == layer.name():
+        rs.switchToLayer(rs.getDefaultRenderLayer())
+    rs.detachRenderLayer(layer)
+    renderLayer.delete(layer)
+
+
+def ensure_pass_layer(pass_name):
+    """
+    The pass layer, built if missing. Returns None (and builds nothing) while a pass
+    material is missing; a layer left incomplete by an earlier run is rebuilt.
+    """
+    layer_name = pass_name + LAYER_SUFFIX
+    layer = _find_render_layer(layer_name)
+    if layer is not None:
+        if _layer_complete(layer, pass_name):
+            return layer
+        cmds.warning('Render layer "{}" has missing overrides, rebuilding it.'.format(layer_name))
+        _delete_render_layer(layer)
+
+    # resolve every material first, so a missing one never leaves a half-built layer behind
+    collections = []
+    for pattern, material in _pass_collections(pass_name):
+        sg = _get_material_shading_group(material)
+        if not sg:
+            cmds.warning('Material not found: "{}", pass layer "{}" not created.'.format(material, layer_name))
+            return None
+        collections.append((pattern, sg))
+
+    layer = renderSetup.instance().createRenderLayer(layer_name)
+    try:
+        for i, (pattern, sg) in enumerate(collections):
+            collection = layer.createCollection("{}_col{}".format(pass_name, i))
+            collection.getSelector().setFilterType(selector.Filters.kTransforms)
+            collection.getSelector().setPattern(pattern)
+            override = collection.createOverride("{}_mat{}".format(pass_name, i), typeIDs.materialOverride)
+            override.setMaterial(sg)
+    except Exception:
+        _delete_render_layer(layer)
+        raise
+    return layer
+
+
+def _set_renderable_layer(active):
+    # only the visible layer renders in batch, like the destructive setup did
+    rs = renderSetup.instance()
+    active_name = active.name() if active is not None else None
+    rs.getDefaultRenderLayer().setRenderable(active is None)
+    for layer in rs.getRenderLayers():
+        layer.setRenderable(layer.name() == active_name)
+
+
+def switch_to_pass_layer(pass_name, *_):
+    layer = ensure_pass_layer(pass_name)
+    if layer is None:
+        return False
+
+    _set_render_version(pass_name)
+    renderSetup.instance().switchToLayer(layer)
+    _set_renderable_layer(layer)
+
+    cmds.inViewMessage(
+        amg='Pass "{}" layer active.'.format(pass_name),
+        pos="topCenter",
+        fade=True
+    )
+    return True
+
+
+def switch_to_beauty(*_):
+    _set_render_version(BEAUTY_VERSION)
+
+    rs = renderSetup.instance()
+    rs.switchToLayer(rs.getDefaultRenderLayer())
+    _set_renderable_layer(None)
+
+    cmds.inViewMessage(amg="Beauty (masterLayer) active.", pos="topCenter", fade=True)
+
+
+def use_render_layers():
+    if not cmds.optionVar(exists=OPT_LAYER_MODE):
+        return True
+    return bool(cmds.optionVar(q=OPT_LAYER_MODE))
+
+
+def _reassign_pass(pass_name):
+    if pass_name == "SkellyAlpha":
+        setup_skelly_alpha()
+    else:
+        setup_pass(pass_name, PASS_MATERIALS[pass_name])
+
+
+def apply_pass(pass_name, *_):
+    """
+    Layer switch in render layer mode, otherwise the destructive material reassignment
+    (after making sure the beauty assignments are in a shading snapshot).
+    """
+    if use_render_layers():
+        switch_to_pass_layer(pass_name)
+    else:
+        snapshot, source = _ensure_shading_snapshot()
+        if snapshot is None:
+            cmds.warning("Save the scene first, so its beauty shading can be kept for Restore.")
+            return
+        om.MGlobal.displayInfo('Pass "{}": beauty assignments kept in {}.'.format(
+            pass_name, _snapshot_source_label(source)))
+        _reassign_pass(pass_name)
+
+
+# ----------------------------
+# shading snapshots
+# ----------------------------
+# Destructive passes replace every shading assignment; the beauty assignments are
+# captured first (per object and per face) and written next to the scene, so they
+# can be put back in one batch without reopening the file.
+
+def _disk_snapshot(scene):
+    """(snapshot, fresh) from <scene>.shading.json.gz, or (None, False); fresh = newer than the scene file."""
+    path = shs.snapshot_path(scene) if scene else None
+    if not path or not os.path.isfile(path):
+        return None, False
+    fresh = not os.path.isfile(scene) or os.path.getmtime(path) >= os.path.getmtime(scene)
+    return shs.ShadingSnapshot.load(path), fresh
+
+
+def _ensure_shading_snapshot():
+    """
+    Beauty snapshot for the open scene and where it came from ("session", "disk" or
+    "captured"); (None, None) for an untitled scene. A file on disk is only trusted
+    when it is newer than the scene file; otherwise the current assignments are
+    captured and written over it.
+    """
+    _install_scene_callbacks()
+    scene = cmds.file(q=True, sceneName=True)
+    if not scene:
+        return None, None
+    if scene in _SHADING_SNAPSHOTS:
+        return _SHADING_SNAPSHOTS[scene], "session"
+    snapshot, fresh = _disk_snapshot(scene)
+    if snapshot is not None and fresh:
+        source = "disk"
+    else:
+        snapshot = shs.ShadingSnapshot.capture()
+        snapshot.save(shs.snapshot_path(scene))
+        source = "captured"
+    _SHADING_SNAPSHOTS[scene] = snapshot
+    return snapshot, source
+
+
+def _snapshot_source_label(source):
+    return {
+        "session": "this session's shading snapshot",
+        "disk": "the shading snapshot saved next to the scene",
+        "captured": "a new shading snapshot of the current assignments",
+    }[source]
+
+
+def save_shading_snapshot(*_):
+    scene = cmds.file(q=True, sceneName=True)
+    if not scene:
+        cmds.warning("Save the scene before taking a shading snapshot.")
+        return
+    _install_scene_callbacks()
+    snapshot = shs.ShadingSnapshot.capture()
+    _SHADING_SNAPSHOTS[scene] = snapshot
+    snapshot.save(shs.snapshot_path(scene))
+
+    cmds.inViewMessage(
+        amg="Shading snapshot: {} engines, {} nodes saved.".format(len(snapshot.engines), len(snapshot.nodes)),
+        pos="topCenter",
+        fade=True
+    )
+
+
+def restore_shading_snapshot(*_):
+    scene = cmds.file(q=True, sceneName=True)
+    snapshot = _SHADING_SNAPSHOTS.get(scene)
+    source = "this session's snapshot"
+    if snapshot is None:
+        snapshot, fresh = _disk_snapshot(scene)
+        source = "snapshot from disk"
+        if snapshot is not None and not fresh:
+            answer = cmds.confirmDialog(
+                title="Restore Shading",
+                message="The shading snapshot on disk is older than the scene file.\n"
+                        "Assignments changed since then would be reverted.",
+                button=["Restore Anyway", "Cancel"],
+                defaultButton="Cancel",
+                cancelButton="Cancel",
+                dismissString="Cancel"
+            )
+            if answer != "Restore Anyway":
+                return
+            source = "older snapshot from disk"
+    if snapshot is None:
+        cmds.warning("No shading snapshot for this scene.")
+        return
+
+    _set_render_version(BEAUTY_VERSION)
+    stats = snapshot.restore()
+
+    cmds.inViewMessage(
+        amg="Shading restored from {}: {} members in {:.2f}s ({} missing).".format(
+            source, stats["members"], stats["seconds"], stats["missing"]),
+        pos="topCenter",
+        fade=True
+    )
+
+
+# ----------------------------
+# batch mode
+# ----------------------------
+
+
+def write_pass_scenes(passes=None, out_dir=None):
+    """
+    Saves one scene per pass (<scene dir>/passes/<scene>_<Pass>.<ext>) with that pass applied.
+    In render layer mode the variants only differ in the active layer; otherwise the beauty
+    shading snapshot is restored before every pass. The saved scene is reopened at the end.
+    Returns the written scene paths.
+    """
+    scene = cmds.file(q=True, sceneName=True)
+    if not scene:
+        cmds.warning("Save the scene before writing pass scenes.")
+        return []
+
+    stem, ext = os.path.splitext(os.path.basename(scene))
+    file_type = "mayaAscii" if ext.lower() == ".ma" else "mayaBinary"
+    out_dir = out_dir or os.path.join(os.path.dirname(scene), BATCH_FOLDER)
+    if not os.path.isdir(out_dir):
+        os.makedirs(out_dir)
+
+    layers = use_render_layers()
+    beauty, source = _ensure_shading_snapshot() if not layers else (None, None)
+    if source:
+        om.MGlobal.displayInfo("Batch passes start from {}.".format(_snapshot_source_label(source)))
+    written = []
+    try:
+        for name in PASS_NAMES:
+            if passes and name not in passes:
+                continue
+            if layers:
+                if not switch_to_pass_layer(name):
+                    continue
+            else:
+                beauty.restore()
+                _reassign_pass(name)
+            variant = os.path.join(out_dir, "{}_{}{}".format(stem, name, ext)).replace("\\", "/")
+            cmds.file(rename=variant)
+            cmds.file(save=True, type=file_type, force=True)
+            written.append(variant)
+    finally:
+        cmds.file(scene, open=True, force=True)
+
+    return written
+
+
+def launch_batch_renders(scenes, workers=2):
+    """
+    Starts PassRenderQueue in its own mayapy process, so Maya stays usable while
+    up to `workers` Render processes work through the scenes.
+    """
+    mayapy = "mayapy.exe" if sys.platform.startswith("win") else "mayapy"
+    python = os.path.join(os.environ.get("MAYA_LOCATION", ""), "bin", mayapy)
+    if not os.path.isfile(python):
+        python = mayapy
+
+    queue_script = os.path.splitext(prq.__file__)[0] + ".py"
+    cmd = [python, queue_script, "--workers", str(workers), "--render", prq.default_render_exe()]
+    return subprocess.Popen(cmd + list(scenes))
+
+
+def batch_passes(*_):
+    if cmds.file(q=True, modified=True) or not cmds.file(q=True, sceneName=True):
+        answer = cmds.confirmDialog(
+            title="Batch Passes",
+            message="The scene has to be saved before the pass scenes are written.",
+            button=["Save", "Cancel"],
+            defaultButton="Save",
+            cancelButton="Cancel",
+            dismissString="Cancel"
+        )
+        if answer != "Save":
+            return
+        if not cmds.file(q=True, sceneName=True):
+            # untitled: Save As first, the pass scenes are written next to it
+            picked = cmds.fileDialog2(fileMode=0, caption="Save Scene As",
+                                      fileFilter="Maya Binary (*.mb);;Maya ASCII (*.ma)")
+            if not picked:
+                return
+            cmds.file(rename=picked[0])
+            file_type = "mayaAscii" if picked[0].lower().endswith(".ma") else "mayaBinary"
+            cmds.file(save=True, type=file_type)
+        else:
+            # never save a destructive pass over the beauty scene
+            beauty = _SHADING_SNAPSHOTS.get(cmds.file(q=True, sceneName=True))
+            if beauty is not None:
+                beauty.restore()
+            cmds.file(save=True)
+
+    workers = cmds.intField(BATCH_WORKERS_FIELD, q=True, value=True)
+    render = cmds.checkBox(BATCH_RENDER_CHECK, q=True, value=True)
+
+    scenes = write_pass_scenes()
+    if not scenes:
+        return
+    for scene in scenes:
+        om.MGlobal.displayInfo('Pass scene written: "{}"'.format(scene))
+
+    if render:
+        launch_batch_renders(scenes, workers)
+        message = "{} pass scenes written, rendering {} at a time.".format(len(scenes), workers)
+    else:
+        message = "{} pass scenes written.".format(len(scenes))
+    cmds.inViewMessage(amg=message, pos="topCenter", fade=True)
+
+
 # ----------------------------
 # UI
 # ----------------------------
 
 def show_special_pass_setup_ui():
+    _install_scene_callbacks()
     if cmds.window(WINDOW_NAME, exists=True):
         cmds.deleteUI(WINDOW_NAME)
 
@@ -294,7 +794,7 @@ def show_special_pass_setup_ui():
         WINDOW_NAME,
         title="Special Pass Setup",
         sizeable=True,
-        widthHeight=(380, 320)
+        widthHeight=(380, 500)
     )
 
     cmds.columnLayout(adjustableColumn=True, rowSpacing=8, columnAlign="center")
@@ -321,35 +821,47 @@ def show_special_pass_setup_ui():
 
     cmds.separator(height=10, style="in")
 
-    cmds.button(
-        label="SmallNoise",
-        height=30,
-        command=lambda *_: setup_pass("SmallNoise", PASS_MATERIALS["SmallNoise"])
-    )
-    cmds.button(
-        label="BigNoise",
-        height=30,
-        command=lambda *_: setup_pass("BigNoise", PASS_MATERIALS["BigNoise"])
-    )
-    cmds.button(
-        label="FacingRatio",
-        height=30,
-        command=lambda *_: setup_pass("FacingRatio", PASS_MATERIALS["FacingRatio"])
-    )
-    cmds.button(
-        label="Curvature",
-        height=30,
-        command=lambda *_: setup_pass("Curvature", PASS_MATERIALS["Curvature"])
+    cmds.checkBox(
+        LAYER_MODE_CHECK,
+        label="Use render layers (keeps beauty assignments)",
+        value=use_render_layers(),
+        changeCommand=lambda value: cmds.optionVar(intValue=(OPT_LAYER_MODE, int(value)))
     )
+
+    for pass_name in PASS_NAMES:
+        cmds.button(
+            label=pass_name,
+            height=30,
+            command=lambda *_, name=pass_name: apply_pass(name)
+        )
     cmds.button(
-        label="SkellyAlpha",
+        label="Beauty (render layers)",
         height=30,
-        command=setup_skelly_alpha
+        command=switch_to_beauty
     )
 
     cmds.separator(height=10, style="none")
     cmds.text(label="SkellyAlpha uses FlatBlackMat + FlatWhiteMat.", align="center")
 
+    cmds.rowLayout(numberOfColumns=2, columnWidth2=(190, 190), adjustableColumn=2)
+    cmds.button(label="Save Shading Snapshot", height=30, command=save_shading_snapshot)
+    cmds.button(label="Restore Shading Snapshot", height=30, command=restore_shading_snapshot)
+    cmds.setParent("..")
+
+    cmds.separator(height=10, style="in")
+
+    cmds.rowLayout(numberOfColumns=3, columnWidth3=(120, 60, 140), adjustableColumn=3)
+    cmds.text(label="Concurrent renders")
+    cmds.intField(BATCH_WORKERS_FIELD, value=2, minValue=1)
+    cmds.checkBox(BATCH_RENDER_CHECK, label="Render after writing", value=True)
+    cmds.setParent("..")
+
+    cmds.button(
+        label="Batch: Write All Pass Scenes",
+        height=35,
+        command=batch_passes
+    )
+
     cmds.showWindow(WINDOW_NAME)
 
 